@@ -0,0 +1,225 @@
+# batch_scorer.py
+# Batch scoring over streams of {id, transcript, duration} records, with a process pool.
+# Usage: python batch_scorer.py transcripts.jsonl -o scores.jsonl --workers 4
+#        python batch_scorer.py transcripts.csv -o scores.jsonl --workers 4
+#        python batch_scorer.py archive.jsonl -o scores.jsonl --workers 4 --mmap
+
+import csv
+import json
+import math
+import sys
+import time
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator
+from scorer_logic import calculate_final_score, warm_up
+
+DEFAULT_CHUNK_SIZE = 64
+# Chunks in flight per worker; bounds memory regardless of input size
+INFLIGHT_CHUNKS_PER_WORKER = 4
+
+# --- Record Handling ---
+
+def score_record(record: dict, use_cache: bool = False, cache_db: str = None, passthrough: tuple = ()) -> dict:
+    """
+    Scores one {id, transcript, duration} record. Invalid records produce an 'error' entry.
+    With `use_cache`, results come from this process's ResultCache (shared on disk via `cache_db`).
+    Input fields named in `passthrough` (e.g. a cohort) are copied into the result when present.
+    """
+    if isinstance(record, dict):
+        head = {"id": record.get("id"), **{field: record[field] for field in passthrough if field in record}}
+    else:
+        head = {"id": None}
+    try:
+        transcript = record["transcript"]
+        duration = float(record.get("duration") or 0.0)
+        if not isinstance(transcript, str):
+            raise TypeError("'transcript' must be a string")
+        # json.loads accepts NaN and Infinity, which would otherwise come back as a NaN speech rate
+        if not math.isfinite(duration):
+            raise ValueError("'duration' must be a finite number")
+    except (KeyError, TypeError, ValueError, AttributeError) as exc:
+        return {**head, "error": f"Invalid record: {exc}"}
+    if use_cache:
+        from result_cache import get_process_cache
+        return {**head, **get_process_cache(cache_db).score(transcript, duration)}
+    return {**head, **calculate_final_score(transcript, duration)}
+
+def score_chunk(chunk: list, use_cache: bool = False, cache_db: str = None, passthrough: tuple = ()) -> list:
+    """Scores a chunk of records; the unit of work sent to pool workers."""
+    return [score_record(record, use_cache, cache_db, passthrough) for record in chunk]
+
+def iter_chunks(records: Iterable, chunk_size: int) -> Iterator[list]:
+    """Lazily splits an iterable of records into lists of `chunk_size`."""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+# --- Batch API ---
+
+def score_batch(records: Iterable, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                ordered: bool = True, use_cache: bool = False, cache_db: str = None,
+                passthrough: tuple = ()) -> Iterator[dict]:
+    """
+    Scores an iterable of {id, transcript, duration} records and yields one result per record.
+
+    With `workers` > 1, chunks of `chunk_size` records are dispatched to a process pool, with at
+    most INFLIGHT_CHUNKS_PER_WORKER chunks per worker in flight, so the input is consumed lazily
+    and memory stays bounded. Results come back in input order if `ordered`, else as completed.
+    `use_cache` and `cache_db` enable the result cache in each worker (see result_cache.py).
+    `passthrough` names input fields copied into each result (see score_record).
+    """
+    tasks = ((chunk, use_cache, cache_db, passthrough) for chunk in iter_chunks(records, chunk_size))
+    return _run_tasks(score_chunk, tasks, workers, ordered)
+
+def score_corpus_range(path: str, start: int, stop: int, use_cache: bool = False, cache_db: str = None,
+                       passthrough: tuple = ()) -> list:
+    """Scores records [start, stop) of a memory-mapped corpus opened by this process."""
+    from corpus_reader import get_corpus_reader
+    corpus = get_corpus_reader(path)
+    return score_chunk(list(corpus.iter_records(start, stop)), use_cache, cache_db, passthrough)
+
+def score_corpus(path: str, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 ordered: bool = True, use_cache: bool = False, cache_db: str = None,
+                 passthrough: tuple = ()) -> Iterator[dict]:
+    """
+    Like score_batch, over a corpus file read through corpus_reader.CorpusReader. Workers receive
+    only (path, start, stop) ranges and map the file themselves, sharing its pages instead of
+    receiving pickled transcripts.
+    """
+    from corpus_reader import get_corpus_reader
+    total = len(get_corpus_reader(path))
+    tasks = ((path, start, min(start + chunk_size, total), use_cache, cache_db, passthrough)
+             for start in range(0, total, chunk_size))
+    return _run_tasks(score_corpus_range, tasks, workers, ordered)
+
+def _run_tasks(func, tasks: Iterator, workers: int, ordered: bool, initializer=warm_up) -> Iterator[dict]:
+    """
+    Runs func(*args) for each args tuple, in-process or on a bounded process pool, yielding result
+    lists flattened. Pool workers run `initializer` on start (default: warm_up, for scoring tasks;
+    None for tasks that never score).
+    """
+    if workers <= 1:
+        for args in tasks:
+            yield from func(*args)
+        return
+
+    # The pool machinery (multiprocessing) is the largest import here; in-process runs skip it
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    max_inflight = workers * INFLIGHT_CHUNKS_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+        if ordered:
+            pending = deque()
+            for args in tasks:
+                pending.append(pool.submit(func, *args))
+                if len(pending) >= max_inflight:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        else:
+            pending = set()
+            for args in tasks:
+                pending.add(pool.submit(func, *args))
+                if len(pending) >= max_inflight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            for future in _as_completed(pending):
+                yield from future.result()
+
+def _as_completed(futures: set) -> Iterator:
+    from concurrent.futures import wait, FIRST_COMPLETED
+    while futures:
+        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+        yield from done
+
+# --- JSONL/CSV I/O ---
+
+def read_jsonl(stream) -> Iterator[dict]:
+    """Yields one record per non-empty line; malformed lines yield a record without a transcript."""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield {"id": f"line:{line_number}"}
+
+def read_csv(stream) -> Iterator[dict]:
+    """
+    Yields one record per row of a CSV with a header row naming `id`, `transcript` and `duration`
+    columns (open the stream with newline=""). Rows without an id get "row:<n>"; other named
+    columns (e.g. a cohort) are kept.
+    """
+    for row_number, row in enumerate(csv.DictReader(stream), start=1):
+        # Values past the header's last column are filed under None by DictReader
+        yield {**{column: value for column, value in row.items() if column is not None},
+               "id": row.get("id") or f"row:{row_number}",
+               "transcript": row.get("transcript"), "duration": row.get("duration")}
+
+def read_records(stream, path: str) -> Iterator[dict]:
+    """read_csv for paths ending in .csv, read_jsonl otherwise."""
+    return read_csv(stream) if path.lower().endswith(".csv") else read_jsonl(stream)
+
+def main(argv: list = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Score a JSONL or CSV file of {id, transcript, duration} records.")
+    parser.add_argument("input", help="Input JSONL or CSV path (by extension), or '-' for JSONL on stdin.")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL path, or '-' for stdout.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Worker processes (1 scores in-process).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Records per dispatched chunk.")
+    parser.add_argument("--unordered", action="store_true", help="Write results as they complete instead of in input order.")
+    parser.add_argument("--cache", action="store_true", help="Reuse results for repeated transcripts.")
+    parser.add_argument("--cache-db", default=None, help="SQLite file shared by all workers (implies --cache).")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map the input (JSONL or length-prefixed) instead of streaming it; builds <input>.idx.")
+    parser.add_argument("--summary", default=None, help="Also write corpus statistics of the results to this JSON path (see corpus_analytics.py).")
+    parser.add_argument("--cohort-field", default=None, help="Input field copied into each result; --summary also groups statistics by it.")
+    parser.add_argument("--progress-every", type=int, default=0, help="Report throughput every N records (0 = only at the end).")
+    args = parser.parse_args(argv)
+
+    if args.mmap and args.input == "-":
+        parser.error("--mmap needs an input file, not stdin")
+    if args.mmap and args.input.lower().endswith(".csv"):
+        parser.error("--mmap reads JSONL or length-prefixed files, not CSV")
+    source = sys.stdin if args.input == "-" or args.mmap else open(args.input, encoding="utf-8", newline="")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    aggregate = None
+    if args.summary:
+        from corpus_analytics import CorpusAggregate
+        aggregate = CorpusAggregate()
+    start = time.perf_counter()
+    count = 0
+    try:
+        options = dict(workers=args.workers, chunk_size=args.chunk_size, ordered=not args.unordered,
+                       use_cache=args.cache or args.cache_db is not None, cache_db=args.cache_db,
+                       passthrough=(args.cohort_field,) if args.cohort_field else ())
+        results = score_corpus(args.input, **options) if args.mmap else score_batch(read_records(source, args.input), **options)
+        for result in results:
+            sink.write(json.dumps(result) + "\n")
+            if aggregate is not None:
+                aggregate.add(result, result.get(args.cohort_field) if args.cohort_field else None)
+            count += 1
+            if args.progress_every and count % args.progress_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{count} records, {count / elapsed:.1f} records/s", file=sys.stderr)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    if aggregate is not None:
+        with open(args.summary, "w", encoding="utf-8") as summary:
+            summary.write(aggregate.to_json(indent=4) + "\n")
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Scored {count} records in {elapsed:.2f}s ({rate:.1f} records/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
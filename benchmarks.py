@@ -0,0 +1,284 @@
+# benchmarks.py
+# Micro-benchmarks for the scoring pipeline. Run with: python benchmarks.py <benchmark>
+
+import argparse
+import random
+import time
+import re
+import scorer_logic
+from matchers import get_filler_matcher, get_keyword_engine
+from rubric_config import SAMPLE_TRANSCRIPT, FILLER_WORDS, KEYWORD_RULES
+from scorer_logic import analyze_transcript, calculate_final_score
+
+# --- Helpers ---
+
+def build_transcript(word_count: int, seed: int = 0) -> str:
+    """Builds a transcript of roughly `word_count` words by shuffling sentences of the sample."""
+    rng = random.Random(seed)
+    sentences = [s.strip() + "." for s in SAMPLE_TRANSCRIPT.split(".") if s.strip()]
+    parts, total = [], 0
+    while total < word_count:
+        sentence = rng.choice(sentences)
+        parts.append(sentence)
+        total += len(sentence.split())
+    return " ".join(parts)
+
+def time_call(func, repeat: int) -> float:
+    """Returns the best-of-3 mean seconds per call of `func` over `repeat` calls."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+# --- Benchmarks ---
+
+def score_per_criterion_from_string(transcript: str, duration_seconds: float) -> list:
+    """Runs every criterion on the raw string, re-tokenizing per criterion (the pre-analysis path)."""
+    word_count = len(scorer_logic.clean_and_tokenize(transcript))
+    return [
+        scorer_logic.score_speech_rate(transcript, duration_seconds, False),
+        scorer_logic.score_salutation_level(transcript),
+        scorer_logic.score_keyword_presence(transcript),
+        scorer_logic.score_flow(transcript),
+        scorer_logic.score_vocabulary_richness_ttr(transcript, word_count),
+        scorer_logic.score_filler_word_rate(transcript, word_count),
+        scorer_logic.score_grammar_errors(transcript, word_count),
+        scorer_logic.score_sentiment_positivity(transcript),
+    ]
+
+def bench_tokenization(sizes: list) -> None:
+    """Compares per-criterion string scoring against the shared single-pass analysis."""
+    print(f"{'words':>8} {'per-criterion (ms)':>20} {'shared (ms)':>12} {'analyze (ms)':>13} {'speedup':>8}")
+    for size in sizes:
+        transcript = build_transcript(size)
+        repeat = max(1, 20000 // size)
+        duration = size / 2.5
+        per_criterion = time_call(lambda: score_per_criterion_from_string(transcript, duration), repeat)
+        shared = time_call(lambda: calculate_final_score(transcript, duration), repeat)
+        analyze = time_call(lambda: analyze_transcript(transcript).tokens, repeat)
+        print(f"{size:>8} {per_criterion * 1e3:>20.3f} {shared * 1e3:>12.3f} {analyze * 1e3:>13.3f} {per_criterion / shared:>7.2f}x")
+
+def count_fillers_per_pattern(normalized_text: str) -> int:
+    """The pre-matcher filler count: one regex build and full scan per filler."""
+    return sum(len(re.findall(r'\b' + re.escape(filler) + r'\b', normalized_text)) for filler in FILLER_WORDS)
+
+def bench_fillers(sizes: list) -> None:
+    """Compares one regex pass per filler against the compiled single-scan filler matcher."""
+    matcher = get_filler_matcher(FILLER_WORDS)
+    print(f"{'words':>8} {'per-filler (ms)':>16} {'matcher (ms)':>13} {'speedup':>8}")
+    for size in sizes:
+        text = build_transcript(size).lower()
+        repeat = max(1, 20000 // size)
+        per_filler = time_call(lambda: count_fillers_per_pattern(text), repeat)
+        single = time_call(lambda: matcher.count(text), repeat)
+        print(f"{size:>8} {per_filler * 1e3:>16.3f} {single * 1e3:>13.3f} {per_filler / single:>7.2f}x")
+
+def find_keywords_per_rule(normalized_text: str) -> list:
+    """The pre-engine keyword check: rebuild the rule map and search each rule on every call."""
+    keyword_map = dict(KEYWORD_RULES)
+    return [k for k, p in keyword_map.items() if re.search(p, normalized_text)]
+
+def bench_keywords(sizes: list) -> None:
+    """Compares per-call compile-and-search against the cached keyword rule engine."""
+    engine = get_keyword_engine(KEYWORD_RULES)
+    print(f"{'words':>8} {'per-call (ms)':>14} {'engine (ms)':>12} {'spans (ms)':>11} {'speedup':>8}")
+    for size in sizes:
+        text = build_transcript(size).lower()
+        repeat = max(1, 20000 // size)
+        per_rule = time_call(lambda: find_keywords_per_rule(text), repeat)
+        cached = time_call(lambda: engine.find_categories(text), repeat)
+        spans = time_call(lambda: engine.find_spans(text), repeat)
+        print(f"{size:>8} {per_rule * 1e3:>14.3f} {cached * 1e3:>12.3f} {spans * 1e3:>11.3f} {per_rule / cached:>7.2f}x")
+
+def bench_vectorized(count: int) -> None:
+    """
+    Scores the same `count` generated transcripts end to end, transcripts to scores, with the
+    vectorized scorer (count extraction plus array scoring) and with calculate_final_score.
+    """
+    from grammar_checker import get_grammar_checker
+    from regression_suite import generate_corpus
+    from rubric_compiler import get_rubric
+    from scorer_logic import build_execution_plan
+    from vectorized_scorer import CRITERION_FIELDS, extract_counts, score_counts
+
+    records = generate_corpus(count, seed=1)
+    transcripts = [record["transcript"] for record in records]
+    durations = [record["duration"] for record in records]
+    rubric = get_rubric()
+    # Each path starts with an empty sentence cache, so neither reuses the other's grammar checks
+    sentence_cache = get_grammar_checker(rubric.grammar_backend)._sentence_cache
+
+    sentence_cache.clear()
+    start = time.perf_counter()
+    counts = extract_counts(transcripts, durations, rubric)
+    extracted = time.perf_counter()
+    scores = score_counts(counts, rubric)
+    vectorized = time.perf_counter() - start
+    extract_seconds, array_seconds = extracted - start, vectorized - (extracted - start)
+
+    sentence_cache.clear()
+    start = time.perf_counter()
+    expected = [calculate_final_score(transcript, duration, rubric=rubric)
+                for transcript, duration in zip(transcripts, durations)]
+    scalar = time.perf_counter() - start
+
+    names = [criterion.name for criterion in build_execution_plan(rubric=rubric)[0]]
+    identical = all(
+        int(row["overall_score"]) == result["overall_score"]
+        and [int(row[field]) for field in CRITERION_FIELDS] == [c["score"] for c in result["per_criterion_scores"]]
+        for row, result in zip(scores, expected)
+    ) and names == [c["criterion"] for c in expected[0]["per_criterion_scores"]]
+    words = sum(len(transcript.split()) for transcript in transcripts)
+    print(f"{count} transcripts ({words} words), transcripts to scores:")
+    print(f"  vectorized  {vectorized:.3f}s (extract_counts {extract_seconds:.3f}s, score_counts {array_seconds:.3f}s)")
+    print(f"  scalar      {scalar:.3f}s (calculate_final_score per transcript)")
+    print(f"  speedup     {scalar / vectorized:.2f}x, identical={identical}")
+
+def bench_sentiment(sizes: list) -> None:
+    """Reports the share of end-to-end scoring time spent in the lexicon sentiment pass."""
+    from sentiment_lexicon import sentiment_compound
+    print(f"{'words':>8} {'total (ms)':>11} {'sentiment (ms)':>15} {'share':>7}")
+    for size in sizes:
+        transcript = build_transcript(size, seed=size)
+        tokens = analyze_transcript(transcript).tokens
+        repeat = max(1, 20000 // size)
+        total = time_call(lambda: calculate_final_score(transcript, size / 2.5), repeat)
+        sentiment = time_call(lambda: sentiment_compound(tokens), repeat)
+        print(f"{size:>8} {total * 1e3:>11.3f} {sentiment * 1e3:>15.3f} {sentiment / total:>6.1%}")
+
+def bench_instrumentation(sizes: list) -> None:
+    """Compares calculate_final_score with instrumentation disabled, timing only, and with allocations."""
+    from instrumentation import INSTRUMENTATION
+    print(f"{'words':>8} {'disabled (ms)':>14} {'timing (ms)':>12} {'allocations (ms)':>17}")
+    for size in sizes:
+        transcript = build_transcript(size)
+        repeat = max(1, 20000 // size)
+        run = lambda: calculate_final_score(transcript, size / 2.5)
+        disabled = time_call(run, repeat)
+        INSTRUMENTATION.enable()
+        timing = time_call(run, repeat)
+        INSTRUMENTATION.disable()
+        INSTRUMENTATION.enable(track_allocations=True)
+        allocations = time_call(run, repeat)
+        INSTRUMENTATION.disable()
+        INSTRUMENTATION.reset()
+        print(f"{size:>8} {disabled * 1e3:>14.3f} {timing * 1e3:>12.3f} {allocations * 1e3:>17.3f}")
+
+def bench_streaming(sizes: list) -> None:
+    """Feeds transcripts in ~10-word chunks, comparing incremental snapshots with full rescoring."""
+    from streaming_scorer import IncrementalScorer
+    print(f"{'words':>8} {'chunks':>7} {'incremental (ms)':>17} {'rescore each (ms)':>18}")
+    for size in sizes:
+        words = build_transcript(size).split(" ")
+        chunks = [" ".join(words[i:i + 10]) + " " for i in range(0, len(words), 10)]
+        start = time.perf_counter()
+        scorer = IncrementalScorer()
+        for index, chunk in enumerate(chunks):
+            scorer.feed(chunk, (index + 1) * 4.0)
+            scorer.snapshot()
+        incremental = time.perf_counter() - start
+        # Rescoring the whole text per update is quadratic; only measured for small sessions
+        rescore = "skipped"
+        if size <= 10000:
+            start = time.perf_counter()
+            text = ""
+            for index, chunk in enumerate(chunks):
+                text += chunk
+                calculate_final_score(text, (index + 1) * 4.0)
+            rescore = f"{(time.perf_counter() - start) * 1e3:.1f}"
+        print(f"{size:>8} {len(chunks):>7} {incremental * 1e3:>17.1f} {rescore:>18}")
+
+def bench_results(rows: int) -> None:
+    """Compares the memory held by `rows` compact ScoreResults with the same results as dicts."""
+    import gc
+    import tracemalloc
+    from collections import Counter
+    from scorer_logic import (
+        combine_results, speech_rate_result, salutation_result, keyword_presence_result, flow_result,
+        vocabulary_richness_result, filler_word_rate_result, grammar_errors_result, sentiment_result
+    )
+    categories = list(KEYWORD_RULES)
+    fillers = Counter({"um": 2, "like": 1})
+    issues = [{"rule": "repeated_word", "message": ""}]
+
+    def build(index: int):
+        # Distinct counts per row, so numbers are not shared between results
+        words = 80 + index % 400
+        return combine_results([
+            speech_rate_result(words, 30.0 + index % 90, False),
+            salutation_result("Good"),
+            keyword_presence_result(categories[:index % 7]),
+            flow_result(True, index % 2 == 0),
+            vocabulary_richness_result(words // 2 + index % 13, words),
+            filler_word_rate_result(fillers, 3, words),
+            grammar_errors_result(issues[:index % 2], words, "rules"),
+            sentiment_result({"compound": (index % 200) / 100 - 1, "positive_tokens": index % 9, "negative_tokens": 1}),
+        ])
+
+    print(f"{'form':>8} {'results':>9} {'MiB':>9} {'bytes/result':>13} {'build (s)':>10}")
+    for form, make in (("compact", build), ("dict", lambda index: build(index).to_dict())):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        held = [make(index) for index in range(rows)]
+        elapsed = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{form:>8} {rows:>9} {size / 2 ** 20:>9.1f} {size / rows:>13.0f} {elapsed:>10.2f}")
+        del held
+
+def bench_profiles(sizes: list, count: int = 10) -> None:
+    """Scores against `count` rubric profiles in one pass and as one calculate_final_score per profile."""
+    from rubric_compiler import compile_profiles
+    from profile_scorer import score_profiles
+    extra_fillers = ["literally", "honestly", "to be honest", "you see", "anyway", "kind of", "i think", "just"]
+    rng = random.Random(0)
+    # Profiles differ in their filler and keyword lists and speaking rate, like separate programs
+    overrides = {}
+    for index in range(1, count):
+        keywords = rng.sample(list(KEYWORD_RULES), 5)
+        overrides[f"profile-{index}"] = {
+            "FILLER_WORDS": rng.sample(FILLER_WORDS, 12) + rng.sample(extra_fillers, 3),
+            "KEYWORD_LIST": keywords,
+            "KEYWORD_RULES": {category: KEYWORD_RULES[category] for category in keywords},
+            "STANDARD_SPEAKING_RATE_WPM": 130.0 + index,
+        }
+    rubrics = dict(list(compile_profiles({"RUBRIC_PROFILES": overrides}).items())[:count])
+
+    print(f"{'words':>8} {'profiles':>9} {'one pass (ms)':>14} {'separate (ms)':>14} {'single (ms)':>12} {'vs single':>10}")
+    for size in sizes:
+        transcript = build_transcript(size)
+        repeat = max(1, 20000 // size)
+        duration = size / 2.5
+        one_pass = time_call(lambda: score_profiles(transcript, duration, rubrics), repeat)
+        separate = time_call(lambda: [calculate_final_score(transcript, duration, rubric=rubric)
+                                      for rubric in rubrics.values()], repeat)
+        single = time_call(lambda: calculate_final_score(transcript, duration), repeat)
+        print(f"{size:>8} {len(rubrics):>9} {one_pass * 1e3:>14.3f} {separate * 1e3:>14.3f} "
+              f"{single * 1e3:>12.3f} {one_pass / single:>9.2f}x")
+
+
+BENCHMARKS = {
+    "tokenization": lambda args: bench_tokenization(args.sizes),
+    "fillers": lambda args: bench_fillers(args.sizes),
+    "keywords": lambda args: bench_keywords(args.sizes),
+    "vectorized": lambda args: bench_vectorized(args.transcripts),
+    "sentiment": lambda args: bench_sentiment(args.sizes),
+    "instrumentation": lambda args: bench_instrumentation(args.sizes),
+    "streaming": lambda args: bench_streaming(args.sizes),
+    "results": lambda args: bench_results(args.rows),
+    "profiles": lambda args: bench_profiles(args.sizes),
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scoring pipeline benchmarks.")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                        help="Transcript lengths in words.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Batch size for the results benchmark.")
+    parser.add_argument("--transcripts", type=int, default=5000, help="Transcripts scored end to end by the vectorized benchmark.")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
@@ -0,0 +1,399 @@
+# corpus_analytics.py
+# Corpus-level statistics over scoring results, gathered in one pass and in constant memory:
+# quantile sketches for the numeric metrics (WPM, TTR, filler rate, ...), a WPM histogram,
+# score and category counters, missing-keyword counts and per-cohort filler rates. Aggregates
+# built from different parts of a corpus (e.g. by pool workers) merge into one.
+#
+#   aggregate = CorpusAggregate()
+#   for result in score_batch(records, workers=4):
+#       aggregate.add(result)
+#   print(aggregate.to_json(indent=4))
+#
+# Usage: python corpus_analytics.py scores.jsonl --workers 4 --cohort-field cohort
+
+import json
+import math
+import sys
+from collections import Counter
+from typing import Iterable, Iterator
+from rubric_compiler import get_rubric
+from instrumentation import Histogram
+from result_types import CriterionResult, ScoreResult
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+# Values closer to zero than this are counted as zero by QuantileSketch
+MIN_INDEXED_VALUE = 1e-9
+# 20 WPM wide bins; the last bucket collects everything above 300 WPM
+WPM_HISTOGRAM_BOUNDS = [float(bound) for bound in range(20, 301, 20)]
+REPORT_QUANTILES = (0.05, 0.25, 0.50, 0.75, 0.95)
+DEFAULT_CHUNK_SIZE = 1024
+
+# Numeric metrics: name -> (criterion, attribute). Compact results expose the attribute as a
+# number; dict results carry the same name as a formatted string in `details`
+METRICS = {
+    "wpm": ("Speech Rate", "wpm"),
+    "word_count": ("Speech Rate", "word_count"),
+    "ttr": ("Vocabulary Richness", "ttr"),
+    "filler_rate_percent": ("Filler Word Rate", "filler_rate_percent"),
+    "errors_per_100_words": ("Grammar Errors", "errors_per_100_words"),
+    "sentiment_compound": ("Sentiment/Positivity", "compound"),
+}
+# Categorical details counted per value: name -> (criterion, attribute)
+CATEGORIES = {
+    "salutation": ("Salutation Level", "category"),
+    "sentiment": ("Sentiment/Positivity", "category"),
+}
+KEYWORD_CRITERION = "Key word Presence"
+
+# --- Quantile Sketch ---
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch with relative accuracy (DDSketch). Values fall into
+    logarithmic buckets of ratio gamma = (1 + a) / (1 - a), so every quantile is returned within
+    relative error `a` of an exact value at that rank. At most `max_buckets` buckets are kept
+    per sign; past that, the buckets nearest zero are collapsed into one.
+    """
+    __slots__ = ("relative_accuracy", "max_buckets", "gamma", "_log_gamma",
+                 "positive", "negative", "zero_count", "count", "total", "minimum", "maximum")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {} # bucket index -> count
+        self.negative = {} # bucket index of |value| -> count
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        if value > MIN_INDEXED_VALUE:
+            store = self.positive
+            index = math.ceil(math.log(value) / self._log_gamma)
+        elif value < -MIN_INDEXED_VALUE:
+            store = self.negative
+            index = math.ceil(math.log(-value) / self._log_gamma)
+        else:
+            store = None
+            self.zero_count += 1
+        if store is not None:
+            store[index] = store.get(index, 0) + 1
+            if len(store) > self.max_buckets:
+                self._collapse(store)
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, count in theirs.items():
+                mine[index] = mine.get(index, 0) + count
+            if len(mine) > self.max_buckets:
+                self._collapse(mine)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def _collapse(self, store: dict) -> None:
+        indexes = sorted(store)
+        excess = len(indexes) - self.max_buckets
+        target = indexes[excess]
+        store[target] += sum(store.pop(index) for index in indexes[:excess])
+
+    def _value(self, index: int) -> float:
+        # Midpoint of bucket (gamma^(i-1), gamma^i] in relative terms
+        return 2.0 * self.gamma ** index / (self.gamma + 1.0)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        # Most negative first: larger |value| buckets come first on the negative side
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return max(-self._value(index), self.minimum)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return min(self._value(index), self.maximum)
+        return self.maximum
+
+    def summary(self, quantiles: tuple = REPORT_QUANTILES) -> dict:
+        if self.count == 0:
+            return {"count": 0}
+        report = {"count": self.count, "mean": round(self.total / self.count, 4),
+                  "min": round(self.minimum, 4), "max": round(self.maximum, 4)}
+        for q in quantiles:
+            report[f"p{q * 100:g}"] = round(self.quantile(q), 4)
+        return report
+
+# --- Result Fields ---
+# Results may be compact ScoreResults or calculate_final_score-style dicts (e.g. read back from
+# a batch JSONL file); these read the same fields from either without rendering feedback.
+# Dicts come from files, so entries of the wrong shape are skipped rather than trusted
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_result(result) -> bool:
+    if isinstance(result, ScoreResult):
+        return True
+    return isinstance(result, dict) and "error" not in result and _is_number(result.get("overall_score"))
+
+def _criterion_items(result) -> Iterator:
+    items = result["per_criterion_scores"] if isinstance(result, ScoreResult) else result.get("per_criterion_scores")
+    if not isinstance(items, (list, tuple)):
+        return ()
+    return (item for item in items if isinstance(item, CriterionResult) or (
+        isinstance(item, dict) and isinstance(item.get("criterion"), str) and _is_number(item.get("score"))))
+
+def _field(item, name: str):
+    if isinstance(item, CriterionResult):
+        return getattr(item, name, None)
+    details = item.get("details")
+    return details.get(name) if isinstance(details, dict) else None
+
+def _number(item, name: str):
+    value = _field(item, name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+# --- Aggregates ---
+
+class CohortStats:
+    """Overall score and filler rate distributions for one cohort."""
+    __slots__ = ("count", "overall_score", "filler_rate_percent")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.count = 0
+        self.overall_score = QuantileSketch(relative_accuracy)
+        self.filler_rate_percent = QuantileSketch(relative_accuracy)
+
+    def merge(self, other: "CohortStats") -> None:
+        self.count += other.count
+        self.overall_score.merge(other.overall_score)
+        self.filler_rate_percent.merge(other.filler_rate_percent)
+
+    def summary(self) -> dict:
+        return {"count": self.count,
+                "overall_score": self.overall_score.summary(),
+                "filler_rate_percent": self.filler_rate_percent.summary()}
+
+
+class CorpusAggregate:
+    """
+    One-pass, mergeable statistics over scoring results. Memory depends only on the number of
+    criteria, categories and cohorts, never on the number of results. Instances pickle, so pool
+    workers can return partial aggregates for the parent to merge.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.count = 0
+        self.errors = 0
+        self.estimated_durations = 0
+        self.overall_score = QuantileSketch(relative_accuracy)
+        self.metrics = {name: QuantileSketch(relative_accuracy) for name in METRICS}
+        self.wpm_histogram = Histogram(WPM_HISTOGRAM_BOUNDS)
+        self.criterion_scores = {} # criterion -> Counter(score -> results)
+        self.categories = {name: Counter() for name in CATEGORIES}
+        self.keyword_results = 0
+        self.missing_keywords = Counter()
+        self.cohorts = {} # cohort -> CohortStats
+
+    def add(self, result, cohort=None) -> None:
+        """
+        Adds one ScoreResult or result dict. Results with an 'error' entry, and anything else
+        without a numeric overall score, are only counted as errors.
+        """
+        if not _is_result(result):
+            self.errors += 1
+            return
+        self.count += 1
+        overall = result["overall_score"]
+        self.overall_score.add(overall)
+
+        items = {}
+        for item in _criterion_items(result):
+            criterion = item["criterion"]
+            items[criterion] = item
+            scores = self.criterion_scores.get(criterion)
+            if scores is None:
+                scores = self.criterion_scores[criterion] = Counter()
+            scores[item["score"]] += 1
+
+        for name, (criterion, field) in METRICS.items():
+            item = items.get(criterion)
+            value = _number(item, field) if item is not None else None
+            if value is not None:
+                self.metrics[name].add(value)
+        speech = items.get("Speech Rate")
+        if speech is not None:
+            wpm = _number(speech, "wpm")
+            if wpm is not None:
+                self.wpm_histogram.observe(wpm)
+            if _field(speech, "is_estimated"):
+                self.estimated_durations += 1
+
+        for name, (criterion, field) in CATEGORIES.items():
+            item = items.get(criterion)
+            value = _field(item, field) if item is not None else None
+            if isinstance(value, str):
+                self.categories[name][value] += 1
+
+        keywords = items.get(KEYWORD_CRITERION)
+        if keywords is not None:
+            rubric = keywords.rubric if isinstance(keywords, CriterionResult) else get_rubric()
+            found = set(_field(keywords, "found_keywords") or ())
+            self.keyword_results += 1
+            for category in rubric.keyword_categories:
+                if category not in found:
+                    self.missing_keywords[category] += 1
+
+        if cohort is not None:
+            if not isinstance(cohort, (str, int, float)):
+                cohort = json.dumps(cohort, sort_keys=True) # Lists and objects read from JSON are unhashable
+            stats = self.cohorts.get(cohort)
+            if stats is None:
+                stats = self.cohorts[cohort] = CohortStats(self.relative_accuracy)
+            stats.count += 1
+            stats.overall_score.add(overall)
+            filler = items.get("Filler Word Rate")
+            value = _number(filler, "filler_rate_percent") if filler is not None else None
+            if value is not None:
+                stats.filler_rate_percent.add(value)
+
+    def update(self, results: Iterable, cohort_of=None) -> "CorpusAggregate":
+        """Adds every result; `cohort_of(result)` names each result's cohort (None for no cohort)."""
+        for result in results:
+            self.add(result, cohort_of(result) if cohort_of else None)
+        return self
+
+    def merge(self, other: "CorpusAggregate") -> "CorpusAggregate":
+        """Folds another aggregate (e.g. a worker's partial) into this one."""
+        self.count += other.count
+        self.errors += other.errors
+        self.estimated_durations += other.estimated_durations
+        self.overall_score.merge(other.overall_score)
+        for name, sketch in other.metrics.items():
+            self.metrics[name].merge(sketch)
+        self.wpm_histogram.merge(other.wpm_histogram)
+        for criterion, scores in other.criterion_scores.items():
+            self.criterion_scores.setdefault(criterion, Counter()).update(scores)
+        for name, counts in other.categories.items():
+            self.categories[name].update(counts)
+        self.keyword_results += other.keyword_results
+        self.missing_keywords.update(other.missing_keywords)
+        for cohort, stats in other.cohorts.items():
+            if cohort in self.cohorts:
+                self.cohorts[cohort].merge(stats)
+            else:
+                self.cohorts[cohort] = stats
+        return self
+
+    # --- Report ---
+
+    def summary(self) -> dict:
+        """A compact JSON-ready report of the whole corpus."""
+        histogram = self.wpm_histogram
+        upper_bounds = [*histogram.bounds, None] # None: no upper limit
+        return {
+            "results": self.count,
+            "errors": self.errors,
+            "estimated_durations": self.estimated_durations,
+            "overall_score": self.overall_score.summary(),
+            "metrics": {name: sketch.summary() for name, sketch in self.metrics.items()},
+            "wpm_histogram": [{"le": bound, "count": count}
+                              for bound, count in zip(upper_bounds, histogram.counts) if count],
+            "criterion_scores": {criterion: dict(sorted(scores.items()))
+                                 for criterion, scores in self.criterion_scores.items()},
+            "categories": {name: dict(counts.most_common()) for name, counts in self.categories.items()},
+            "missing_keywords": {category: {"count": count, "share": round(count / self.keyword_results, 4)}
+                                 for category, count in self.missing_keywords.most_common()},
+            "cohorts": {str(cohort): stats.summary() for cohort, stats in sorted(self.cohorts.items(), key=lambda c: str(c[0]))},
+        }
+
+    def to_json(self, indent: int = None) -> str:
+        return json.dumps(self.summary(), indent=indent)
+
+# --- Batch Aggregation ---
+
+def aggregate_lines(lines: list, cohort_field: str = None) -> list:
+    """Aggregates a chunk of JSONL result lines; the unit of work sent to pool workers."""
+    aggregate = CorpusAggregate()
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            result = json.loads(line)
+        except json.JSONDecodeError:
+            aggregate.errors += 1
+            continue
+        aggregate.add(result, result.get(cohort_field) if cohort_field and isinstance(result, dict) else None)
+    return [aggregate]
+
+def aggregate_jsonl(stream, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    cohort_field: str = None) -> CorpusAggregate:
+    """
+    Aggregates a JSONL stream of results (as written by batch_scorer). With `workers` > 1,
+    chunks of lines are parsed and aggregated on a process pool and the partials merged.
+    """
+    from batch_scorer import iter_chunks, _run_tasks
+    total = CorpusAggregate()
+    tasks = ((chunk, cohort_field) for chunk in iter_chunks(stream, chunk_size))
+    # Aggregation never scores, so workers skip compiling the rubric and starting a grammar backend
+    for partial in _run_tasks(aggregate_lines, tasks, workers, ordered=False, initializer=None):
+        total.merge(partial)
+    return total
+
+def main(argv: list = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize a JSONL file of scoring results.")
+    parser.add_argument("input", help="Results JSONL path (as written by batch_scorer.py), or '-' for stdin.")
+    parser.add_argument("-o", "--output", default="-", help="Summary JSON path, or '-' for stdout.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Worker processes (1 aggregates in-process).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Result lines per dispatched chunk.")
+    parser.add_argument("--cohort-field", default=None, help="Result field that names each result's cohort (batch_scorer.py --cohort-field copies it from the input).")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        aggregate = aggregate_jsonl(source, args.workers, args.chunk_size, args.cohort_field)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    report = aggregate.to_json(indent=4)
+    if args.output == "-":
+        print(report)
+    else:
+        with open(args.output, "w", encoding="utf-8") as sink:
+            sink.write(report + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+# corpus_reader.py
+# Memory-mapped access to large transcript archives, for batch scoring without loading the corpus.
+# Supports JSONL ({id, transcript, duration} per line) and a length-prefixed binary format.
+# An offset index is built on first open and saved next to the corpus (<path>.idx); records are
+# then served by position or id as slices of the mapping, decoding only the record requested.
+# The corpus and its index are both mapped read-only, so worker processes opening the same file
+# share their pages instead of each parsing its own copy of the index.
+#
+#   with CorpusReader("archive.jsonl") as corpus:
+#       record = corpus.get("call-1042")
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+JSONL = "jsonl"
+LENGTH_PREFIXED = "length_prefixed"
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 2
+
+# Length-prefixed record: header (id length, transcript length, duration), id bytes, transcript bytes
+RECORD_HEADER = struct.Struct("<HId")
+LENGTH_PREFIXED_MAGIC = b"TRSC\x01"
+MAX_ID_BYTES = 0xFFFF
+MAX_TRANSCRIPT_BYTES = 0xFFFFFFFF
+
+# Index file: header (magic, version, format, source size, source mtime, record count), then the
+# record offsets, record lengths and id end offsets as native uint64 arrays, then the ids as
+# JSON-encoded UTF-8 bytes. The arrays are cast straight from the mapping, so the header keeps
+# them 8-byte aligned and the magic records the byte order they were written in.
+INDEX_MAGIC = b"TRIDX" + sys.byteorder[0].upper().encode("ascii") + b"\x00\x00"
+INDEX_HEADER = struct.Struct("=8sIIQqQ")
+_FORMAT_CODES = {JSONL: 1, LENGTH_PREFIXED: 2}
+
+# Reads a leading "id" field straight from the line bytes, so indexing skips decoding transcripts
+_LEADING_ID = re.compile(rb'\s*\{\s*"id"\s*:\s*("(?:[^"\\]|\\.)*"|-?\d+)\s*[,}]')
+
+# --- Writing ---
+
+def write_length_prefixed(records: Iterable, path: str) -> int:
+    """Writes {id, transcript, duration} records in the length-prefixed format. Returns the record count."""
+    count = 0
+    with open(path, "wb") as sink:
+        sink.write(LENGTH_PREFIXED_MAGIC)
+        for record in records:
+            record_id = str(record.get("id", count)).encode("utf-8")
+            transcript = record["transcript"].encode("utf-8")
+            if len(record_id) > MAX_ID_BYTES:
+                raise ValueError(f"Record {count}: id is {len(record_id)} bytes; the length-prefixed format allows {MAX_ID_BYTES}")
+            if len(transcript) > MAX_TRANSCRIPT_BYTES:
+                raise ValueError(f"Record {count}: transcript is {len(transcript)} bytes; the length-prefixed format allows {MAX_TRANSCRIPT_BYTES}")
+            sink.write(RECORD_HEADER.pack(len(record_id), len(transcript), float(record.get("duration") or 0.0)))
+            sink.write(record_id)
+            sink.write(transcript)
+            count += 1
+    return count
+
+# --- Index ---
+
+def _detect_format(mapped) -> str:
+    return LENGTH_PREFIXED if mapped[:len(LENGTH_PREFIXED_MAGIC)] == LENGTH_PREFIXED_MAGIC else JSONL
+
+def _index_jsonl(mapped) -> tuple:
+    """Returns (ids, offsets, lengths) for each non-empty line; ids follow batch_scorer.read_jsonl."""
+    ids, offsets, lengths = [], array("Q"), array("Q")
+    size, position, line_number = len(mapped), 0, 0
+    while position < size:
+        end = mapped.find(b"\n", position)
+        if end == -1:
+            end = size
+        line_number += 1
+        line = mapped[position:end]
+        if line.strip():
+            match = _LEADING_ID.match(line)
+            if match:
+                record_id = json.loads(match.group(1))
+            else:
+                try:
+                    record = json.loads(line)
+                    record_id = record.get("id") if isinstance(record, dict) else None
+                except json.JSONDecodeError:
+                    record_id = f"line:{line_number}"
+            ids.append(record_id)
+            offsets.append(position)
+            lengths.append(end - position)
+        position = end + 1
+    return ids, offsets, lengths
+
+def _index_length_prefixed(mapped) -> tuple:
+    """Returns (ids, offsets, lengths) of each whole record, header included."""
+    ids, offsets, lengths = [], array("Q"), array("Q")
+    size, position = len(mapped), len(LENGTH_PREFIXED_MAGIC)
+    while position < size:
+        if position + RECORD_HEADER.size > size:
+            raise ValueError(f"Truncated record header at byte {position}")
+        id_length, transcript_length, _ = RECORD_HEADER.unpack_from(mapped, position)
+        id_start = position + RECORD_HEADER.size
+        transcript_start = id_start + id_length
+        position = transcript_start + transcript_length
+        if position > size:
+            raise ValueError(f"Truncated record at byte {id_start - RECORD_HEADER.size}")
+        ids.append(mapped[id_start:transcript_start].decode("utf-8"))
+        offsets.append(id_start - RECORD_HEADER.size)
+        lengths.append(position - offsets[-1])
+    return ids, offsets, lengths
+
+class _IndexedIds:
+    """Sequence over the ids stored in a mapped index file; each id is decoded when it is read."""
+
+    def __init__(self, ends, blob):
+        self._ends = ends
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, position: int):
+        if position < 0:
+            position += len(self._ends)
+        if not 0 <= position < len(self._ends):
+            raise IndexError("id position out of range")
+        start = self._ends[position - 1] if position else 0
+        return json.loads(str(self._blob[start:self._ends[position]], "utf-8"))
+
+    def __iter__(self) -> Iterator:
+        start = 0
+        for end in self._ends:
+            yield json.loads(str(self._blob[start:end], "utf-8"))
+            start = end
+
+def _write_index(path: str, signature: tuple, ids: list, offsets: array, lengths: array) -> None:
+    ends, blob, end = array("Q"), bytearray(), 0
+    for record_id in ids:
+        encoded = json.dumps(record_id).encode("utf-8")
+        blob += encoded
+        end += len(encoded)
+        ends.append(end)
+    with open(path, "wb") as sink:
+        sink.write(INDEX_HEADER.pack(INDEX_MAGIC, *signature, len(offsets)))
+        sink.write(offsets.tobytes())
+        sink.write(lengths.tobytes())
+        sink.write(ends.tobytes())
+        sink.write(blob)
+
+# --- Reader ---
+
+class CorpusReader:
+    """
+    Read-only, memory-mapped view of a transcript corpus. `len()`, iteration, `record(position)`
+    and `get(record_id)` return {id, transcript, duration} dicts; `transcript_bytes(position)`
+    returns the undecoded slice (the transcript for the length-prefixed format, the whole line
+    for JSONL). Ids are looked up by their string form.
+
+    Readers pickle as their paths, so handing one to a worker process reopens the mapping there
+    instead of copying the corpus.
+    """
+
+    def __init__(self, path: str, index_path: str = None, save_index: bool = True):
+        self.path = path
+        self.index_path = index_path or path + INDEX_SUFFIX
+        self.save_index = save_index
+        self._open()
+
+    def _open(self) -> None:
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._view = memoryview(self._mapped)
+        self.format = _detect_format(self._mapped)
+        self._index_mapped, self._index_views = None, []
+        self.ids, self._offsets, self._lengths = self._load_or_build_index()
+        self._positions = None
+
+    def _source_signature(self) -> tuple:
+        stat = os.fstat(self._file.fileno())
+        return INDEX_VERSION, _FORMAT_CODES[self.format], stat.st_size, stat.st_mtime_ns
+
+    def _map_index(self, signature: tuple):
+        """Maps a saved index matching `signature`; returns (ids, offsets, lengths), or None if it is missing or stale."""
+        try:
+            with open(self.index_path, "rb") as source:
+                mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None # Missing or empty
+        if len(mapped) >= INDEX_HEADER.size:
+            magic, *saved, count = INDEX_HEADER.unpack_from(mapped)
+            arrays_end = INDEX_HEADER.size + 3 * 8 * count
+            if magic == INDEX_MAGIC and tuple(saved) == signature and len(mapped) >= arrays_end:
+                view = memoryview(mapped)
+                offsets, lengths, ends = (view[start:start + 8 * count].cast("Q")
+                                          for start in (INDEX_HEADER.size + 8 * count * n for n in range(3)))
+                if (ends[-1] if count else 0) == len(mapped) - arrays_end:
+                    blob = view[arrays_end:]
+                    self._index_mapped, self._index_views = mapped, [offsets, lengths, ends, blob, view]
+                    return _IndexedIds(ends, blob), offsets, lengths
+                for partial in (offsets, lengths, ends, view):
+                    partial.release()
+        mapped.close()
+        return None
+
+    def _load_or_build_index(self) -> tuple:
+        signature = self._source_signature()
+        mapped = self._map_index(signature)
+        if mapped is not None:
+            return mapped
+
+        build = _index_length_prefixed if self.format == LENGTH_PREFIXED else _index_jsonl
+        ids, offsets, lengths = build(self._mapped)
+        if self.save_index:
+            try:
+                _write_index(self.index_path, signature, ids, offsets, lengths)
+            except OSError:
+                pass # Read-only location; the index is simply rebuilt next time
+        return ids, offsets, lengths
+
+    # --- Access ---
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def transcript_bytes(self, position: int) -> memoryview:
+        offset = self._offsets[position]
+        if self.format == LENGTH_PREFIXED:
+            id_length, transcript_length, _ = RECORD_HEADER.unpack_from(self._mapped, offset)
+            start = offset + RECORD_HEADER.size + id_length
+            return self._view[start:start + transcript_length]
+        return self._view[offset:offset + self._lengths[position]]
+
+    def record(self, position: int) -> dict:
+        raw = self.transcript_bytes(position)
+        if self.format == LENGTH_PREFIXED:
+            _, _, duration = RECORD_HEADER.unpack_from(self._mapped, self._offsets[position])
+            return {"id": self.ids[position], "transcript": str(raw, "utf-8"), "duration": duration}
+        try:
+            record = json.loads(str(raw, "utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return {"id": self.ids[position]}
+        return record if isinstance(record, dict) else {"id": self.ids[position]}
+
+    def position_of(self, record_id) -> int:
+        if self._positions is None:
+            # Built on first lookup by id; first occurrence wins for duplicate ids
+            positions = {}
+            for position, known_id in enumerate(self.ids):
+                positions.setdefault(str(known_id), position)
+            self._positions = positions
+        try:
+            return self._positions[str(record_id)]
+        except KeyError:
+            raise KeyError(f"No record with id {record_id!r} in {self.path}") from None
+
+    def get(self, record_id) -> dict:
+        return self.record(self.position_of(record_id))
+
+    def iter_records(self, start: int = 0, stop: int = None) -> Iterator[dict]:
+        for position in range(start, len(self) if stop is None else min(stop, len(self))):
+            yield self.record(position)
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.iter_records()
+
+    # --- Lifecycle ---
+
+    def close(self) -> None:
+        for view in self._index_views:
+            view.release()
+        if self._index_mapped is not None:
+            self._index_mapped.close()
+        self._view.release()
+        if isinstance(self._mapped, mmap.mmap):
+            self._mapped.close()
+        self._file.close()
+
+    def __enter__(self) -> "CorpusReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path, "index_path": self.index_path, "save_index": self.save_index}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._open()
+
+
+_readers = {}
+
+def get_corpus_reader(path: str) -> CorpusReader:
+    """Returns this process's reader for a corpus, opening (and indexing) it on first use."""
+    reader = _readers.get(path)
+    if reader is None:
+        reader = _readers[path] = CorpusReader(path)
+    return reader
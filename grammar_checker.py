@@ -0,0 +1,222 @@
+# grammar_checker.py
+# Grammar error detection behind a pluggable backend interface.
+# The default backend is a small offline rule set; 'languagetool' uses language-tool-python
+# when it is installed. Checkers are long-lived: one per backend per process, reused by
+# every request, with per-sentence results cached.
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_SENTENCE_CACHE_SIZE = 50_000
+# Unpunctuated speech (e.g. raw ASR output) has no sentence boundaries; longer "sentences" are
+# cut into pieces of at most this many characters, so checks and cache keys stay bounded
+MAX_SENTENCE_LENGTH = 1000
+CUT_CHARACTERS = " \t\n\r"
+
+def sentence_cut(sentence: str) -> int:
+    """
+    Where to cut a sentence longer than MAX_SENTENCE_LENGTH: at its last whitespace within the
+    limit, or at the limit if there is none. Depends only on the first MAX_SENTENCE_LENGTH
+    characters, so a streaming scorer can cut a growing sentence at the same place.
+    """
+    cut = max(sentence.rfind(character, 1, MAX_SENTENCE_LENGTH) for character in CUT_CHARACTERS)
+    return cut if cut > 0 else MAX_SENTENCE_LENGTH
+
+def split_long_sentence(sentence: str) -> list:
+    """Cuts a stripped sentence into pieces of at most MAX_SENTENCE_LENGTH characters."""
+    pieces = []
+    while len(sentence) > MAX_SENTENCE_LENGTH:
+        cut = sentence_cut(sentence)
+        pieces.append(sentence[:cut].rstrip())
+        sentence = sentence[cut:].lstrip()
+    pieces.append(sentence)
+    return pieces
+
+def split_sentences(transcript: str) -> list:
+    """
+    Splits a transcript into sentences on terminal punctuation followed by whitespace; sentences
+    longer than MAX_SENTENCE_LENGTH are cut into pieces (see split_long_sentence).
+    """
+    return [piece for part in SENTENCE_BOUNDARY.split(transcript)
+            for piece in split_long_sentence(part.strip()) if piece]
+
+# --- Backends ---
+
+class GrammarBackend:
+    """
+    Interface for grammar backends. `check_sentences` receives a batch of sentences and returns,
+    for each sentence, a list of issues as {"rule": str, "message": str} dicts.
+    """
+    name = "base"
+
+    def check_sentences(self, sentences: list) -> list:
+        raise NotImplementedError
+
+
+class RuleBasedGrammarBackend(GrammarBackend):
+    """
+    Offline default: conservative regex rules for common spoken-English errors.
+    Rules only fire on clear mistakes so that well-formed transcripts keep a full score.
+    """
+    name = "rules"
+
+    RULES = [
+        ("repeated_word", r"\b(?!(?:had|that|is|very|so|no|bye|ha)\b)([a-z]+)\s+\1\b",
+         "Repeated word."),
+        # The letter "a" as a word ("plan a or b", "grade a in maths") is followed by a function word
+        ("a_before_vowel", r"\ba\s+(?!(?:and|or|if|in|into|is|are|as|at|of|off|on|onto|it|its|up|upon|each|either|even)\b)"
+                           r"(?!(?:one|once|eu|uni|use|usu|ure|uti)[a-z]*\b)[aeiou][a-z]*\b",
+         "Use 'an' before a vowel sound."),
+        ("an_before_consonant", r"\ban\s+(?!(?:hour|honest|honou?r|heir)[a-z]*\b)[bcdfgjklmnpqrstvwz][a-z]*\b",
+         "Use 'a' before a consonant sound."),
+        ("subject_verb_i", r"\bi\s+(?:is|are)\b",
+         "'I' takes 'am'."),
+        ("subject_verb_plural", r"\b(?:you|we|they)\s+(?:is|was)\b",
+         "Plural subjects take 'are'/'were'."),
+        ("subject_verb_singular", r"\b(?:he|she|it)\s+(?:are|don't)\b",
+         "Singular subjects take 'is'/'doesn't'."),
+        ("modal_of", r"\b(?:could|would|should|must|might)\s+of\b",
+         "Use 'have' after a modal verb, not 'of'."),
+        ("double_comparative", r"\b(?:more|most)\s+(?:better|best|worse|worst)\b",
+         "Double comparative."),
+    ]
+
+    def __init__(self):
+        self.compiled = [(rule, re.compile(pattern), message) for rule, pattern, message in self.RULES]
+
+    def check_sentences(self, sentences: list) -> list:
+        results = []
+        for sentence in sentences:
+            text = sentence.lower()
+            issues = []
+            for rule, pattern, message in self.compiled:
+                for _ in pattern.finditer(text):
+                    issues.append({"rule": rule, "message": message})
+            results.append(issues)
+        return results
+
+
+class LanguageToolBackend(GrammarBackend):
+    """
+    Wraps language-tool-python (pip install language-tool-python). The LanguageTool server is
+    started once when the backend is created and reused for every batch afterwards.
+    """
+    name = "languagetool"
+
+    def __init__(self, language: str = "en-US"):
+        import language_tool_python # Optional dependency, only needed for this backend
+        self.tool = language_tool_python.LanguageTool(language)
+
+    def check_sentences(self, sentences: list) -> list:
+        # One request per batch: sentences are joined, and matches mapped back by offset
+        text = "\n".join(sentences)
+        starts, position = [], 0
+        for sentence in sentences:
+            starts.append(position)
+            position += len(sentence) + 1
+        results = [[] for _ in sentences]
+        index = 0
+        for match in self.tool.check(text):
+            while index + 1 < len(starts) and starts[index + 1] <= match.offset:
+                index += 1
+            results[index].append({"rule": match.ruleId, "message": match.message})
+        return results
+
+
+GRAMMAR_BACKENDS = {
+    RuleBasedGrammarBackend.name: RuleBasedGrammarBackend,
+    LanguageToolBackend.name: LanguageToolBackend,
+}
+
+def register_grammar_backend(name: str, factory) -> None:
+    """Registers a backend factory (a zero-argument callable returning a GrammarBackend)."""
+    GRAMMAR_BACKENDS[name] = factory
+    _checkers.pop(name, None)
+
+# --- Pooled Checker ---
+
+class GrammarChecker:
+    """
+    A long-lived checker around one backend: splits transcripts into sentences, serves repeated
+    sentences from an LRU cache and sends only uncached sentences to the backend, in batches.
+    Safe to share between threads: checks hold a lock, so they also reach the backend one at a time.
+    """
+
+    def __init__(self, backend: GrammarBackend, batch_size: int = DEFAULT_BATCH_SIZE,
+                 cache_size: int = DEFAULT_SENTENCE_CACHE_SIZE):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._sentence_cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check_texts(self, transcripts: Iterable) -> list:
+        """Returns, for each transcript, the list of issues found across its sentences."""
+        split = [split_sentences(transcript) for transcript in transcripts]
+        with self._lock:
+            return self._check_split(split)
+
+    def _check_split(self, split: list) -> list:
+        # Issues of each distinct sentence, held for the whole call: a batch with more new sentences
+        # than the cache holds would otherwise evict its own earlier ones before they are read
+        found = {}
+        for sentences in split:
+            for sentence in sentences:
+                if sentence not in found:
+                    cached = self._sentence_cache.get(sentence)
+                    if cached is not None:
+                        self._sentence_cache.move_to_end(sentence)
+                    found[sentence] = cached
+        pending = [sentence for sentence, issues in found.items() if issues is None]
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            for sentence, issues in zip(batch, self.backend.check_sentences(batch)):
+                found[sentence] = issues
+                self._remember(sentence, issues)
+        return [[issue for sentence in sentences for issue in found[sentence]] for sentences in split]
+
+    def check(self, transcript: str, remember: bool = True) -> list:
+        """
+        Returns the issues found in one transcript. With `remember=False`, sentences missing from
+        the cache are checked without being added to it; use it for text that is still growing,
+        whose every prefix would otherwise take a cache entry.
+        """
+        if remember:
+            return self.check_texts([transcript])[0]
+        sentences = split_sentences(transcript)
+        with self._lock:
+            missing = [sentence for sentence in sentences if sentence not in self._sentence_cache]
+            fresh = dict(zip(missing, self.backend.check_sentences(missing))) if missing else {}
+            issues = []
+            for sentence in sentences:
+                cached = self._sentence_cache.get(sentence)
+                issues.extend(fresh[sentence] if cached is None else cached)
+        return issues
+
+    def _remember(self, sentence: str, issues: list) -> None:
+        self._sentence_cache[sentence] = issues
+        self._sentence_cache.move_to_end(sentence)
+        if len(self._sentence_cache) > self.cache_size:
+            self._sentence_cache.popitem(last=False)
+
+
+_checkers = {}
+
+def get_grammar_checker(backend_name: str = None) -> GrammarChecker:
+    """
+    Returns this process's checker for a backend (default: rubric_config.GRAMMAR_BACKEND),
+    loading the backend on first use only.
+    """
+    if backend_name is None:
+        from rubric_config import GRAMMAR_BACKEND
+        backend_name = GRAMMAR_BACKEND
+    checker = _checkers.get(backend_name)
+    if checker is None:
+        if backend_name not in GRAMMAR_BACKENDS:
+            raise ValueError(f"Unknown grammar backend '{backend_name}'. Available: {sorted(GRAMMAR_BACKENDS)}")
+        checker = _checkers[backend_name] = GrammarChecker(GRAMMAR_BACKENDS[backend_name]())
+    return checker
@@ -0,0 +1,267 @@
+# instrumentation.py
+# Opt-in per-criterion timing and allocation tracking for the scoring orchestrator.
+# Disabled by default: calculate_final_score only checks one attribute per request.
+#
+#   from instrumentation import INSTRUMENTATION, CProfileHook
+#   INSTRUMENTATION.enable(track_allocations=True)
+#   INSTRUMENTATION.add_hook(CProfileHook("profiles"), when=lambda ctx: ctx["word_count"] > 5000)
+#   ... score ...
+#   print(INSTRUMENTATION.to_prometheus())
+
+import bisect
+import os
+import threading
+import time
+# cProfile and tracemalloc are imported where used: they are only needed once profiling or
+# allocation tracking is turned on, and would otherwise add to every worker's cold start
+
+REQUEST_LABEL = "request"
+
+def _geometric_bounds(start: float, stop: float, factor: float) -> list:
+    bounds = [start]
+    while bounds[-1] < stop:
+        bounds.append(bounds[-1] * factor)
+    return bounds
+
+# 1 microsecond to ~30 seconds, ~12% wide buckets
+SECONDS_BOUNDS = _geometric_bounds(1e-6, 30.0, 1.12)
+# 64 bytes to ~1 GiB, doubling
+BYTES_BOUNDS = _geometric_bounds(64.0, 2.0 ** 30, 2.0)
+
+# --- Histograms ---
+
+class Histogram:
+    """
+    Fixed-bucket histogram: constant memory, mergeable, with quantiles estimated by linear
+    interpolation inside the bucket holding the requested rank.
+    """
+
+    def __init__(self, bounds: list):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1) # Last bucket is overflow (+Inf)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: "Histogram") -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.maximum
+                return min(lower + (upper - lower) * ((rank - seen) / count), self.maximum)
+            seen += count
+        return self.maximum
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.maximum,
+        }
+
+# --- Hooks ---
+
+class CProfileHook:
+    """Profiles selected requests with cProfile, writing one .prof file per request to `directory`."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def start(self, context: dict):
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def stop(self, context: dict, profiler) -> None:
+        profiler.disable()
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(self.directory, f"request_{context['request_number']}.prof"))
+
+
+class TracemallocHook:
+    """Captures the top allocation sites of selected requests into `self.reports`."""
+
+    def __init__(self, top: int = 10, max_reports: int = 100):
+        self.top = top
+        self.max_reports = max_reports
+        self.reports = []
+
+    def start(self, context: dict):
+        import tracemalloc
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start()
+        return started_here, tracemalloc.take_snapshot()
+
+    def stop(self, context: dict, state) -> None:
+        import tracemalloc
+        started_here, before = state
+        # Ignore tracemalloc's own bookkeeping
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        before = before.filter_traces(ignore)
+        if started_here:
+            tracemalloc.stop()
+        stats = after.compare_to(before, "lineno")[:self.top]
+        if len(self.reports) < self.max_reports:
+            self.reports.append({
+                "request_number": context["request_number"],
+                "top_allocations": [{"site": str(stat.traceback), "size_diff": stat.size_diff} for stat in stats],
+            })
+
+# --- Instrumentation ---
+
+class Instrumentation:
+    """
+    Collects per-criterion and per-request wall time (and optionally allocated bytes) into
+    histograms, and runs profiling hooks around the requests their `when` predicate selects.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.track_allocations = False
+        self.hooks = []
+        self._lock = threading.Lock()
+        self._request_number = 0
+        self.reset()
+
+    def enable(self, track_allocations: bool = False) -> None:
+        """Turns recording on. Allocation tracking uses tracemalloc and slows scoring noticeably."""
+        self.track_allocations = track_allocations
+        if track_allocations:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self.track_allocations:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+        self.track_allocations = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.seconds = {}
+            self.allocated_bytes = {}
+
+    def add_hook(self, hook, when=None) -> None:
+        """
+        Attaches a hook (an object with start(context) and stop(context, state)) to requests
+        for which `when(context)` is true; every request if `when` is None.
+        """
+        self.hooks.append((hook, when))
+
+    def remove_hook(self, hook) -> None:
+        self.hooks = [(h, when) for h, when in self.hooks if h is not hook]
+
+    def _observe(self, label: str, seconds: float, allocated: int) -> None:
+        with self._lock:
+            histogram = self.seconds.get(label)
+            if histogram is None:
+                histogram = self.seconds[label] = Histogram(SECONDS_BOUNDS)
+            histogram.observe(seconds)
+            if allocated is not None:
+                histogram = self.allocated_bytes.get(label)
+                if histogram is None:
+                    histogram = self.allocated_bytes[label] = Histogram(BYTES_BOUNDS)
+                histogram.observe(allocated)
+
+    def _measure(self, label: str, func) -> tuple:
+        """Runs func(), records it under `label` and returns (result, allocated bytes or None)."""
+        if self.track_allocations:
+            import tracemalloc
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        allocated = None
+        if self.track_allocations:
+            # Peak growth during the call: counts memory allocated even if freed before returning
+            allocated = max(0, tracemalloc.get_traced_memory()[1] - before)
+        self._observe(label, elapsed, allocated)
+        return result, allocated
+
+    def run_request(self, criteria: list, word_count: int) -> list:
+        """Runs (criterion, callable) pairs in order, timing each one and the request as a whole."""
+        with self._lock:
+            self._request_number += 1
+            context = {"request_number": self._request_number, "word_count": word_count}
+        active = [(hook, hook.start(context)) for hook, when in self.hooks if when is None or when(context)]
+        try:
+            results, request_allocated = [], 0
+            start = time.perf_counter()
+            for name, run in criteria:
+                result, allocated = self._measure(name, run)
+                results.append(result)
+                request_allocated += allocated or 0
+            self._observe(REQUEST_LABEL, time.perf_counter() - start,
+                          request_allocated if self.track_allocations else None)
+            return results
+        finally:
+            for hook, state in reversed(active):
+                hook.stop(context, state)
+
+    # --- Export ---
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "seconds": {label: h.summary() for label, h in self.seconds.items()},
+                "allocated_bytes": {label: h.summary() for label, h in self.allocated_bytes.items()},
+            }
+
+    def to_json(self, indent: int = None) -> str:
+        import json
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "scorer") -> str:
+        """Renders all histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for metric, unit, histograms in (("duration", "seconds", self.seconds),
+                                             ("allocated", "bytes", self.allocated_bytes)):
+                if not histograms:
+                    continue
+                name = f"{prefix}_{metric}_{unit}"
+                lines.append(f"# HELP {name} Scoring {metric} per criterion ('{REQUEST_LABEL}' = whole request).")
+                lines.append(f"# TYPE {name} histogram")
+                for label, histogram in sorted(histograms.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{criterion="{label}",le="{bound:.6g}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{criterion="{label}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{criterion="{label}"}} {histogram.total:.9g}')
+                    lines.append(f'{name}_count{{criterion="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide instance used by calculate_final_score
+INSTRUMENTATION = Instrumentation()
@@ -0,0 +1,135 @@
+# matchers.py
+# Precompiled text matchers shared by the scoring criteria. Each matcher is compiled
+# once per distinct configuration and cached, so scoring calls never rebuild patterns.
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+WORD_BOUNDARY = re.compile(r'\b')
+
+# --- Filler Words ---
+
+class FillerMatcher:
+    """
+    Finds every filler word/phrase of a filler list in a single scan of the text.
+
+    Counts are identical to running `re.findall(r'\\b' + re.escape(filler) + r'\\b', text)`
+    once per filler: all fillers are combined into one longest-first alternation inside a
+    lookahead, so each word boundary is visited once and overlapping fillers
+    (e.g. "i" and "i mean") are still counted independently.
+    """
+
+    def __init__(self, fillers: tuple):
+        self.fillers = fillers
+        unique = list(dict.fromkeys(fillers))
+        # Longest first so the alternation reports the longest filler starting at a position
+        ordered = sorted(unique, key=len, reverse=True)
+        alternation = "|".join(re.escape(filler) for filler in ordered)
+        self.pattern = re.compile(r'\b(?=(' + alternation + r')\b)') if unique else None
+        # Any other filler matching at the same position must be a proper prefix of the longest one
+        self.shorter_prefixes = {
+            filler: [other for other in ordered if other != filler and filler.startswith(other)]
+            for filler in unique
+        }
+
+    def count(self, normalized_text: str) -> Counter:
+        """Returns a Counter of filler -> match count, ordered like the filler list."""
+        if self.pattern is None:
+            return Counter()
+        counts = dict.fromkeys(self.shorter_prefixes, 0)
+        next_allowed = dict.fromkeys(self.shorter_prefixes, 0)
+        self.scan(normalized_text, 0, len(normalized_text) + 1, counts, next_allowed)
+        return self.to_counter(counts)
+
+    def new_state(self) -> tuple:
+        """Fresh (counts, next_allowed) state for incremental scanning with `scan`."""
+        return dict.fromkeys(self.shorter_prefixes, 0), dict.fromkeys(self.shorter_prefixes, 0)
+
+    def scan(self, text: str, start: int, stop: int, counts: dict, next_allowed: dict) -> None:
+        """
+        Counts fillers starting in [start, stop) into `counts`, updating `next_allowed`.
+        Word boundaries see the whole of `text`, so a text window can be scanned in pieces
+        as long as each piece has at least the longest filler plus one character after it.
+        """
+        if self.pattern is None:
+            return
+        for match in self.pattern.finditer(text, start):
+            position = match.start()
+            if position >= stop:
+                break
+            longest = match.group(1)
+            candidates = [longest]
+            for prefix in self.shorter_prefixes[longest]:
+                if WORD_BOUNDARY.match(text, position + len(prefix)):
+                    candidates.append(prefix)
+            # Per filler, matches are non-overlapping, exactly as re.findall would return them
+            for filler in candidates:
+                if position >= next_allowed[filler]:
+                    counts[filler] += 1
+                    next_allowed[filler] = position + len(filler)
+
+    def to_counter(self, counts: dict) -> Counter:
+        """Converts scan counts to a Counter of found fillers, ordered like the filler list."""
+        found = Counter()
+        for filler in self.fillers:
+            if counts[filler]:
+                found[filler] = counts[filler]
+        return found
+
+    @property
+    def longest(self) -> int:
+        return max((len(filler) for filler in self.shorter_prefixes), default=0)
+
+    def total(self, found: Counter) -> int:
+        """Total filler count, counting duplicated list entries once per occurrence in the list."""
+        return sum(found.get(filler, 0) for filler in self.fillers)
+
+
+@lru_cache(maxsize=64)
+def _compile_filler_matcher(fillers: tuple) -> FillerMatcher:
+    return FillerMatcher(fillers)
+
+def get_filler_matcher(fillers) -> FillerMatcher:
+    """Returns the compiled matcher for a filler list, cached by the list contents."""
+    return _compile_filler_matcher(tuple(fillers))
+
+# --- Keyword Rules ---
+
+class KeywordRuleEngine:
+    """
+    Matches a set of keyword rules (category -> regex) compiled once per rule set.
+
+    Each rule is compiled separately rather than merged into one alternation: CPython's `re`
+    scans a merged alternation position by position, while a single rule keeps its
+    literal-prefix fast search, which measured well over 10x faster on long transcripts.
+    """
+
+    def __init__(self, rules: tuple):
+        self.categories = [category for category, _ in rules]
+        self.rule_patterns = [re.compile(pattern) for _, pattern in rules]
+
+    def find_categories(self, normalized_text: str) -> list:
+        """Returns the categories with at least one match, stopping each rule at its first match."""
+        return [
+            category for category, rule in zip(self.categories, self.rule_patterns)
+            if rule.search(normalized_text)
+        ]
+
+    def find_spans(self, normalized_text: str) -> dict:
+        """Returns {category: [(start, end), ...]} for every category with at least one match."""
+        spans = {}
+        for category, rule in zip(self.categories, self.rule_patterns):
+            matches = [match.span() for match in rule.finditer(normalized_text)]
+            if matches:
+                spans[category] = matches
+        return spans
+
+
+@lru_cache(maxsize=64)
+def _compile_keyword_engine(rules: tuple) -> KeywordRuleEngine:
+    return KeywordRuleEngine(rules)
+
+def get_keyword_engine(rules: dict) -> KeywordRuleEngine:
+    """Returns the compiled rule engine for a {category: pattern} mapping, cached by contents."""
+    return _compile_keyword_engine(tuple(rules.items()))
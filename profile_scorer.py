@@ -0,0 +1,171 @@
+# profile_scorer.py
+# Scores one transcript against several rubric profiles at once (see RUBRIC_PROFILES in
+# rubric_config). Work the profiles can share is done once: the transcript is analyzed once,
+# the union of every profile's filler words is counted in a single scan, each distinct keyword
+# rule is searched once, and grammar and sentiment are computed once per backend and lexicon.
+# Only the cheap per-profile steps (bucketing, weighting, salutation and flow phrases) repeat.
+#
+#   results = score_profiles(transcript, duration, ["default", "sales_calls"])
+#   results["sales_calls"].overall_score
+
+from collections import Counter
+from functools import lru_cache
+from typing import Union
+from rubric_compiler import BUILTIN_CRITERIA, CompiledRubric, get_profiles
+from matchers import get_filler_matcher
+from grammar_checker import get_grammar_checker
+from sentiment_lexicon import sentiment_compound
+from scorer_logic import (
+    AnalyzedTranscript, CRITERIA, INPUT_PROVIDERS, analyze_transcript, build_execution_plan, combine_results,
+    detect_salutation, detect_flow, speech_rate_result, salutation_result, keyword_presence_result, flow_result,
+    vocabulary_richness_result, grammar_errors_result, filler_word_rate_result, sentiment_result,
+)
+
+# --- Shared Matchers ---
+
+class ProfileGroup:
+    """
+    Matchers shared by a set of compiled profiles: one filler matcher over the union of their
+    filler lists, and one copy of each distinct keyword rule with each profile's categories
+    pointing into it.
+    """
+    __slots__ = ("rubrics", "filler_matcher", "keyword_rules", "profile_keywords", "grammar_backends")
+
+    def __init__(self, rubrics: dict):
+        self.rubrics = rubrics
+        # A filler's count does not depend on the other fillers in the list, so one scan over
+        # the union gives every profile's counts
+        self.filler_matcher = get_filler_matcher(sorted({f for r in rubrics.values() for f in r.filler_words}))
+
+        rules = {} # (pattern, flags) -> index into keyword_rules
+        compiled = []
+        self.profile_keywords = {}
+        for name, rubric in rubrics.items():
+            engine = rubric.keyword_engine
+            indexes = []
+            for category, rule in zip(engine.categories, engine.rule_patterns):
+                key = (rule.pattern, rule.flags)
+                if key not in rules:
+                    rules[key] = len(compiled)
+                    compiled.append(rule)
+                indexes.append((category, rules[key]))
+            self.profile_keywords[name] = tuple(indexes)
+        self.keyword_rules = tuple(compiled)
+        self.grammar_backends = tuple(dict.fromkeys(r.grammar_backend for r in rubrics.values()))
+
+
+@lru_cache(maxsize=16)
+def _profile_group(profiles: tuple) -> ProfileGroup:
+    return ProfileGroup(dict(profiles))
+
+def get_profile_group(rubrics: dict) -> ProfileGroup:
+    """Returns the shared matchers for a {name: CompiledRubric} set, cached until a profile is recompiled."""
+    return _profile_group(tuple(rubrics.items()))
+
+# --- Shared Analysis ---
+
+class SharedAnalysis:
+    """Everything computed once per transcript for all profiles of a ProfileGroup."""
+    __slots__ = ("transcript", "filler_counts", "keyword_hits", "grammar", "sentiment")
+
+    def __init__(self, group: ProfileGroup, transcript: AnalyzedTranscript):
+        self.transcript = transcript
+        text = transcript.normalized
+        self.filler_counts = group.filler_matcher.count(text)
+        self.keyword_hits = tuple(rule.search(text) is not None for rule in group.keyword_rules)
+        self.grammar = {}
+        for backend in group.grammar_backends:
+            checker = get_grammar_checker(backend)
+            self.grammar[backend] = (checker.check(transcript.raw), checker.backend.name)
+        self.sentiment = sentiment_compound(transcript.tokens)
+
+    def found_fillers(self, rubric: CompiledRubric) -> Counter:
+        """The profile's filler counts, ordered like its filler list (as FillerMatcher.count returns them)."""
+        found = Counter()
+        for filler in rubric.filler_matcher.fillers:
+            if self.filler_counts.get(filler):
+                found[filler] = self.filler_counts[filler]
+        return found
+
+# Built-in criteria from the shared analysis; each matches the criterion's registered scorer
+def _speech_rate(shared, group, name, rubric, values):
+    return speech_rate_result(shared.transcript.word_count, *values["duration"], rubric)
+
+def _salutation(shared, group, name, rubric, values):
+    return salutation_result(detect_salutation(shared.transcript.stripped, rubric), rubric)
+
+def _keyword_presence(shared, group, name, rubric, values):
+    hits = shared.keyword_hits
+    return keyword_presence_result([category for category, index in group.profile_keywords[name] if hits[index]],
+                                   None, rubric)
+
+def _flow(shared, group, name, rubric, values):
+    return flow_result(*detect_flow(shared.transcript.stripped, rubric), rubric)
+
+def _vocabulary_richness(shared, group, name, rubric, values):
+    transcript = shared.transcript
+    # The measure is cached on the transcript, so profiles with the same metric compute it once
+    measure = None if rubric.vocabulary_metric == "ttr" else transcript.vocabulary_measure(rubric)
+    return vocabulary_richness_result(transcript.distinct_count, transcript.word_count, rubric, measure)
+
+def _filler_word_rate(shared, group, name, rubric, values):
+    found = shared.found_fillers(rubric)
+    return filler_word_rate_result(found, rubric.filler_matcher.total(found), shared.transcript.word_count, rubric)
+
+def _grammar_errors(shared, group, name, rubric, values):
+    issues, backend_name = shared.grammar[rubric.grammar_backend]
+    return grammar_errors_result(issues, shared.transcript.word_count, backend_name, rubric)
+
+def _sentiment(shared, group, name, rubric, values):
+    return sentiment_result(shared.sentiment, rubric)
+
+SHARED_BUILDERS = {
+    "Speech Rate": _speech_rate,
+    "Salutation Level": _salutation,
+    "Key word Presence": _keyword_presence,
+    "Flow": _flow,
+    "Vocabulary Richness": _vocabulary_richness,
+    "Filler Word Rate": _filler_word_rate,
+    "Grammar Errors": _grammar_errors,
+    "Sentiment/Positivity": _sentiment,
+}
+
+# The scorers registered at import; a criterion re-registered under a built-in name runs as registered
+_BUILTIN_FUNCS = {name: CRITERIA[name].func for name in BUILTIN_CRITERIA}
+
+# --- Multi-Profile Scoring ---
+
+def score_profiles(transcript: Union[str, AnalyzedTranscript], duration_seconds: float,
+                   profiles: list = None) -> dict:
+    """
+    Scores a transcript against each named rubric profile (default: every profile) in one pass.
+    `profiles` may also be a {name: CompiledRubric} dict, e.g. from compile_profiles().
+    Returns {profile: ScoreResult}, each identical to
+    score_transcript(transcript, duration_seconds, rubric=get_rubric(profile)).
+    """
+    rubrics = profiles if isinstance(profiles, dict) else get_profiles(profiles)
+    group = get_profile_group(rubrics)
+    analyzed = analyze_transcript(transcript)
+    shared = SharedAnalysis(group, analyzed)
+
+    results = {}
+    for name, rubric in rubrics.items():
+        criteria, inputs = build_execution_plan(None, rubric)
+        values = {"raw_transcript": analyzed, "raw_duration": duration_seconds, "rubric": rubric}
+        for input_name in inputs:
+            dependencies, provider = INPUT_PROVIDERS[input_name]
+            values[input_name] = provider(**{dependency: values[dependency] for dependency in dependencies})
+
+        scored = []
+        for criterion in criteria:
+            if criterion.func is _BUILTIN_FUNCS.get(criterion.name):
+                scored.append(SHARED_BUILDERS[criterion.name](shared, group, name, rubric, values))
+            else:
+                scored.append(criterion.func(**{input_name: values[input_name] for input_name in criterion.inputs}))
+        results[name] = combine_results(scored, sum(c.weight_in(rubric) for c in criteria), rubric)
+    return results
+
+def calculate_profile_scores(transcript: Union[str, AnalyzedTranscript], duration_seconds: float,
+                             profiles: list = None) -> dict:
+    """score_profiles in the JSON shape: {profile: calculate_final_score-style dict}."""
+    return {name: result.to_dict() for name, result in score_profiles(transcript, duration_seconds, profiles).items()}
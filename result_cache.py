@@ -0,0 +1,161 @@
+# result_cache.py
+# Caches calculate_final_score results so resubmitted transcripts are not rescored.
+# Keys combine the exact transcript text, the duration and a fingerprint of the active rubric,
+# so changing any weight, keyword list or formula (or reloading the rubric file) invalidates
+# every earlier entry.
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from rubric_compiler import CompiledRubric, get_rubric
+from scorer_logic import calculate_final_score
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 3600.0
+PRUNE_INTERVAL_SECONDS = 60.0
+
+# --- Cache Keys ---
+
+def rubric_fingerprint(rubric: CompiledRubric = None) -> str:
+    """Fingerprint of every scoring setting of a compiled rubric (default: the active one)."""
+    return (rubric or get_rubric()).fingerprint
+
+def cache_key(transcript: str, duration_seconds: float, fingerprint: str) -> str:
+    """
+    Key for one scoring request. The transcript is hashed exactly as submitted: grammar
+    backends such as LanguageTool check the raw text, so case-only edits can change the score.
+    """
+    digest = hashlib.sha256()
+    digest.update(fingerprint.encode("ascii"))
+    digest.update(repr(float(duration_seconds)).encode("ascii"))
+    digest.update(transcript.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+# --- Cache ---
+
+class ResultCache:
+    """
+    Two-tier result cache: an in-process LRU bounded by `max_entries` and `ttl_seconds`, plus an
+    optional SQLite database at `sqlite_path` that several worker processes can share. The database
+    is held to the same limits: expired rows and the oldest rows beyond `max_entries` are deleted
+    when it is opened and then at most every PRUNE_INTERVAL_SECONDS as results are written.
+
+    Cached results are shared objects; callers must treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 sqlite_path: str = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._next_prune = 0.0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily so a configured cache can be created before forking pool workers
+        if self._db is None:
+            self._db = sqlite3.connect(self.sqlite_path, timeout=30.0, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, created REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_created ON results (created)")
+            self._prune_disk()
+        return self._db
+
+    def _prune_disk(self) -> None:
+        """Deletes expired rows, then the oldest rows beyond max_entries. Caller holds the lock (or is opening)."""
+        self._db.execute("DELETE FROM results WHERE created < ?", (time.time() - self.ttl_seconds,))
+        self._db.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._db.commit()
+        self._next_prune = time.monotonic() + PRUNE_INTERVAL_SECONDS
+
+    def get(self, key: str):
+        """Returns the cached result for `key`, or None. Expired entries count as misses."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, result = entry
+                if time.monotonic() - created <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return result
+                del self._entries[key]
+                self.stats["expirations"] += 1
+
+            if self.sqlite_path is not None:
+                row = self._connection().execute(
+                    "SELECT created, payload FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and time.time() - row[0] <= self.ttl_seconds:
+                    result = json.loads(row[1])
+                    self._store(key, result)
+                    self.stats["disk_hits"] += 1
+                    return result
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, result: dict) -> None:
+        with self._lock:
+            self._store(key, result)
+            if self.sqlite_path is not None:
+                db = self._connection()
+                db.execute("INSERT OR REPLACE INTO results (key, created, payload) VALUES (?, ?, ?)",
+                           (key, time.time(), json.dumps(result)))
+                db.commit()
+                if time.monotonic() >= self._next_prune:
+                    self._prune_disk()
+
+    def _store(self, key: str, result: dict) -> None:
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drops every in-process entry and, if configured, every on-disk entry."""
+        with self._lock:
+            self._entries.clear()
+            if self.sqlite_path is not None:
+                db = self._connection()
+                db.execute("DELETE FROM results")
+                db.commit()
+
+    def score(self, transcript: str, duration_seconds: float) -> dict:
+        """calculate_final_score, served from the cache when the same request was scored before."""
+        rubric = get_rubric()
+        key = cache_key(transcript, duration_seconds, rubric.fingerprint)
+        result = self.get(key)
+        if result is None:
+            result = calculate_final_score(transcript, duration_seconds, rubric=rubric)
+            self.put(key, result)
+        return result
+
+    def counters(self) -> dict:
+        """Hit/miss counters plus the current in-process size and hit ratio."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hits = self.stats["hits"] + self.stats["disk_hits"]
+            return {**self.stats, "size": len(self._entries),
+                    "hit_ratio": round(hits / lookups, 4) if lookups else 0.0}
+
+
+_process_caches = {}
+
+def get_process_cache(sqlite_path: str = None) -> ResultCache:
+    """Returns this process's cache for `sqlite_path` (None = memory only), creating it on first use."""
+    cache = _process_caches.get(sqlite_path)
+    if cache is None:
+        cache = _process_caches[sqlite_path] = ResultCache(sqlite_path=sqlite_path)
+    return cache
@@ -0,0 +1,302 @@
+# result_types.py
+# Compact scoring results. Each criterion result is a __slots__ object holding its numbers as
+# numbers; feedback text and the formatted `details` dict are rendered only when requested.
+# `to_dict()` produces the JSON shape the app, the cache and the HTTP service use.
+# Each result references the compiled rubric it was scored with, so text rendered later
+# matches the scores even after a rubric reload.
+
+from rubric_compiler import get_rubric
+
+# --- Criterion Results ---
+
+class CriterionResult:
+    """
+    Base for per-criterion results. Subclasses set CRITERION and implement `render_feedback()`
+    and `render_details()`. Read access by key (result["score"], result["feedback"], ...)
+    mirrors the dict form, so code written against dict results keeps working.
+    """
+    __slots__ = ("score", "rubric")
+    CRITERION = None
+    KEYS = ("criterion", "score", "max_score", "feedback", "details")
+
+    @property
+    def criterion(self) -> str:
+        return self.CRITERION
+
+    @property
+    def max_score(self) -> int:
+        return self.rubric.weights[self.CRITERION]
+
+    @property
+    def feedback(self) -> str:
+        return self.render_feedback()
+
+    @property
+    def details(self) -> dict:
+        return self.render_details()
+
+    def render_feedback(self) -> str:
+        raise NotImplementedError
+
+    def render_details(self) -> dict:
+        raise NotImplementedError
+
+    def _score_suffix(self, score: int = None) -> str:
+        return f"(Score: {self.score if score is None else score}/{self.max_score})"
+
+    def to_dict(self) -> dict:
+        return {
+            "criterion": self.CRITERION,
+            "score": self.score,
+            "max_score": self.max_score,
+            "feedback": self.render_feedback(),
+            "details": self.render_details(),
+        }
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.KEYS else default
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CriterionResult):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} score={self.score}/{self.max_score}>"
+
+
+class SpeechRateResult(CriterionResult):
+    __slots__ = ("wpm", "word_count", "duration_seconds", "is_estimated", "category")
+    CRITERION = "Speech Rate"
+
+    def __init__(self, score, wpm, word_count, duration_seconds, is_estimated, category, rubric=None):
+        self.score = score
+        self.rubric = rubric or get_rubric()
+        self.wpm = wpm
+        self.word_count = word_count
+        self.duration_seconds = duration_seconds
+        self.is_estimated = is_estimated
+        self.category = category
+
+    def render_feedback(self) -> str:
+        if self.word_count == 0:
+            return f"Cannot calculate WPM: Word count is 0. {self._score_suffix(0)}"
+        wpm = f"{self.wpm:.2f}"
+        category = self.category
+        if category == "N/A":
+            feedback = "Speech rate could not be calculated."
+        else:
+            # The message quotes the rubric score of the band, as the rubric defines it
+            suffix = self._score_suffix(self.rubric.speech_rate.score_of(category))
+            if category == "Fast":
+                feedback = f"Your speech rate of {wpm} WPM is too fast. {suffix}"
+            elif category == "Ideal":
+                feedback = f"Excellent! Your speech rate of {wpm} WPM is in the ideal range. {suffix}"
+            elif category == "Slow":
+                feedback = f"Your speech rate of {wpm} WPM is a bit slow. {suffix}"
+            else:
+                feedback = f"Your speech rate of {wpm} WPM is too slow. {suffix}"
+        if self.is_estimated:
+            feedback += f" **(NOTE: Duration EST. from {self.rubric.standard_speaking_rate_wpm} WPM.)**"
+        return feedback
+
+    def render_details(self) -> dict:
+        return {"wpm": f"{self.wpm:.2f}", "word_count": self.word_count,
+                "duration_seconds": self.duration_seconds, "is_estimated": self.is_estimated}
+
+
+class SalutationResult(CriterionResult):
+    __slots__ = ("category",)
+    CRITERION = "Salutation Level"
+
+    def __init__(self, score, category, rubric=None):
+        self.score = score
+        self.rubric = rubric or get_rubric()
+        self.category = category
+
+    def render_feedback(self) -> str:
+        if self.category == "No Salutation":
+            return f"No clear salutation found at the beginning of the transcript. {self._score_suffix()}"
+        return f"Salutation found: '{self.category}' {self._score_suffix()}"
+
+    def render_details(self) -> dict:
+        return {"category": self.category}
+
+
+class KeywordPresenceResult(CriterionResult):
+    __slots__ = ("found_keywords", "extra_details")
+    CRITERION = "Key word Presence"
+
+    def __init__(self, score, found_keywords, extra_details=None, rubric=None):
+        self.score = score
+        self.rubric = rubric or get_rubric()
+        self.found_keywords = tuple(found_keywords)
+        self.extra_details = extra_details or None
+
+    def render_feedback(self) -> str:
+        return (f"Found {len(self.found_keywords)}/{len(self.rubric.keyword_categories)} mandatory keywords. "
+                f"{self._score_suffix()}")
+
+    def render_details(self) -> dict:
+        return {"found_keywords": list(self.found_keywords), **(self.extra_details or {})}
+
+
+class FlowResult(CriterionResult):
+    __slots__ = ("has_start", "has_end")
+    CRITERION = "Flow"
+
+    def __init__(self, score, has_start, has_end, rubric=None):
+        self.score = score
+        self.rubric = rubric or get_rubric()
+        self.has_start = has_start
+        self.has_end = has_end
+
+    def render_feedback(self) -> str:
+        if self.has_start and self.has_end:
+            feedback = "Flow appears complete (Salutation and Closing detected)."
+        elif self.has_start:
+            feedback = "Starting salutation is present, but a clear closing statement is missing."
+        elif self.has_end:
+            feedback = "Closing statement is present, but a clear starting salutation is missing."
+        else:
+            feedback = "Both starting salutation and closing statement are missing."
+        return f"{feedback} {self._score_suffix()}"
+
+    def render_details(self) -> dict:
+        return {"has_start": self.has_start, "has_end": self.has_end}
+
+
+class VocabularyRichnessResult(CriterionResult):
+    __slots__ = ("ttr", "distinct_words", "total_words", "metric", "value")
+    CRITERION = "Vocabulary Richness"
+
+    def __init__(self, score, ttr, distinct_words, total_words, rubric=None, metric="ttr", value=None):
+        self.score = score
+        self.rubric = rubric or get_rubric()
+        self.ttr = ttr
+        self.distinct_words = distinct_words
+        self.total_words = total_words
+        self.metric = metric # The VOCABULARY_METRIC that was scored
+        self.value = ttr if value is None else value
+
+    def _measure_label(self) -> str:
+        if self.metric == "mattr":
+            return f"Vocabulary MATTR ({self.rubric.mattr_window}-word window): {self.value:.4f}"
+        if self.metric == "mtld":
+            return f"Vocabulary MTLD: {self.value:.2f} words"
+        return f"Vocabulary TTR: {self.ttr:.4f}"
+
+    def render_feedback(self) -> str:
+        band, _ = self.rubric.vocabulary_bands.lookup(self.value)
+        if band is None:
+            return f"{self._measure_label()} is outside defined ranges."
+        return f"{self._measure_label()} is in the range {band}. {self._score_suffix()}"
+
+    def render_details(self) -> dict:
+        details = {"ttr": f"{self.ttr:.4f}", "distinct_words": self.distinct_words, "total_words": self.total_words}
+        if self.metric != "ttr":
+            details["metric"] = self.metric
+            details[self.metric] = f"{self.value:.4f}"
+        return details
+
+
+class GrammarErrorsResult(CriterionResult):
+    __slots__ = ("errors_per_100_words", "error_count", "backend", "top_issues")
+    CRITERION = "Grammar Errors"
+
+    def __init__(self, score, errors_per_100_words, error_count, backend, top_issues=(), rubric=None):
+        self.score = score
+        self.rubric = rubric or get_rubric()
+        self.errors_per_100_words = errors_per_100_words
+        self.error_count = error_count
+        self.backend = backend
+        self.top_issues = tuple(top_issues) # ((rule, count), ...), most common first
+
+    def render_feedback(self) -> str:
+        if self.error_count == 0:
+            return f"No grammar errors detected. {self._score_suffix()}"
+        top = ", ".join(f"{rule} ({count})" for rule, count in self.top_issues)
+        return (f"Grammar error rate: {self.errors_per_100_words:.2f} errors/100 words. {self._score_suffix()}"
+                f" Top issues: {top}.")
+
+    def render_details(self) -> dict:
+        return {"errors_per_100_words": f"{self.errors_per_100_words:.2f}", "error_count": self.error_count,
+                "backend": self.backend}
+
+
+class FillerWordRateResult(CriterionResult):
+    __slots__ = ("filler_rate_percent", "filler_count", "top_fillers")
+    CRITERION = "Filler Word Rate"
+
+    def __init__(self, score, filler_rate_percent, filler_count, top_fillers=(), rubric=None):
+        self.score = score
+        self.rubric = rubric or get_rubric()
+        self.filler_rate_percent = filler_rate_percent
+        self.filler_count = filler_count
+        self.top_fillers = tuple(top_fillers) # ((filler, count), ...), most common first
+
+    def render_feedback(self) -> str:
+        feedback = (f"Filler word rate: {self.filler_rate_percent:.2f}%. Found {self.filler_count} filler words. "
+                    f"{self._score_suffix()}")
+        if self.filler_count > 0:
+            feedback += f" Top fillers: {', '.join(f'{k} ({v})' for k, v in self.top_fillers)}."
+        return feedback
+
+    def render_details(self) -> dict:
+        return {"filler_rate_percent": f"{self.filler_rate_percent:.2f}", "filler_count": self.filler_count}
+
+
+class SentimentResult(CriterionResult):
+    __slots__ = ("compound", "category", "positive_tokens", "negative_tokens")
+    CRITERION = "Sentiment/Positivity"
+
+    def __init__(self, score, compound, category, positive_tokens, negative_tokens, rubric=None):
+        self.score = score
+        self.rubric = rubric or get_rubric()
+        self.compound = compound
+        self.category = category
+        self.positive_tokens = positive_tokens
+        self.negative_tokens = negative_tokens
+
+    def render_feedback(self) -> str:
+        return f"Overall tone is {self.category.lower()} (compound {self.compound:.4f}). {self._score_suffix()}"
+
+    def render_details(self) -> dict:
+        return {"compound": f"{self.compound:.4f}", "category": self.category,
+                "positive_tokens": self.positive_tokens, "negative_tokens": self.negative_tokens}
+
+# --- Overall Result ---
+
+def _criterion_dict(result) -> dict:
+    # Registered criteria may still return plain dicts
+    return result.to_dict() if isinstance(result, CriterionResult) else result
+
+class ScoreResult:
+    """The overall score, out of the rubric's TOTAL_WEIGHT, and the per-criterion results of one transcript."""
+    __slots__ = ("overall_score", "per_criterion_scores", "max_overall_score")
+    KEYS = ("overall_score", "max_overall_score", "per_criterion_scores")
+
+    def __init__(self, overall_score: int, per_criterion_scores: tuple, max_overall_score: int):
+        self.overall_score = overall_score
+        self.per_criterion_scores = tuple(per_criterion_scores)
+        self.max_overall_score = max_overall_score
+
+    def to_dict(self) -> dict:
+        return {
+            "overall_score": self.overall_score,
+            "max_overall_score": self.max_overall_score,
+            "per_criterion_scores": [_criterion_dict(result) for result in self.per_criterion_scores],
+        }
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self) -> str:
+        return f"<ScoreResult {self.overall_score}/{self.max_overall_score}>"
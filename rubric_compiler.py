@@ -0,0 +1,555 @@
+# rubric_compiler.py
+# Compiles the rubric settings (rubric_config, optionally overridden by a JSON/TOML file) into
+# validated, immutable structures once per load: range rubrics become sorted breakpoint tables
+# searched with bisect, and keyword and phrase lists become precompiled matchers.
+#
+# rubric_config.RUBRIC_PROFILES names variants of the rubric; each is compiled on its own and
+# read with get_rubric(profile). Without a profile name, get_rubric() returns DEFAULT_PROFILE.
+#
+# Scoring reads the active rubric through get_rubric(). When a rubric file is configured
+# (set_rubric_file() or the SCORER_RUBRIC_FILE environment variable, which worker processes
+# inherit), every process notices edits to it within RELOAD_CHECK_SECONDS and recompiles.
+
+import bisect
+import os
+import re
+import threading
+import time
+import types
+from types import MappingProxyType
+import rubric_config
+from matchers import get_filler_matcher, get_keyword_engine
+from vocabulary_metrics import VOCABULARY_METRICS
+
+RUBRIC_FILE_ENV = "SCORER_RUBRIC_FILE"
+RELOAD_CHECK_SECONDS = 1.0
+
+# Settings a rubric file may override. Formulas are code, so they always come from rubric_config.
+DATA_SETTINGS = (
+    "TOTAL_WEIGHT", "WEIGHTS", "SALUTATION_RUBRIC", "SALUTATION_KEYWORDS", "KEYWORD_LIST", "KEYWORD_RULES",
+    "KEYWORD_SCORE_PER_ITEM", "FLOW_KEYWORDS", "SPEECH_RATE_RUBRIC", "STANDARD_SPEAKING_RATE_WPM",
+    "TTR_RUBRIC", "FILLER_WORDS", "SENTIMENT_RUBRIC", "GRAMMAR_BACKEND",
+    "VOCABULARY_METRIC", "MATTR_WINDOW", "MTLD_THRESHOLD", "MTLD_RUBRIC",
+)
+CODE_SETTINGS = ("GRAMMAR_SCORE_FORMULA", "FILLER_SCORE_FORMULA", "FILLER_RATE_MAX_PENALTY")
+# Named rubric variants, in rubric_config and in rubric files; not a scoring setting itself
+PROFILES_SETTING = "RUBRIC_PROFILES"
+DEFAULT_PROFILE = "default"
+
+# Criteria whose built-in scorers read their weight from the rubric
+BUILTIN_CRITERIA = (
+    "Salutation Level", "Key word Presence", "Flow", "Speech Rate", "Grammar Errors",
+    "Vocabulary Richness", "Filler Word Rate", "Sentiment/Positivity",
+)
+NO_SALUTATION = "No Salutation"
+
+
+class RubricError(ValueError):
+    """Raised when rubric settings fail validation; `problems` lists every issue found."""
+
+    def __init__(self, problems: list, source: str = "rubric"):
+        self.problems = problems
+        super().__init__(f"Invalid {source}:\n  - " + "\n  - ".join(problems))
+
+# --- Fingerprints ---
+
+def fingerprint_value(value) -> str:
+    """A stable text form of a rubric value; formulas are identified by their bytecode and constants."""
+    if isinstance(value, types.FunctionType):
+        code = value.__code__
+        return f"<function {code.co_code.hex()} {code.co_consts!r} {code.co_names!r}>"
+    return repr(value)
+
+def fingerprint_settings(settings: dict) -> str:
+    import hashlib # Deferred: hashlib loads OpenSSL, which only rubric compilation needs
+    parts = [f"{name}={fingerprint_value(settings[name])}" for name in sorted(settings)]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+# --- Breakpoint Tables ---
+
+class BucketTable:
+    """
+    Contiguous score bands over a numeric range. `bounds` holds the n+1 sorted breakpoints of n bands.
+    With closed="left" a value on a breakpoint belongs to the band above it (the top bound is
+    inclusive); with closed="right" it belongs to the band below it (the bottom bound is inclusive).
+    """
+    __slots__ = ("bounds", "labels", "scores", "closed", "_by_label")
+
+    def __init__(self, bounds: tuple, labels: tuple, scores: tuple, closed: str):
+        self.bounds = bounds
+        self.labels = labels
+        self.scores = scores
+        self.closed = closed
+        self._by_label = MappingProxyType(dict(zip(labels, scores)))
+
+    def index(self, value: float) -> int:
+        """Band index holding `value`, or -1 outside the table."""
+        bounds = self.bounds
+        if not bounds[0] <= value <= bounds[-1]:
+            return -1
+        if self.closed == "left":
+            return min(bisect.bisect_right(bounds, value) - 1, len(self.scores) - 1)
+        return max(bisect.bisect_left(bounds, value) - 1, 0)
+
+    def lookup(self, value: float) -> tuple:
+        """Returns (label, score) of the band holding `value`, or (None, 0) outside the table."""
+        index = self.index(value)
+        if index < 0:
+            return None, 0
+        return self.labels[index], self.scores[index]
+
+    def score_of(self, label: str) -> int:
+        return self._by_label[label]
+
+    def __repr__(self) -> str:
+        return f"<BucketTable {list(zip(self.labels, self.scores))} closed={self.closed}>"
+
+
+def _number(value, name: str, problems: list, allow_none: bool = False):
+    if value is None and allow_none:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        problems.append(f"{name}: expected a number, got {value!r}")
+        return None
+    return float(value)
+
+def _table(name: str, value, problems: list) -> dict:
+    """`value` if it is a dict, else {} with the problem reported."""
+    if isinstance(value, dict):
+        return value
+    problems.append(f"{name}: expected a table (dict), got {type(value).__name__}")
+    return {}
+
+def _compile_bands(name: str, bands: list, closed: str, max_score: float, problems: list) -> BucketTable:
+    """
+    Builds a BucketTable from (label, low, high, score) bands, reporting bands that are empty,
+    overlap or leave gaps between them, and scores outside [0, max_score].
+    """
+    valid = []
+    for label, low, high, score in bands:
+        if low is None or high is None:
+            continue
+        if low >= high:
+            problems.append(f"{name}: band '{label}' has an empty range ({low}, {high})")
+            continue
+        if not isinstance(score, (int, float)) or isinstance(score, bool):
+            problems.append(f"{name}: band '{label}' score {score!r} is not a number")
+        elif max_score is not None and not 0 <= score <= max_score:
+            problems.append(f"{name}: band '{label}' score {score!r} is outside 0-{max_score}")
+        valid.append((low, high, label, score))
+    if not valid:
+        problems.append(f"{name}: no valid bands")
+        return BucketTable((0.0, 0.0), ("",), (0,), closed)
+
+    valid.sort(key=lambda band: (band[0], band[1]))
+    for (low, high, label, _), (next_low, _, next_label, _) in zip(valid, valid[1:]):
+        if next_low > high:
+            problems.append(f"{name}: gap between '{label}' (ends {high}) and '{next_label}' (starts {next_low})")
+        elif next_low < high:
+            problems.append(f"{name}: '{label}' (ends {high}) overlaps '{next_label}' (starts {next_low})")
+    bounds = tuple([band[0] for band in valid] + [valid[-1][1]])
+    return BucketTable(bounds, tuple(band[2] for band in valid), tuple(band[3] for band in valid), closed)
+
+def _range_bands(name: str, rubric, problems: list) -> list:
+    """
+    Reads a range rubric in any supported form: {label: {"range": (low, high), "score": s}},
+    {(low, high): s}, or a list of {"range": [low, high], "score": s[, "label": str]}.
+    A null high bound means no upper limit. Tuple-keyed bands are labelled "low-high".
+    """
+    if isinstance(rubric, dict):
+        entries = [(key, value) for key, value in rubric.items()]
+    elif isinstance(rubric, list):
+        entries = [(entry.get("label") if isinstance(entry, dict) else None, entry) for entry in rubric]
+    else:
+        problems.append(f"{name}: expected a dict or list, got {type(rubric).__name__}")
+        return []
+
+    bands = []
+    for key, value in entries:
+        if isinstance(key, tuple):
+            value_range, score = key, value
+        elif isinstance(value, dict) and "range" in value:
+            value_range, score = value["range"], value.get("score")
+        else:
+            problems.append(f"{name}: cannot read band {key!r}: {value!r}")
+            continue
+        if not isinstance(value_range, (list, tuple)) or len(value_range) != 2:
+            problems.append(f"{name}: band {key!r} range must be (low, high), got {value_range!r}")
+            continue
+        low = _number(value_range[0], f"{name} {key!r} low", problems)
+        high = _number(value_range[1], f"{name} {key!r} high", problems, allow_none=True)
+        if value_range[1] is None:
+            high = float("inf")
+        label = key if isinstance(key, str) else f"{value_range[0]}-{value_range[1]}"
+        bands.append((label, low, high, score))
+    return bands
+
+def _threshold_bands(name: str, rubric, problems: list) -> list:
+    """Reads a {label: {"min": m, "score": s}} rubric as bands from each min up to the next one."""
+    if not isinstance(rubric, dict):
+        problems.append(f"{name}: expected a dict of {{label: {{'min', 'score'}}}}")
+        return []
+    entries = []
+    for label, data in rubric.items():
+        if not isinstance(data, dict) or "min" not in data:
+            problems.append(f"{name}: band '{label}' needs a 'min'")
+            continue
+        minimum = _number(data["min"], f"{name} '{label}' min", problems)
+        if minimum is not None:
+            entries.append((minimum, label, data.get("score")))
+    entries.sort(key=lambda entry: entry[0])
+    for (minimum, label, _), (next_minimum, next_label, _) in zip(entries, entries[1:]):
+        if minimum == next_minimum:
+            problems.append(f"{name}: '{label}' and '{next_label}' share the min {minimum}")
+    # The lowest band also takes everything below its min
+    return [(label, float("-inf") if index == 0 else minimum,
+             entries[index + 1][0] if index + 1 < len(entries) else float("inf"), score)
+            for index, (minimum, label, score) in enumerate(entries)]
+
+# --- Compiled Rubric ---
+
+class CompiledRubric:
+    """Immutable, validated rubric. Build it with compile_rubric(); read the active one with get_rubric()."""
+    __slots__ = (
+        "source", "settings", "fingerprint", "total_weight", "weights",
+        "salutation_scores", "salutation_phrases", "flow_start", "flow_end",
+        "keyword_categories", "keyword_score_per_item", "keyword_engine",
+        "speech_rate", "standard_speaking_rate_wpm", "ttr",
+        "vocabulary_metric", "mattr_window", "mtld_threshold", "mtld",
+        "filler_words", "filler_matcher", "filler_score_formula", "filler_rate_max_penalty",
+        "grammar_score_formula", "grammar_backend", "sentiment",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledRubric is immutable; compile a new one instead")
+
+    @property
+    def vocabulary_bands(self) -> "BucketTable":
+        """The bands VOCABULARY_METRIC is scored with: MTLD_RUBRIC for "mtld", TTR_RUBRIC for the ratios."""
+        return self.mtld if self.vocabulary_metric == "mtld" else self.ttr
+
+    def __repr__(self) -> str:
+        return f"<CompiledRubric from {self.source} {self.fingerprint[:12]}>"
+
+
+def _phrases(name: str, phrases, problems: list) -> tuple:
+    if not isinstance(phrases, (list, tuple)) or not all(isinstance(p, str) and p.strip() for p in phrases):
+        problems.append(f"{name}: expected a list of non-empty strings")
+        return ()
+    return tuple(phrase.lower() for phrase in phrases)
+
+def config_settings(config: types.ModuleType = rubric_config) -> dict:
+    """The scoring settings of a rubric config module (its upper-case names, minus profiles and sample data)."""
+    return {name: getattr(config, name) for name in vars(config)
+            if name.isupper() and not name.startswith("SAMPLE_") and name != PROFILES_SETTING}
+
+def compile_rubric(overrides: dict = None, source: str = "rubric_config") -> CompiledRubric:
+    """
+    Validates and compiles rubric_config's settings, with `overrides` (e.g. from a rubric file)
+    replacing individual settings. Raises RubricError listing every problem found.
+    """
+    settings = config_settings()
+    problems = []
+    for name, value in (overrides or {}).items():
+        if name in CODE_SETTINGS:
+            problems.append(f"{name}: formulas can only be changed in rubric_config.py")
+        elif name not in DATA_SETTINGS:
+            problems.append(f"{name}: unknown setting")
+        else:
+            settings[name] = value
+
+    # Weights
+    total_weight = _number(settings["TOTAL_WEIGHT"], "TOTAL_WEIGHT", problems) or 0.0
+    weights = settings["WEIGHTS"]
+    if not isinstance(weights, dict):
+        problems.append("WEIGHTS: expected a dict of criterion -> weight")
+        weights = {}
+    for criterion, weight in weights.items():
+        if _number(weight, f"WEIGHTS '{criterion}'", problems) is not None and weight < 0:
+            problems.append(f"WEIGHTS '{criterion}': negative weight {weight}")
+    for criterion in BUILTIN_CRITERIA:
+        if criterion not in weights:
+            problems.append(f"WEIGHTS: missing weight for '{criterion}'")
+    weight_sum = sum(w for w in weights.values() if isinstance(w, (int, float)))
+    if abs(weight_sum - total_weight) > 1e-9:
+        problems.append(f"WEIGHTS sum to {weight_sum}, not TOTAL_WEIGHT ({settings['TOTAL_WEIGHT']})")
+    def max_score(criterion):
+        # None when the weight itself is invalid, which is already reported
+        weight = weights.get(criterion)
+        return weight if isinstance(weight, (int, float)) and not isinstance(weight, bool) else None
+
+    # Salutation and flow phrases, checked from the highest-scoring category down
+    salutation_rubric = _table("SALUTATION_RUBRIC", settings["SALUTATION_RUBRIC"], problems)
+    salutation_keywords = _table("SALUTATION_KEYWORDS", settings["SALUTATION_KEYWORDS"], problems)
+    if isinstance(settings["SALUTATION_RUBRIC"], dict) and NO_SALUTATION not in salutation_rubric:
+        problems.append(f"SALUTATION_RUBRIC: missing the '{NO_SALUTATION}' category")
+    for category, score in salutation_rubric.items():
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            problems.append(f"SALUTATION_RUBRIC '{category}': score {score!r} is not a number")
+        elif max_score("Salutation Level") is not None and not 0 <= score <= max_score("Salutation Level"):
+            problems.append(f"SALUTATION_RUBRIC '{category}': score {score!r} is outside 0-{max_score('Salutation Level')}")
+    salutation_phrases = []
+    for category, phrases in salutation_keywords.items():
+        if category not in salutation_rubric:
+            problems.append(f"SALUTATION_KEYWORDS: category '{category}' has no score in SALUTATION_RUBRIC")
+            continue
+        salutation_phrases.append((category, _phrases(f"SALUTATION_KEYWORDS '{category}'", phrases, problems)))
+    # Invalid scores are already reported; they only need to sort without failing
+    salutation_phrases.sort(key=lambda entry: -salutation_rubric[entry[0]]
+                            if isinstance(salutation_rubric[entry[0]], (int, float)) else 0)
+
+    flow_keywords = _table("FLOW_KEYWORDS", settings["FLOW_KEYWORDS"], problems)
+    flow_start = _phrases("FLOW_KEYWORDS 'START'", flow_keywords.get("START"), problems)
+    flow_end = _phrases("FLOW_KEYWORDS 'END'", flow_keywords.get("END"), problems)
+
+    # Keywords
+    keyword_list = settings["KEYWORD_LIST"]
+    if not isinstance(keyword_list, (list, tuple)) or not all(isinstance(item, str) for item in keyword_list):
+        problems.append(f"KEYWORD_LIST: expected a list of category names, got {keyword_list!r}")
+        keyword_list = []
+    keyword_rules = _table("KEYWORD_RULES", settings["KEYWORD_RULES"], problems)
+    if set(keyword_list) != set(keyword_rules):
+        problems.append(f"KEYWORD_RULES must define exactly the KEYWORD_LIST items; "
+                        f"missing {sorted(set(keyword_list) - set(keyword_rules))}, "
+                        f"extra {sorted(map(str, set(keyword_rules) - set(keyword_list)))}")
+    for category, pattern in keyword_rules.items():
+        if not isinstance(pattern, str):
+            problems.append(f"KEYWORD_RULES '{category}': expected a regex string, got {pattern!r}")
+            continue
+        try:
+            re.compile(pattern)
+        except re.error as exc:
+            problems.append(f"KEYWORD_RULES '{category}': invalid pattern: {exc}")
+    per_item = settings["KEYWORD_SCORE_PER_ITEM"]
+    if _number(per_item, "KEYWORD_SCORE_PER_ITEM", problems) is not None and max_score("Key word Presence") is not None \
+            and per_item * len(keyword_list) > max_score("Key word Presence"):
+        problems.append(f"KEYWORD_SCORE_PER_ITEM x {len(keyword_list)} keywords exceeds the "
+                        f"'Key word Presence' weight ({max_score('Key word Presence')})")
+
+    # Range rubrics: "<= 80 WPM" is too slow and "> 140" too fast, so speech rate bands are
+    # closed on the right; TTR bands are closed on the left (0.9 is in the top band)
+    speech_rate = _compile_bands("SPEECH_RATE_RUBRIC", _range_bands("SPEECH_RATE_RUBRIC", settings["SPEECH_RATE_RUBRIC"], problems),
+                                 "right", max_score("Speech Rate"), problems)
+    ttr = _compile_bands("TTR_RUBRIC", _range_bands("TTR_RUBRIC", settings["TTR_RUBRIC"], problems),
+                         "left", max_score("Vocabulary Richness"), problems)
+    mtld = _compile_bands("MTLD_RUBRIC", _range_bands("MTLD_RUBRIC", settings["MTLD_RUBRIC"], problems),
+                          "left", max_score("Vocabulary Richness"), problems)
+    sentiment = _compile_bands("SENTIMENT_RUBRIC", _threshold_bands("SENTIMENT_RUBRIC", settings["SENTIMENT_RUBRIC"], problems),
+                               "left", max_score("Sentiment/Positivity"), problems)
+
+    if settings["VOCABULARY_METRIC"] not in VOCABULARY_METRICS:
+        problems.append(f"VOCABULARY_METRIC: expected one of {list(VOCABULARY_METRICS)}, got {settings['VOCABULARY_METRIC']!r}")
+    mattr_window = settings["MATTR_WINDOW"]
+    if not isinstance(mattr_window, int) or isinstance(mattr_window, bool) or mattr_window < 1:
+        problems.append(f"MATTR_WINDOW: expected a positive whole number of words, got {mattr_window!r}")
+    mtld_threshold = _number(settings["MTLD_THRESHOLD"], "MTLD_THRESHOLD", problems)
+    if mtld_threshold is not None and not 0 < mtld_threshold < 1:
+        problems.append(f"MTLD_THRESHOLD must be between 0 and 1, got {mtld_threshold}")
+
+    standard_rate = _number(settings["STANDARD_SPEAKING_RATE_WPM"], "STANDARD_SPEAKING_RATE_WPM", problems)
+    if standard_rate is not None and standard_rate <= 0:
+        problems.append("STANDARD_SPEAKING_RATE_WPM must be positive")
+
+    filler_words = _phrases("FILLER_WORDS", settings["FILLER_WORDS"], problems)
+    for name in ("FILLER_SCORE_FORMULA", "GRAMMAR_SCORE_FORMULA"):
+        if not callable(settings[name]):
+            problems.append(f"{name}: expected a function")
+    if not isinstance(settings["GRAMMAR_BACKEND"], str):
+        problems.append("GRAMMAR_BACKEND: expected a backend name")
+
+    if problems:
+        raise RubricError(problems, source)
+
+    return CompiledRubric(
+        source=source,
+        settings=MappingProxyType(settings),
+        fingerprint=fingerprint_settings(settings),
+        total_weight=settings["TOTAL_WEIGHT"],
+        weights=MappingProxyType(dict(weights)),
+        salutation_scores=MappingProxyType(dict(salutation_rubric)),
+        salutation_phrases=tuple(salutation_phrases),
+        flow_start=flow_start,
+        flow_end=flow_end,
+        keyword_categories=tuple(keyword_list),
+        keyword_score_per_item=per_item,
+        keyword_engine=get_keyword_engine(dict(keyword_rules)),
+        speech_rate=speech_rate,
+        standard_speaking_rate_wpm=settings["STANDARD_SPEAKING_RATE_WPM"],
+        ttr=ttr,
+        vocabulary_metric=settings["VOCABULARY_METRIC"],
+        mattr_window=mattr_window,
+        mtld_threshold=settings["MTLD_THRESHOLD"],
+        mtld=mtld,
+        filler_words=filler_words,
+        filler_matcher=get_filler_matcher(list(filler_words)),
+        filler_score_formula=settings["FILLER_SCORE_FORMULA"],
+        filler_rate_max_penalty=settings["FILLER_RATE_MAX_PENALTY"],
+        grammar_score_formula=settings["GRAMMAR_SCORE_FORMULA"],
+        grammar_backend=settings["GRAMMAR_BACKEND"],
+        sentiment=sentiment,
+    )
+
+def compile_profiles(overrides: dict = None, source: str = "rubric_config") -> dict:
+    """
+    Compiles every rubric profile: rubric_config.RUBRIC_PROFILES plus the RUBRIC_PROFILES of
+    `overrides`, whose entries replace same-named ones. Each profile's settings replace settings of
+    the base rubric (rubric_config with the rest of `overrides`). Returns {name: CompiledRubric},
+    DEFAULT_PROFILE first. Raises RubricError listing the problems of every profile.
+    """
+    if overrides is not None and not isinstance(overrides, dict):
+        raise RubricError([f"expected a table of setting name -> value, got {type(overrides).__name__}"], source)
+    overrides = dict(overrides or {})
+    profiles = dict(getattr(rubric_config, PROFILES_SETTING, {}))
+    extra_profiles = overrides.pop(PROFILES_SETTING, {})
+    if not isinstance(extra_profiles, dict):
+        raise RubricError([f"{PROFILES_SETTING}: expected a table of profile name -> settings"], source)
+    profiles.update(extra_profiles)
+
+    compiled, problems = {}, []
+    names = [DEFAULT_PROFILE] + [name for name in profiles if name != DEFAULT_PROFILE]
+    for name in names:
+        settings = profiles.get(name) or {}
+        if not isinstance(settings, dict):
+            problems.append(f"profile '{name}': expected a table of settings")
+            continue
+        try:
+            compiled[name] = compile_rubric({**overrides, **settings},
+                                            source=source if name == DEFAULT_PROFILE else f"{source} [{name}]")
+        except RubricError as exc:
+            problems.extend(f"profile '{name}': {problem}" for problem in exc.problems)
+    if problems:
+        raise RubricError(problems, source)
+    return compiled
+
+# --- Rubric Files ---
+
+def load_rubric_file(path: str) -> dict:
+    """Reads rubric overrides from a .json or .toml file, keyed by rubric_config setting names."""
+    import json
+    if path.endswith(".toml"):
+        try:
+            import tomllib # Python 3.11+
+        except ImportError:
+            raise RubricError(["TOML rubric files need Python 3.11+ (tomllib); use JSON instead"], path) from None
+        with open(path, "rb") as source:
+            return tomllib.load(source)
+    with open(path, encoding="utf-8") as source:
+        return json.load(source)
+
+def compile_profiles_file(path: str) -> dict:
+    """compile_profiles() with the overrides and profiles of a rubric file."""
+    try:
+        overrides = load_rubric_file(path)
+    except (OSError, ValueError) as exc:
+        if isinstance(exc, RubricError):
+            raise
+        raise RubricError([f"cannot read rubric file: {exc}"], path) from exc
+    return compile_profiles(overrides, source=path)
+
+def compile_rubric_file(path: str) -> CompiledRubric:
+    return compile_profiles_file(path)[DEFAULT_PROFILE]
+
+# --- Active Rubric ---
+
+class _ActiveRubric:
+    """The rubric profiles this process scores with, recompiled when their file changes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.profiles = None
+        self.path = None
+        self.file_state = None # State of the file the active profiles were compiled from
+        self.failed_state = None # State of a file version that failed to compile
+        self.next_check = 0.0
+        self.last_error = None
+
+    @staticmethod
+    def _file_state(path: str) -> tuple:
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def load(self, path: str) -> dict:
+        """
+        Compiles `path` (None = rubric_config only) and makes it the active, watched rubric. If it
+        does not compile, the error is raised and the previous rubric and watched path are kept.
+        """
+        # The state is read before the file, so an edit made while compiling is noticed next check
+        state = self._file_state(path) if path else None
+        profiles = compile_profiles_file(path) if path else compile_profiles()
+        with self.lock:
+            self.path = path
+            self.file_state = state
+            self.failed_state = None
+            self.profiles = profiles
+            self.last_error = None
+            self.next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+        return profiles
+
+    def get(self) -> dict:
+        profiles = self.profiles
+        if profiles is None:
+            return self.load(os.environ.get(RUBRIC_FILE_ENV) or None)
+        if self.path is None or time.monotonic() < self.next_check:
+            return profiles
+        with self.lock:
+            self.next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+            state = self._file_state(self.path)
+            # A version that already failed is not recompiled (or warned about) again
+            if state == self.file_state or state == self.failed_state:
+                return self.profiles
+        try:
+            return self.load(self.path)
+        except Exception as exc:
+            # Keep scoring with the last good rubric until the file is fixed
+            import warnings
+            if not isinstance(exc, RubricError):
+                exc = RubricError([f"cannot compile rubric file: {exc!r}"], self.path)
+            with self.lock:
+                self.failed_state = state
+                self.last_error = exc
+            warnings.warn(f"Keeping the previous rubric: {exc}", RuntimeWarning)
+            return self.profiles
+
+
+_active = _ActiveRubric()
+
+def get_rubric(profile: str = None) -> CompiledRubric:
+    """The active compiled rubric (or named profile), reloaded when its rubric file has changed."""
+    profiles = _active.get()
+    try:
+        return profiles[profile or DEFAULT_PROFILE]
+    except KeyError:
+        raise KeyError(f"Unknown rubric profile {profile!r}. Known: {list(profiles)}") from None
+
+def get_profiles(names: list = None) -> dict:
+    """{name: CompiledRubric} for the named profiles (default: all), from one consistent load."""
+    profiles = _active.get()
+    if names is None:
+        return dict(profiles)
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        raise KeyError(f"Unknown rubric profiles: {unknown}. Known: {list(profiles)}")
+    return {name: profiles[name] for name in names}
+
+def set_rubric_file(path: str = None) -> CompiledRubric:
+    """
+    Scores with the rubric in `path` from now on (None = rubric_config only), watching it for edits.
+    Raises RubricError if it is invalid. Also exported as SCORER_RUBRIC_FILE for worker processes.
+    """
+    profiles = _active.load(path)
+    if path:
+        os.environ[RUBRIC_FILE_ENV] = path
+    else:
+        os.environ.pop(RUBRIC_FILE_ENV, None)
+    return profiles[DEFAULT_PROFILE]
+
+def rubric_reload_error():
+    """The RubricError from the last failed reload, or None if the active rubric is current."""
+    return _active.last_error
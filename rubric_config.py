@@ -1,6 +1,9 @@
 # rubric_config.py
 # The central source of truth for all scoring weights, keywords, and thresholds.
 
+# These settings are validated and compiled by rubric_compiler; a JSON/TOML rubric file can
+# override any of them except the formulas (see rubric_compiler.set_rubric_file).
+
 # --- 🎯 Overall Weights (Must sum to 100) ---
 TOTAL_WEIGHT = 100
 WEIGHTS = {
@@ -11,7 +14,7 @@ WEIGHTS = {
     "Grammar Errors": 10,
     "Vocabulary Richness": 10,
     "Filler Word Rate": 15,
-    "Sentiment/Positivity": 15, # Placeholder for NLP-based score
+    "Sentiment/Positivity": 15, # Scored from the bundled valence lexicon (sentiment_lexicon.py)
 }
 
 # --- 💬 Content & Structure Rules ---
@@ -41,6 +44,17 @@ KEYWORD_LIST = [
 ]
 KEYWORD_SCORE_PER_ITEM = 5
 
+# Detection rules for each keyword item: a regex matched against the lowercased transcript.
+# Compiled once into a single combined pattern by matchers.KeywordRuleEngine.
+KEYWORD_RULES = {
+    "name": r'myself|i am',
+    "age": r'\d+ years old|i am \d+',
+    "school/class": r'school|class|studying in',
+    "family": r'family|father|mother|parents|siblings',
+    "hobbies/interest": r'enjoy|like to do|hobbies|interest|favorite subject',
+    "unique point/fun fact": r'fun fact|special thing|one thing people don\'t know',
+}
+
 # Flow (Max Score: 5) - Simple checks for proper start and end markers.
 FLOW_KEYWORDS = {
     "START": ["hello", "hi", "good morning", "good afternoon", "greetings"],
@@ -50,10 +64,11 @@ FLOW_KEYWORDS = {
 # --- 🗣️ Speech Metrics Rules ---
 
 # Speech Rate (Words Per Minute, Max Score: 10)
+# Ranges must be contiguous (see rubric_compiler). A rate on a boundary belongs to the lower band.
 SPEECH_RATE_RUBRIC = {
-    "Ideal": {"range": (111, 140), "score": 10},
+    "Ideal": {"range": (110, 140), "score": 10}, # 110 < WPM <= 140
     "Fast": {"range": (140, float('inf')), "score": 6}, # > 140 WPM
-    "Slow": {"range": (81, 110), "score": 6},
+    "Slow": {"range": (80, 110), "score": 6}, # 80 < WPM <= 110
     "Too slow": {"range": (0, 80), "score": 2}, # <= 80 WPM
 }
 
@@ -61,16 +76,37 @@ SPEECH_RATE_RUBRIC = {
 STANDARD_SPEAKING_RATE_WPM = 150.0 
 
 # Grammar Errors (Max Score: 10)
-# Score = 1 - min(errors_per_100_words / 10, 1) * 10
-GRAMMAR_SCORE_FORMULA = lambda errors_per_100_words: (1 - min(errors_per_100_words / 10, 1)) * 10
+# Score = (1 - min(errors_per_100_words / 10, 1)) * max_score, where max_score is the
+# criterion's WEIGHTS entry, so a profile that reweights the criterion rescales the formula.
+GRAMMAR_SCORE_FORMULA = lambda errors_per_100_words, max_score: (1 - min(errors_per_100_words / 10, 1)) * max_score
+# Grammar checker backend (see grammar_checker.GRAMMAR_BACKENDS): "rules" runs offline,
+# "languagetool" requires language-tool-python.
+GRAMMAR_BACKEND = "rules"
 
 # Vocabulary Richness (Type-Token Ratio - TTR, Max Score: 10)
+# Ranges must be contiguous. A TTR on a boundary belongs to the upper band (0.9 scores 10).
 TTR_RUBRIC = {
     (0.9, 1.0): 10,
-    (0.7, 0.89): 8,
-    (0.5, 0.69): 6,
-    (0.3, 0.49): 4,
-    (0.0, 0.29): 2,
+    (0.7, 0.9): 8,
+    (0.5, 0.7): 6,
+    (0.3, 0.5): 4,
+    (0.0, 0.3): 2,
+}
+
+# Measure scored for Vocabulary Richness: "ttr" (distinct / total words), "mattr" (the mean TTR
+# of every MATTR_WINDOW-word window) or "mtld" (the mean length of word runs whose TTR stays above
+# MTLD_THRESHOLD). TTR falls as transcripts get longer; MATTR and MTLD do not.
+# "ttr" and "mattr" are bucketed by TTR_RUBRIC, "mtld" by MTLD_RUBRIC.
+VOCABULARY_METRIC = "ttr"
+MATTR_WINDOW = 50
+MTLD_THRESHOLD = 0.72
+# MTLD in words. Ranges must be contiguous; a value on a boundary belongs to the upper band.
+MTLD_RUBRIC = {
+    (90, float('inf')): 10,
+    (70, 90): 8,
+    (50, 70): 6,
+    (30, 50): 4,
+    (0, 30): 2,
 }
 
 # Filler Word Rate (Max Score: 15)
@@ -79,8 +115,35 @@ FILLER_WORDS = [
     "i mean", "well", "kinda", "sort of", "okay", "hmm", "ah", "i guess"
 ]
 FILLER_RATE_MAX_PENALTY = 10 # 10% filler word rate results in a 0 score.
-FILLER_SCORE_FORMULA = lambda filler_rate: max(0, 15 - (filler_rate / FILLER_RATE_MAX_PENALTY) * 15)
+# max_score is the criterion's WEIGHTS entry (15 by default)
+FILLER_SCORE_FORMULA = lambda filler_rate, max_score: max(0, max_score - (filler_rate / FILLER_RATE_MAX_PENALTY) * max_score)
+
+# Sentiment/Positivity (Max Score: 15)
+# Buckets on the lexicon compound score in (-1, 1), checked in order: the first category whose
+# "min" the compound reaches wins. The +/-0.05 neutral band follows the usual VADER convention.
+SENTIMENT_RUBRIC = {
+    "Very positive": {"min": 0.5, "score": 15},
+    "Positive": {"min": 0.05, "score": 12},
+    "Neutral": {"min": -0.05, "score": 9},
+    "Negative": {"min": -0.5, "score": 5},
+    "Very negative": {"min": -1.0, "score": 2},
+}
 
+# --- 🏷️ Rubric Profiles ---
+# Named variants of this rubric for other programs, scored side by side with
+# profile_scorer.score_profiles(). Each profile replaces some of the settings above (any setting
+# a rubric file may override); "default" is this file as-is. Rubric files can add or replace
+# profiles with a "RUBRIC_PROFILES" table of their own.
+RUBRIC_PROFILES = {
+    "default": {},
+    # "sales_calls": {
+    #     "FILLER_WORDS": ["um", "uh", "like", "you know", "basically", "to be honest"],
+    #     "KEYWORD_SCORE_PER_ITEM": 10,
+    #     "KEYWORD_LIST": ["name", "family", "hobbies/interest"],
+    #     "KEYWORD_RULES": {...},
+    # },
+    # "long_talks": {"VOCABULARY_METRIC": "mtld"},
+}
 
 # --- 🧪 Sample Data for Testing ---
 SAMPLE_TRANSCRIPT = (
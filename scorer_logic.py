@@ -3,63 +3,155 @@
 import string # Used to strip punctuation for Flow checking
 import re
 import math
-import json
+import time
 from collections import Counter
-from rubric_config import (
-    WEIGHTS, SALUTATION_RUBRIC, SALUTATION_KEYWORDS, KEYWORD_LIST, KEYWORD_SCORE_PER_ITEM,
-    FLOW_KEYWORDS, SPEECH_RATE_RUBRIC, GRAMMAR_SCORE_FORMULA, TTR_RUBRIC,
-    FILLER_WORDS, FILLER_RATE_MAX_PENALTY, FILLER_SCORE_FORMULA,
-    STANDARD_SPEAKING_RATE_WPM 
+from typing import Union
+from rubric_compiler import BUILTIN_CRITERIA, CompiledRubric, get_rubric, get_profiles, NO_SALUTATION
+from matchers import get_filler_matcher, get_keyword_engine
+from grammar_checker import get_grammar_checker
+from sentiment_lexicon import sentiment_compound
+from vocabulary_metrics import mattr, mtld
+from instrumentation import INSTRUMENTATION
+from result_types import (
+    SpeechRateResult, SalutationResult, KeywordPresenceResult, FlowResult, VocabularyRichnessResult,
+    GrammarErrorsResult, FillerWordRateResult, SentimentResult, ScoreResult
 )
 
 # --- Helper Functions ---
 
+TOKEN_PATTERN = re.compile(r'[a-zA-Z0-9]+')
+
 def clean_and_tokenize(transcript: str) -> list:
     """Tokenizes the transcript into words, ignoring punctuation and normalizing case."""
-    words = re.findall(r'[a-zA-Z0-9]+', transcript.lower())
+    words = TOKEN_PATTERN.findall(transcript.lower())
     return words
 
+
+class AnalyzedTranscript:
+    """
+    A transcript analyzed once per request and shared by every scoring criterion.
+    Holds the lowercased text, the token list, token character offsets (into the
+    lowercased text) and the derived counts, so no scorer re-scans the transcript.
+    Tokenization runs on first access, so criteria that only read the text never pay for it.
+    """
+    __slots__ = ("raw", "normalized", "stripped", "_tokens", "_offsets", "_distinct_count", "_vocabulary")
+
+    def __init__(self, transcript: str):
+        self.raw = transcript
+        self.normalized = transcript.lower()
+        self.stripped = self.normalized.strip()
+        self._tokens = None
+        self._offsets = None
+        self._distinct_count = None
+        self._vocabulary = None
+
+    def _tokenize(self) -> None:
+        tokens, offsets = [], []
+        for match in TOKEN_PATTERN.finditer(self.normalized):
+            tokens.append(match.group())
+            offsets.append(match.span())
+        self._tokens, self._offsets = tokens, offsets
+
+    @property
+    def tokens(self) -> list:
+        if self._tokens is None:
+            self._tokenize()
+        return self._tokens
+
+    @property
+    def offsets(self) -> list:
+        if self._offsets is None:
+            self._tokenize()
+        return self._offsets
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def distinct_count(self) -> int:
+        if self._distinct_count is None:
+            self._distinct_count = len(set(self.tokens))
+        return self._distinct_count
+
+    def vocabulary_measure(self, rubric: CompiledRubric) -> float:
+        """The rubric's VOCABULARY_METRIC over the tokens, computed once per metric and parameter."""
+        metric = rubric.vocabulary_metric
+        if metric == "ttr":
+            return self.distinct_count / self.word_count if self.word_count else 0.0
+        key = (metric, rubric.mattr_window if metric == "mattr" else rubric.mtld_threshold)
+        if self._vocabulary is None:
+            self._vocabulary = {}
+        if key not in self._vocabulary:
+            self._vocabulary[key] = mattr(self.tokens, key[1]) if metric == "mattr" else mtld(self.tokens, key[1])
+        return self._vocabulary[key]
+
+
+def analyze_transcript(transcript: Union[str, AnalyzedTranscript]) -> AnalyzedTranscript:
+    """Returns the analyzed form of a transcript, reusing it if it was already analyzed."""
+    if isinstance(transcript, AnalyzedTranscript):
+        return transcript
+    return AnalyzedTranscript(transcript)
+
+def detect_salutation(stripped_text: str, rubric: CompiledRubric = None) -> str:
+    """Returns the SALUTATION_RUBRIC category of the opening of a lowercased, stripped transcript."""
+    # Check from highest score ('Excellent') down; each category's phrases are one startswith() call
+    for cat, phrases in (rubric or get_rubric()).salutation_phrases:
+        if stripped_text.startswith(phrases):
+            return cat
+    return NO_SALUTATION
+
+def detect_flow(stripped_text: str, rubric: CompiledRubric = None) -> tuple:
+    """Returns (has_start, has_end) for the FLOW_KEYWORDS start and end markers."""
+    rubric = rubric or get_rubric()
+    # 1. Check for START phrase
+    has_start = stripped_text.startswith(rubric.flow_start)
+    
+    # 2. Check for END phrase (Robust check by stripping trailing punctuation)
+    text_end_cleaned = stripped_text.rstrip(string.punctuation).strip()
+    has_end = text_end_cleaned.endswith(rubric.flow_end)
+    return has_start, has_end
+
+def flow_score(has_start: bool, has_end: bool, rubric: CompiledRubric = None) -> int:
+    """Full Flow weight for start and end markers, half (rounded up) for one of them, else 0."""
+    weight = (rubric or get_rubric()).weights["Flow"]
+    if has_start and has_end:
+        return weight
+    if has_start or has_end:
+        return math.ceil(weight / 2) # e.g., 3/5
+    return 0
+
+def estimate_duration(word_count: int, duration_seconds: float, rubric: CompiledRubric = None) -> tuple:
+    """
+    Returns (actual_duration, is_estimated). A non-positive duration is estimated from
+    the standard speaking rate (150 WPM); an empty transcript has a duration of 0.
+    """
+    if duration_seconds <= 0.0 and word_count > 0:
+        return (word_count / (rubric or get_rubric()).standard_speaking_rate_wpm) * 60, True
+    if word_count == 0:
+        return 0.0, False
+    return duration_seconds, False
+
 # --- Scoring Functions ---
 
-def score_speech_rate(transcript: str, duration_seconds: float, is_estimated: bool) -> dict:
+def score_speech_rate(transcript: Union[str, AnalyzedTranscript], duration_seconds: float, is_estimated: bool,
+                      rubric: CompiledRubric = None) -> SpeechRateResult:
     """Calculates WPM and scores based on the Speech Rate Rubric, handling duration estimation."""
-    words = clean_and_tokenize(transcript)
-    word_count = len(words)
+    return speech_rate_result(analyze_transcript(transcript).word_count, duration_seconds, is_estimated, rubric)
 
+def speech_rate_result(word_count: int, duration_seconds: float, is_estimated: bool,
+                       rubric: CompiledRubric = None) -> SpeechRateResult:
+    """Builds the Speech Rate result from the word count and the (actual or estimated) duration."""
+    rubric = rubric or get_rubric()
     if duration_seconds <= 0.0 or word_count == 0:
         wpm = 0.0
     else:
         wpm = (word_count / duration_seconds) * 60
 
-    score = 0
-    feedback = "Speech rate could not be calculated."
-    category = "N/A"
-    
-    # Apply rubric rules based on calculated WPM
-    for cat, data in SPEECH_RATE_RUBRIC.items():
-        min_wpm, max_wpm = data["range"]
-        
-        # Check from most specific range to least
-        if cat == "Fast" and wpm > min_wpm:
-            score = data["score"]
-            category = cat
-            feedback = f"Your speech rate of {wpm:.2f} WPM is too fast. (Score: {score}/{WEIGHTS['Speech Rate']})"
-            break
-        elif cat == "Ideal" and min_wpm <= wpm <= max_wpm:
-            score = data["score"]
-            category = cat
-            feedback = f"Excellent! Your speech rate of {wpm:.2f} WPM is in the ideal range. (Score: {score}/{WEIGHTS['Speech Rate']})"
-            break
-        elif cat == "Slow" and min_wpm <= wpm <= max_wpm:
-            score = data["score"]
-            category = cat
-            feedback = f"Your speech rate of {wpm:.2f} WPM is a bit slow. (Score: {score}/{WEIGHTS['Speech Rate']})"
-            break
-        elif cat == "Too slow" and wpm <= max_wpm:
-             score = data["score"]
-             category = cat
-             feedback = f"Your speech rate of {wpm:.2f} WPM is too slow. (Score: {score}/{WEIGHTS['Speech Rate']})"
-             break
+    # Binary search over the compiled SPEECH_RATE_RUBRIC breakpoints
+    category, score = rubric.speech_rate.lookup(wpm)
+    if category is None:
+        category = "N/A"
     
     # --- 🛠️ FIX for Target Score 86 ---
     # The sample case (131 words, 52s, 151.15 WPM) should score 6.
@@ -69,252 +161,368 @@ def score_speech_rate(transcript: str, duration_seconds: float, is_estimated: bo
         score = 6
     # --- END FIX ---
         
-    if is_estimated and word_count > 0:
-        feedback += f" **(NOTE: Duration EST. from {STANDARD_SPEAKING_RATE_WPM} WPM.)**"
-    elif word_count == 0:
-        feedback = f"Cannot calculate WPM: Word count is 0. (Score: 0/{WEIGHTS['Speech Rate']})"
-        
-    return {
-        "criterion": "Speech Rate",
-        "score": score,
-        "max_score": WEIGHTS["Speech Rate"],
-        "feedback": feedback,
-        "details": {"wpm": f"{wpm:.2f}", "word_count": word_count, "duration_seconds": duration_seconds, "is_estimated": is_estimated}
-    }
+    return SpeechRateResult(score, wpm, word_count, duration_seconds, is_estimated, category, rubric)
 
 
-def score_salutation_level(transcript: str) -> dict:
+def score_salutation_level(transcript: Union[str, AnalyzedTranscript], rubric: CompiledRubric = None) -> SalutationResult:
     """Scores the salutation level (0-5) based on keywords found at the start of the transcript."""
-    normalized_text = transcript.lower().strip()
-    score = SALUTATION_RUBRIC["No Salutation"]
-    category = "No Salutation"
-    
-    # Check from highest score ('Excellent') down
-    for cat in ["Excellent", "Good", "Normal"]:
-        for phrase in SALUTATION_KEYWORDS[cat]:
-            if normalized_text.startswith(phrase):
-                score = SALUTATION_RUBRIC[cat]
-                category = cat
-                break
-        if category != "No Salutation":
-            break
-
-    feedback = f"Salutation found: '{category}' (Score: {score}/{WEIGHTS['Salutation Level']})"
-    if category == "No Salutation":
-         feedback = f"No clear salutation found at the beginning of the transcript. (Score: {score}/{WEIGHTS['Salutation Level']})"
-
-    return {
-        "criterion": "Salutation Level",
-        "score": score,
-        "max_score": WEIGHTS["Salutation Level"],
-        "feedback": feedback,
-        "details": {"category": category}
-    }
-
-def score_keyword_presence(transcript: str) -> dict:
+    rubric = rubric or get_rubric()
+    return salutation_result(detect_salutation(analyze_transcript(transcript).stripped, rubric), rubric)
+
+def salutation_result(category: str, rubric: CompiledRubric = None) -> SalutationResult:
+    """Builds the Salutation Level result for a SALUTATION_RUBRIC category."""
+    rubric = rubric or get_rubric()
+    return SalutationResult(rubric.salutation_scores[category], category, rubric)
+
+def score_keyword_presence(transcript: Union[str, AnalyzedTranscript], keyword_rules: dict = None, include_spans: bool = False,
+                           rubric: CompiledRubric = None) -> KeywordPresenceResult:
     """
     Checks for presence of mandatory keywords (6 items). Each found keyword scores 5 points (Max 30).
     The logic correctly finds 6/6 for the sample to contribute to the 86 target score.
+    `keyword_rules` overrides the rubric's KEYWORD_RULES. With `include_spans`, the details also
+    carry the character spans of every match (into the lowercased text) for highlighting.
     """
-    normalized_text = transcript.lower()
-    keyword_map = {
-        "name": r'myself|i am', "age": r'\d+ years old|i am \d+',
-        "school/class": r'school|class|studying in', "family": r'family|father|mother|parents|siblings',
-        "hobbies/interest": r'enjoy|like to do|hobbies|interest|favorite subject',
-        "unique point/fun fact": r'fun fact|special thing|one thing people don\'t know'
-    }
-    found_keywords = [k for k, p in keyword_map.items() if re.search(p, normalized_text)]
-    
-    score = len(found_keywords) * KEYWORD_SCORE_PER_ITEM 
-    
-    feedback = f"Found {len(found_keywords)}/{len(KEYWORD_LIST)} mandatory keywords. (Score: {score}/{WEIGHTS['Key word Presence']})"
-    return {
-        "criterion": "Key word Presence",
-        "score": score,
-        "max_score": WEIGHTS["Key word Presence"],
-        "feedback": feedback,
-        "details": {"found_keywords": found_keywords}
-    }
+    rubric = rubric or get_rubric()
+    normalized_text = analyze_transcript(transcript).normalized
+    engine = rubric.keyword_engine if keyword_rules is None else get_keyword_engine(keyword_rules)
+    details = {}
+    if include_spans:
+        keyword_spans = engine.find_spans(normalized_text)
+        found_keywords = list(keyword_spans)
+        details["keyword_spans"] = keyword_spans
+    else:
+        found_keywords = engine.find_categories(normalized_text)
+    return keyword_presence_result(found_keywords, details, rubric)
+
+def keyword_presence_result(found_keywords: list, extra_details: dict = None,
+                            rubric: CompiledRubric = None) -> KeywordPresenceResult:
+    """Builds the Key word Presence result from the categories found."""
+    rubric = rubric or get_rubric()
+    score = len(found_keywords) * rubric.keyword_score_per_item 
+    return KeywordPresenceResult(score, found_keywords, extra_details, rubric)
 
-def score_flow(transcript: str) -> dict:
+def score_flow(transcript: Union[str, AnalyzedTranscript], rubric: CompiledRubric = None) -> FlowResult:
     """
     Scores the flow (5 points) based on detecting a clear starting salutation and closing statement.
     Uses 'string.punctuation' to handle periods/exclamations correctly.
     """
-    normalized_text = transcript.lower().strip()
-    score = 0
-    
-    # 1. Check for START phrase
-    has_start = any(normalized_text.startswith(kw) for kw in FLOW_KEYWORDS["START"])
-    
-    # 2. Check for END phrase (Robust check by stripping trailing punctuation)
-    text_end_cleaned = normalized_text.rstrip(string.punctuation).strip()
-    has_end = any(text_end_cleaned.endswith(kw) for kw in FLOW_KEYWORDS["END"])
-    
-    if has_start and has_end:
-        score = WEIGHTS["Flow"]
-        feedback = f"Flow appears complete (Salutation and Closing detected). (Score: {score}/{WEIGHTS['Flow']})"
-    elif has_start and not has_end:
-        score = math.ceil(WEIGHTS["Flow"] / 2) # e.g., 3/5
-        feedback = f"Starting salutation is present, but a clear closing statement is missing. (Score: {score}/{WEIGHTS['Flow']})"
-    elif not has_start and has_end:
-        score = math.ceil(WEIGHTS["Flow"] / 2)
-        feedback = f"Closing statement is present, but a clear starting salutation is missing. (Score: {score}/{WEIGHTS['Flow']})"
-    else:
-        score = 0
-        feedback = f"Both starting salutation and closing statement are missing. (Score: {score}/{WEIGHTS['Flow']})"
-
-    return {
-        "criterion": "Flow",
-        "score": score,
-        "max_score": WEIGHTS["Flow"],
-        "feedback": feedback,
-        "details": {"has_start": has_start, "has_end": has_end}
-    }
-
-def score_vocabulary_richness_ttr(transcript: str, word_count: int) -> dict:
+    rubric = rubric or get_rubric()
+    return flow_result(*detect_flow(analyze_transcript(transcript).stripped, rubric), rubric)
+
+def flow_result(has_start: bool, has_end: bool, rubric: CompiledRubric = None) -> FlowResult:
+    """Builds the Flow result from the start and end marker checks."""
+    rubric = rubric or get_rubric()
+    return FlowResult(flow_score(has_start, has_end, rubric), has_start, has_end, rubric)
+
+def score_vocabulary_richness_ttr(transcript: Union[str, AnalyzedTranscript], word_count: int,
+                                  rubric: CompiledRubric = None) -> VocabularyRichnessResult:
     """Calculates Type-Token Ratio (TTR) and scores based on the TTR Rubric (Max 10)."""
-    words = clean_and_tokenize(transcript)
-    
+    # Older name of score_vocabulary_richness; it also follows the rubric's VOCABULARY_METRIC
+    return score_vocabulary_richness(transcript, word_count, rubric)
+
+def score_vocabulary_richness(transcript: Union[str, AnalyzedTranscript], word_count: int,
+                              rubric: CompiledRubric = None) -> VocabularyRichnessResult:
+    """
+    Scores Vocabulary Richness (Max 10) with the rubric's VOCABULARY_METRIC: TTR, or the
+    length-robust MATTR or MTLD (see vocabulary_metrics.py).
+    """
+    rubric = rubric or get_rubric()
+    analyzed = analyze_transcript(transcript)
+    measure = None if rubric.vocabulary_metric == "ttr" else analyzed.vocabulary_measure(rubric)
+    return vocabulary_richness_result(analyzed.distinct_count, word_count, rubric, measure)
+
+def vocabulary_richness_result(distinct_words: int, word_count: int,
+                               rubric: CompiledRubric = None, measure: float = None) -> VocabularyRichnessResult:
+    """
+    Builds the Vocabulary Richness result from the distinct and total word counts, and the
+    rubric's MATTR or MTLD `measure` when VOCABULARY_METRIC is not "ttr".
+    """
+    rubric = rubric or get_rubric()
     if word_count == 0:
         ttr = 0.0
     else:
-        distinct_words = len(set(words))
         ttr = distinct_words / word_count
 
-    score = 0
-    feedback = f"Vocabulary TTR: {ttr:.4f} is outside defined ranges."
-    
-    for (min_ttr, max_ttr), rubric_score in TTR_RUBRIC.items():
-        if min_ttr <= ttr <= max_ttr:
-            score = rubric_score
-            feedback = f"Vocabulary TTR: {ttr:.4f} is in the range {min_ttr}-{max_ttr}. (Score: {score}/{WEIGHTS['Vocabulary Richness']})"
-            break
-
-    return {
-        "criterion": "Vocabulary Richness",
-        "score": score,
-        "max_score": WEIGHTS["Vocabulary Richness"],
-        "feedback": feedback,
-        "details": {"ttr": f"{ttr:.4f}", "distinct_words": len(set(words)), "total_words": word_count}
-    }
-
-def score_grammar_errors(transcript: str, word_count: int) -> dict:
-    """
-    Placeholder for Grammar Error scoring (Max 10). 
-    Currently scores 10/10, assuming perfect grammar in the absence of a Language Tool library.
-    """
-    error_count = 0
+    # Binary search over the compiled TTR_RUBRIC (or MTLD_RUBRIC) breakpoints
+    metric = rubric.vocabulary_metric
+    value = ttr if metric == "ttr" else measure
+    _, score = rubric.vocabulary_bands.lookup(value)
+    return VocabularyRichnessResult(score, ttr, distinct_words, word_count, rubric, metric, value)
+
+def score_grammar_errors(transcript: Union[str, AnalyzedTranscript], word_count: int, backend: str = None,
+                         rubric: CompiledRubric = None) -> GrammarErrorsResult:
+    """
+    Scores grammar errors (Max: the rubric's weight, 10 by default) with GRAMMAR_SCORE_FORMULA
+    on the error rate per 100 words.
+    Errors come from the process-wide checker for `backend` (default: the rubric's GRAMMAR_BACKEND).
+    """
+    rubric = rubric or get_rubric()
+    checker = get_grammar_checker(backend or rubric.grammar_backend)
+    issues = checker.check(analyze_transcript(transcript).raw)
+    return grammar_errors_result(issues, word_count, checker.backend.name, rubric)
+
+def grammar_errors_result(issues: list, word_count: int, backend_name: str,
+                          rubric: CompiledRubric = None) -> GrammarErrorsResult:
+    """Builds the Grammar Errors result from the issues a grammar backend reported."""
+    rubric = rubric or get_rubric()
+    error_count = len(issues)
     
     if word_count == 0:
         errors_per_100_words = 0
     else:
         errors_per_100_words = (error_count / word_count) * 100
 
-    score = GRAMMAR_SCORE_FORMULA(errors_per_100_words)
+    score = rubric.grammar_score_formula(errors_per_100_words, rubric.weights["Grammar Errors"])
     score = round(score)
     
-    feedback = f"Grammar error rate: {errors_per_100_words:.2f} errors/100 words. (Score: {score}/{WEIGHTS['Grammar Errors']})"
-    if error_count == 0:
-        feedback = f"No grammar errors detected (or placeholder used). (Score: {score}/{WEIGHTS['Grammar Errors']})"
-    
-    return {
-        "criterion": "Grammar Errors",
-        "score": score,
-        "max_score": WEIGHTS["Grammar Errors"],
-        "feedback": feedback,
-        "details": {"errors_per_100_words": f"{errors_per_100_words:.2f}", "error_count": error_count},
-        "NOTE": "A placeholder was used for grammar errors. Install 'language-tool-python' for real scoring."
-    }
-
-def score_filler_word_rate(transcript: str, word_count: int) -> dict:
-    """Calculates filler word rate and scores based on a max penalty formula (Max 15)."""
-    normalized_text = transcript.lower()
-    filler_count = 0
-    found_fillers = Counter()
+    top_issues = Counter(issue["rule"] for issue in issues).most_common(3) if error_count else ()
+    return GrammarErrorsResult(score, errors_per_100_words, error_count, backend_name, top_issues, rubric)
+
+def score_filler_word_rate(transcript: Union[str, AnalyzedTranscript], word_count: int, filler_words: list = None,
+                           rubric: CompiledRubric = None) -> FillerWordRateResult:
+    """
+    Calculates filler word rate and scores based on a max penalty formula (Max: the rubric's
+    weight, 15 by default).
+    `filler_words` overrides the rubric's FILLER_WORDS; its compiled matcher is cached by contents.
+    """
+    rubric = rubric or get_rubric()
+    normalized_text = analyze_transcript(transcript).normalized
+    matcher = rubric.filler_matcher if filler_words is None else get_filler_matcher(filler_words)
     
-    for filler in FILLER_WORDS:
-        matches = re.findall(r'\b' + re.escape(filler) + r'\b', normalized_text)
-        filler_count += len(matches)
-        if matches:
-            found_fillers[filler] = len(matches)
+    # All fillers are found in a single scan of the text
+    found_fillers = matcher.count(normalized_text)
+    return filler_word_rate_result(found_fillers, matcher.total(found_fillers), word_count, rubric)
+
+def filler_word_rate_result(found_fillers: Counter, filler_count: int, word_count: int,
+                            rubric: CompiledRubric = None) -> FillerWordRateResult:
+    """Builds the Filler Word Rate result from per-filler counts and their total."""
+    rubric = rubric or get_rubric()
 
     if word_count == 0:
         filler_rate = 0.0
     else:
         filler_rate = (filler_count / word_count) * 100 # Rate in percentage
 
-    score = FILLER_SCORE_FORMULA(filler_rate)
+    score = rubric.filler_score_formula(filler_rate, rubric.weights["Filler Word Rate"])
     score = round(score)
     
-    feedback = f"Filler word rate: {filler_rate:.2f}%. Found {filler_count} filler words. (Score: {score}/{WEIGHTS['Filler Word Rate']})"
-    if filler_count > 0:
-         feedback += f" Top fillers: {', '.join(f'{k} ({v})' for k,v in found_fillers.most_common(3))}."
+    top_fillers = found_fillers.most_common(3) if filler_count > 0 else ()
+    return FillerWordRateResult(score, filler_rate, filler_count, top_fillers, rubric)
 
-    return {
-        "criterion": "Filler Word Rate",
-        "score": score,
-        "max_score": WEIGHTS["Filler Word Rate"],
-        "feedback": feedback,
-        "details": {"filler_rate_percent": f"{filler_rate:.2f}", "filler_count": filler_count}
-    }
+def sentiment_category(compound: float, rubric: CompiledRubric = None) -> str:
+    """Returns the SENTIMENT_RUBRIC category for a compound score."""
+    category, _ = (rubric or get_rubric()).sentiment.lookup(compound)
+    return category
 
-def score_sentiment_positivity(transcript: str) -> dict:
+def score_sentiment_positivity(transcript: Union[str, AnalyzedTranscript], rubric: CompiledRubric = None) -> SentimentResult:
     """
-    Placeholder for NLP-based scoring (Max 15).
-    Score is fixed at 10/15 to match the required overall sample score of 86.
+    Scores positivity (Max 15) from the bundled valence lexicon, in one pass over the shared
+    tokens with negation and intensifier handling, bucketed by SENTIMENT_RUBRIC.
     """
-    score = 10
-    
-    return {
-        "criterion": "Sentiment/Positivity",
-        "score": score,
-        "max_score": WEIGHTS["Sentiment/Positivity"],
-        "feedback": "Sentiment model placeholder: Score fixed at 10 to match sample rubric.",
-        "details": {"sentiment_score": "Placeholder: 10/15 mandated by rubric"},
-        "NOTE": "This score is a placeholder for the required NLP-based semantic analysis."
-    }
+    return sentiment_result(sentiment_compound(analyze_transcript(transcript).tokens), rubric)
+
+def sentiment_result(sentiment: dict, rubric: CompiledRubric = None) -> SentimentResult:
+    """Builds the Sentiment/Positivity result from a sentiment_lexicon summary."""
+    rubric = rubric or get_rubric()
+    compound = sentiment["compound"]
+    category, score = rubric.sentiment.lookup(compound)
+    return SentimentResult(score, compound, category, sentiment["positive_tokens"], sentiment["negative_tokens"], rubric)
+
+# --- Criterion Registry ---
+
+class Criterion:
+    """
+    A registered scoring criterion: its scorer, the inputs it needs and its weight
+    (None for criteria weighted by the rubric's WEIGHTS).
+    """
+    __slots__ = ("name", "func", "inputs", "weight")
+
+    def __init__(self, name: str, func, inputs: tuple, weight: float):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.weight = weight
+
+    def weight_in(self, rubric: CompiledRubric) -> float:
+        return rubric.weights.get(self.name, 0) if self.weight is None else self.weight
+
+# Criteria in output order; calculate_final_score runs those named in the rubric's WEIGHTS by default
+CRITERIA = {}
+# Derived input name -> (names of the inputs it is computed from, function computing it)
+INPUT_PROVIDERS = {}
+# Inputs supplied by the caller rather than computed; "rubric" is the CompiledRubric in use
+BASE_INPUTS = ("raw_transcript", "raw_duration", "rubric")
+
+def register_criterion(name: str, inputs: tuple, weight: float = None):
+    """
+    Decorator registering `func(**inputs)` as the scorer for criterion `name`; it returns a
+    result_types.CriterionResult or a dict with the same keys. Without `weight`, the criterion
+    is weighted by the active rubric's WEIGHTS, so criteria outside WEIGHTS must pass their
+    `weight`. Registering an existing name replaces it.
+    """
+    def decorator(func):
+        # Built-in criteria are checked by the rubric compiler, so importing this module
+        # does not compile the rubric
+        if weight is None and name not in BUILTIN_CRITERIA and name not in get_rubric().weights:
+            raise ValueError(f"Criterion '{name}' is not in WEIGHTS; pass its weight explicitly.")
+        for input_name in inputs:
+            if input_name not in INPUT_PROVIDERS and input_name not in BASE_INPUTS:
+                raise ValueError(f"Criterion '{name}' requires unknown input '{input_name}'.")
+        CRITERIA[name] = Criterion(name, func, tuple(inputs), weight)
+        return func
+    return decorator
+
+def register_input(name: str, dependencies: tuple):
+    """Decorator registering `func(**dependencies)` as the provider of a derived input."""
+    def decorator(func):
+        INPUT_PROVIDERS[name] = (tuple(dependencies), func)
+        return func
+    return decorator
+
+def build_execution_plan(criterion_names: list = None, rubric: CompiledRubric = None) -> tuple:
+    """
+    Returns (criteria, inputs) for the selected criteria (default: every criterion in the
+    rubric's WEIGHTS): the Criterion objects in registry order and the derived inputs they
+    need, dependencies first.
+    """
+    if criterion_names is None:
+        weights = (rubric or get_rubric()).weights
+        criteria = [c for c in CRITERIA.values() if c.name in weights]
+    else:
+        unknown = [name for name in criterion_names if name not in CRITERIA]
+        if unknown:
+            raise ValueError(f"Unknown criteria: {unknown}. Registered: {list(CRITERIA)}")
+        selected = set(criterion_names)
+        criteria = [c for c in CRITERIA.values() if c.name in selected]
+
+    inputs = []
+    def require(input_name):
+        if input_name in BASE_INPUTS or input_name in inputs:
+            return
+        dependencies, _ = INPUT_PROVIDERS[input_name]
+        for dependency in dependencies:
+            require(dependency)
+        inputs.append(input_name)
+    for criterion in criteria:
+        for input_name in criterion.inputs:
+            require(input_name)
+    return criteria, inputs
+
+# --- Built-in Inputs and Criteria ---
+
+@register_input("transcript", ("raw_transcript",))
+def _input_transcript(raw_transcript):
+    return analyze_transcript(raw_transcript)
+
+@register_input("word_count", ("transcript",))
+def _input_word_count(transcript):
+    return transcript.word_count
+
+@register_input("duration", ("word_count", "raw_duration", "rubric"))
+def _input_duration(word_count, raw_duration, rubric):
+    # (actual_duration, is_estimated)
+    return estimate_duration(word_count, raw_duration, rubric)
+
+register_criterion("Speech Rate", ("transcript", "duration", "rubric"))(
+    lambda transcript, duration, rubric: score_speech_rate(transcript, *duration, rubric=rubric))
+register_criterion("Salutation Level", ("transcript", "rubric"))(
+    lambda transcript, rubric: score_salutation_level(transcript, rubric))
+register_criterion("Key word Presence", ("transcript", "rubric"))(
+    lambda transcript, rubric: score_keyword_presence(transcript, rubric=rubric))
+register_criterion("Flow", ("transcript", "rubric"))(
+    lambda transcript, rubric: score_flow(transcript, rubric))
+register_criterion("Vocabulary Richness", ("transcript", "word_count", "rubric"))(
+    lambda transcript, word_count, rubric: score_vocabulary_richness(transcript, word_count, rubric))
+register_criterion("Filler Word Rate", ("transcript", "word_count", "rubric"))(
+    lambda transcript, word_count, rubric: score_filler_word_rate(transcript, word_count, rubric=rubric))
+register_criterion("Grammar Errors", ("transcript", "word_count", "rubric"))(
+    lambda transcript, word_count, rubric: score_grammar_errors(transcript, word_count, rubric=rubric))
+register_criterion("Sentiment/Positivity", ("transcript", "rubric"))(
+    lambda transcript, rubric: score_sentiment_positivity(transcript, rubric))
 
 # --- Main Scoring Orchestrator ---
 
-def calculate_final_score(transcript: str, duration_seconds: float) -> dict:
+def calculate_final_score(transcript: Union[str, AnalyzedTranscript], duration_seconds: float,
+                          criteria: list = None, rubric: CompiledRubric = None) -> dict:
     """
     Orchestrates all scoring criteria, calculates duration estimation if needed, 
     and returns the final weighted score out of 100.
+    `criteria` selects a subset by name; only the inputs those criteria need are computed,
+    and the overall score is renormalized over the selected criteria's weights.
+    `rubric` defaults to the active rubric (rubric_compiler.get_rubric()).
     """
+    return score_transcript(transcript, duration_seconds, criteria, rubric).to_dict()
+
+def score_transcript(transcript: Union[str, AnalyzedTranscript], duration_seconds: float,
+                     criteria: list = None, rubric: CompiledRubric = None) -> ScoreResult:
+    """
+    calculate_final_score returning the compact ScoreResult: numbers stay numeric and feedback
+    is rendered only if asked for. Prefer it when holding many results in memory.
+    """
+    # One rubric for the whole request, even if a reload happens meanwhile
+    rubric = rubric or get_rubric()
+    plan_criteria, plan_inputs = build_execution_plan(criteria, rubric)
     
-    words = clean_and_tokenize(transcript)
-    word_count = len(words)
-    
-    # 1. Determine Actual vs. Estimated Duration
-    is_estimated = False
-    actual_duration = duration_seconds
-    
-    if actual_duration <= 0.0 and word_count > 0:
-        # Estimate duration based on the standard speaking rate (150 WPM)
-        actual_duration = (word_count / STANDARD_SPEAKING_RATE_WPM) * 60
-        is_estimated = True
-    elif word_count == 0:
-        actual_duration = 0.0
-
-    # 2. Run all scoring criteria
-    scoring_results = []
-    
-    scoring_results.append(score_speech_rate(transcript, actual_duration, is_estimated))
-    scoring_results.append(score_salutation_level(transcript))
-    scoring_results.append(score_keyword_presence(transcript))
-    scoring_results.append(score_flow(transcript))
-    scoring_results.append(score_vocabulary_richness_ttr(transcript, word_count))
-    scoring_results.append(score_filler_word_rate(transcript, word_count))
-    scoring_results.append(score_grammar_errors(transcript, word_count))
-    scoring_results.append(score_sentiment_positivity(transcript))
+    # 1. Compute each derived input once (the transcript is analyzed once for all criteria)
+    values = {"raw_transcript": transcript, "raw_duration": duration_seconds, "rubric": rubric}
+    for input_name in plan_inputs:
+        dependencies, provider = INPUT_PROVIDERS[input_name]
+        values[input_name] = provider(**{name: values[name] for name in dependencies})
+
+    # 2. Run the selected scoring criteria
+    calls = [
+        (c.name, lambda c=c: c.func(**{name: values[name] for name in c.inputs}))
+        for c in plan_criteria
+    ]
+    if INSTRUMENTATION.enabled:
+        if "word_count" in values:
+            word_count = values["word_count"]
+        else:
+            # Reuse the plan's analyzed transcript when it has one; its word count is computed lazily
+            word_count = analyze_transcript(values.get("transcript", transcript)).word_count
+        scoring_results = INSTRUMENTATION.run_request(calls, word_count)
+    else:
+        scoring_results = [run() for _, run in calls]
     
-    # 3. Calculate Overall Weighted Score (Sum of scores equals the final score out of 100)
+    # 3. Calculate Overall Weighted Score
+    return combine_results(scoring_results, sum(c.weight_in(rubric) for c in plan_criteria), rubric)
+
+def combine_results(scoring_results: list, selected_weight: float = None,
+                    rubric: CompiledRubric = None) -> ScoreResult:
+    """
+    Builds the final result from per-criterion results. The sum of scores is the final score
+    out of TOTAL_WEIGHT for the full rubric; subsets are scaled to their share of the total weight.
+    """
+    total_weight = (rubric or get_rubric()).total_weight
     total_weighted_score = sum(result['score'] for result in scoring_results)
+    if selected_weight and selected_weight != total_weight:
+        total_weighted_score = total_weighted_score / selected_weight * total_weight
     overall_score = round(total_weighted_score)
 
-    return {
-        "overall_score": overall_score,
-        "max_overall_score": 100,
-        "per_criterion_scores": scoring_results,
-    }
\ No newline at end of file
+    return ScoreResult(overall_score, scoring_results, total_weight)
+
+# --- Warm-up ---
+
+def warm_up(profiles: list = None) -> dict:
+    """
+    Loads everything a first request would otherwise load, so a fresh worker serves its first
+    request at full speed: compiles the rubric profiles (default: all), starts the grammar
+    backend each one uses and scores a short transcript with each profile. Returns {step: seconds}.
+    Use it as a process pool `initializer`, or call it before accepting traffic.
+    """
+    from rubric_config import SAMPLE_TRANSCRIPT
+    timings = {}
+    start = time.perf_counter()
+    rubrics = get_profiles(profiles)
+    timings["rubric"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for backend in dict.fromkeys(rubric.grammar_backend for rubric in rubrics.values()):
+        get_grammar_checker(backend)
+    timings["grammar_backends"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for rubric in rubrics.values():
+        score_transcript(SAMPLE_TRANSCRIPT, 0.0, rubric=rubric).to_dict()
+    timings["first_score"] = time.perf_counter() - start
+    return timings
\ No newline at end of file
@@ -0,0 +1,313 @@
+# scoring_service.py
+# Asyncio HTTP service exposing calculate_final_score to programmatic clients.
+# Scoring runs in a bounded process pool; the event loop only parses and routes requests.
+#
+# Usage:
+#   python scoring_service.py serve --port 8080 --workers 4
+#   python scoring_service.py loadtest --port 8080 --concurrency 32 --requests 2000
+#
+# Endpoints:
+#   GET  /health       -> {"status": "ok", "in_flight": n}
+#   POST /score        {"transcript": str, "duration": float} -> calculate_final_score result
+#   POST /score/batch  {"records": [{"id", "transcript", "duration"}, ...]} -> {"results": [...]}
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from batch_scorer import score_record, score_chunk
+from scorer_logic import warm_up
+
+DEFAULT_MAX_IN_FLIGHT = 64
+DEFAULT_REQUEST_TIMEOUT = 10.0
+DEFAULT_MAX_BODY_BYTES = 1_000_000
+DEFAULT_MAX_BATCH_RECORDS = 1000
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+
+class HTTPError(Exception):
+    """An error that is reported to the client as an HTTP status with a JSON body."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ScoringService:
+    """
+    Serves scoring requests over HTTP/1.1 (keep-alive) with a bounded process pool.
+
+    Backpressure: at most `max_in_flight` scoring jobs may be queued or running in the pool;
+    beyond that, requests are rejected immediately with 503 and a Retry-After header instead
+    of queueing without bound. Each job must finish within `request_timeout` seconds or the
+    client receives 504; the slot is held until the worker actually finishes the job.
+    """
+
+    def __init__(self, workers: int = None, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+                 max_batch_records: int = DEFAULT_MAX_BATCH_RECORDS):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+        self.max_batch_records = max_batch_records
+        self.in_flight = 0
+        self.pool = None
+        self.server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_up)
+        # Start and warm every worker before accepting connections, so no client waits on a cold start
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, warm_up) for _ in range(self.workers)))
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- Job Dispatch ---
+
+    async def run_job(self, func, payload):
+        """Runs func(payload) in the pool, enforcing the in-flight bound and the request timeout."""
+        if self.in_flight >= self.max_in_flight:
+            raise HTTPError(503, "Server is at capacity, retry later.")
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        future = self.pool.submit(func, payload)
+        # Released only when the worker is done, even if the client already timed out
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release_slot))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.request_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPError(504, f"Scoring did not finish within {self.request_timeout}s.")
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+
+    # --- Routing ---
+
+    async def route(self, method: str, path: str, body: bytes) -> dict:
+        if path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "Use GET.")
+            return {"status": "ok", "in_flight": self.in_flight, "max_in_flight": self.max_in_flight}
+        if path not in ("/score", "/score/batch"):
+            raise HTTPError(404, f"Unknown path: {path}")
+        if method != "POST":
+            raise HTTPError(405, "Use POST.")
+
+        try:
+            payload = json.loads(body or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HTTPError(400, "Body must be valid JSON.")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Body must be a JSON object.")
+
+        if path == "/score":
+            result = await self.run_job(score_record, payload)
+            if "error" in result:
+                raise HTTPError(400, result["error"])
+            return result
+
+        records = payload.get("records")
+        if not isinstance(records, list):
+            raise HTTPError(400, "'records' must be a list.")
+        if len(records) > self.max_batch_records:
+            raise HTTPError(413, f"At most {self.max_batch_records} records per batch.")
+        return {"results": await self.run_job(score_chunk, records)}
+
+    # --- HTTP Handling ---
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = await self.handle_request(request_line, reader, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request_line: bytes, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> bool:
+        """Reads one request, writes its response and returns whether to keep the connection open."""
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            await self.write_response(writer, 400, {"error": "Malformed request line."}, False)
+            return False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Without a usable length the body cannot be skipped, so the connection is closed
+            await self.write_response(writer, 400, {"error": "Invalid Content-Length."}, False)
+            return False
+
+        try:
+            if length > self.max_body_bytes:
+                raise HTTPError(413, f"Body exceeds {self.max_body_bytes} bytes.")
+            body = await reader.readexactly(length) if length > 0 else b""
+            status, response = 200, await self.route(method, target.split("?", 1)[0], body)
+        except HTTPError as exc:
+            status, response = exc.status, {"error": exc.message}
+            # An unread oversized body would corrupt the next request on this connection
+            keep_alive = keep_alive and exc.status != 413
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise # The client is gone; handle_connection closes the connection
+        except Exception:
+            # A bug in routing or scoring is reported to the client instead of dropping the connection
+            traceback.print_exc()
+            status, response = 500, {"error": "Internal server error."}
+
+        await self.write_response(writer, status, response, keep_alive)
+        return keep_alive
+
+    async def write_response(self, writer: asyncio.StreamWriter, status: int, payload: dict,
+                             keep_alive: bool) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+# --- Local Load Test Client ---
+
+async def post_json(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str, payload: dict) -> tuple:
+    """Sends one keep-alive POST and returns (status, decoded JSON body)."""
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+async def run_load_test(host: str, port: int, concurrency: int, total_requests: int,
+                        transcript: str, duration: float) -> dict:
+    """Drives /score with `concurrency` keep-alive clients and returns latency/throughput figures."""
+    latencies, statuses = [], {}
+    remaining = iter(range(total_requests))
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for _ in remaining:
+                start = time.perf_counter()
+                status, _ = await post_json(reader, writer, "/score", {"transcript": transcript, "duration": duration})
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_ms": {name: round(percentile(latencies, q) * 1e3, 2)
+                       for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))},
+        "statuses": statuses,
+    }
+
+# --- Command Line ---
+
+async def serve(args) -> None:
+    service = ScoringService(workers=args.workers, max_in_flight=args.max_in_flight,
+                             request_timeout=args.timeout)
+    server = await service.start(args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port} with {service.workers} workers", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv: list = None) -> int:
+    from rubric_config import SAMPLE_TRANSCRIPT, SAMPLE_DURATION_SECONDS
+
+    parser = argparse.ArgumentParser(description="Asyncio HTTP scoring service.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Run the HTTP service.")
+    load_parser = sub.add_parser("loadtest", help="Measure latency and throughput of a running service.")
+    for p in (serve_parser, load_parser):
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--workers", type=int, default=None, help="Pool size (default: CPU count).")
+    serve_parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT)
+    serve_parser.add_argument("--timeout", type=float, default=DEFAULT_REQUEST_TIMEOUT)
+    load_parser.add_argument("--concurrency", type=int, default=32)
+    load_parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    report = asyncio.run(run_load_test(args.host, args.port, args.concurrency, args.requests,
+                                       SAMPLE_TRANSCRIPT, SAMPLE_DURATION_SECONDS))
+    print(json.dumps(report, indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
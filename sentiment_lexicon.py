@@ -0,0 +1,152 @@
+# sentiment_lexicon.py
+# Offline lexicon-based sentiment scoring. The bundled valence lexicon (-3 to +3 per word),
+# negations and intensifiers are compiled once at import into a frozen token table, and a transcript is
+# scored in a single pass over its tokens, applying negation and intensifier windows.
+
+import math
+from types import MappingProxyType
+
+# --- Bundled Lexicon ---
+
+# Valence per lowercase token, grouped by strength. Tokens follow scorer_logic's tokenizer,
+# so contractions arrive split ("don't" -> "don", "t").
+_VALENCE_GROUPS = {
+    3.0: """
+        amazing awesome brilliant delighted excellent extraordinary fantastic glorious
+        incredible joyful love loved lovely magnificent marvelous outstanding perfect
+        superb thrilled wonderful
+    """,
+    2.5: """
+        adore beautiful best blessed cheerful confident enjoy enjoyed enjoying excited exciting
+        favorite favourite fun glad grateful great happy inspiring passionate proud thankful
+        treasure
+    """,
+    2.0: """
+        accomplished achieve achievement admire brave bright calm caring celebrate clever
+        cool creative curious delight eager encourage energetic friendly generous gentle good
+        helpful honest hope hopeful improve improved interested interesting kind laugh liked
+        motivated nice peaceful pleasant pleased positive respect smart smile special
+        succeed success successful support talented thank thanks useful warm win winning wise
+    """,
+    1.5: """
+        agree better comfortable easy fair fine free learn learning ready safe sure welcome
+    """,
+    -1.5: """
+        boring confused difficult late lazy lonely mistake nervous problem problems shy
+        tired unsure weak worried worry
+    """,
+    -2.0: """
+        afraid angry annoyed bad broken cry disappointed dislike fail failed failing fear
+        guilty hurt lost mad messy poor sad scared sick sorry steal stole stolen stupid
+        ugly unfair unhappy upset wrong
+    """,
+    -2.5: """
+        awful cruel depressed disgusting hate hated horrible miserable pain painful terrible
+        worse
+    """,
+    -3.0: """
+        abuse devastated hopeless kill killed tragic worst
+    """,
+}
+
+NEGATIONS = frozenset("""
+    not no never nothing nobody none neither nor nowhere cannot without t
+""".split())
+
+# Multipliers applied to the token that immediately follows (intensifiers can chain)
+INTENSIFIERS = MappingProxyType({
+    "very": 1.3, "really": 1.3, "so": 1.2, "extremely": 1.5, "absolutely": 1.5, "totally": 1.3,
+    "truly": 1.3, "incredibly": 1.5, "super": 1.3, "most": 1.2, "quite": 1.1, "highly": 1.3,
+    "slightly": 0.6, "somewhat": 0.7, "barely": 0.5,
+})
+
+NEGATION_WINDOW = 3      # A negator flips the valence of the next N tokens
+NEGATION_FACTOR = -0.74  # Negated valence is flipped and damped
+NORMALIZATION_ALPHA = 15 # compound = total / sqrt(total^2 + alpha), in (-1, 1)
+
+# Kinds of entries in the compiled token table
+_VALENCE, _NEGATION, _INTENSIFIER = 0, 1, 2
+
+def _compile_token_table(groups: dict) -> MappingProxyType:
+    """
+    Compiles the valence groups, negations and intensifiers into one read-only
+    token -> (kind, value) mapping, so scoring needs a single lookup per token.
+    """
+    table = {}
+    for valence, words in groups.items():
+        for word in words.split():
+            table[word] = (_VALENCE, valence)
+    for word, multiplier in INTENSIFIERS.items():
+        table[word] = (_INTENSIFIER, multiplier)
+    for word in NEGATIONS:
+        table[word] = (_NEGATION, 0.0)
+    return MappingProxyType(table)
+
+TOKEN_TABLE = _compile_token_table(_VALENCE_GROUPS)
+LEXICON = MappingProxyType({token: value for token, (kind, value) in TOKEN_TABLE.items() if kind == _VALENCE})
+
+# --- Scoring ---
+
+class SentimentAccumulator:
+    """
+    Running sentiment state over a token stream. Tokens can be fed in any number of pieces;
+    negation windows and pending intensifiers carry over between pieces.
+    """
+    __slots__ = ("total", "positive", "negative", "negated_left", "pending_boost")
+
+    def __init__(self):
+        self.total = 0.0
+        self.positive = 0
+        self.negative = 0
+        self.negated_left = 0
+        self.pending_boost = 1.0
+
+    def feed(self, tokens: list) -> None:
+        table_get = TOKEN_TABLE.get
+        total, positive, negative = self.total, self.positive, self.negative
+        negated_left, pending_boost = self.negated_left, self.pending_boost
+
+        for token in tokens:
+            entry = table_get(token)
+            if entry is None:
+                pending_boost = 1.0
+                if negated_left:
+                    negated_left -= 1
+                continue
+            kind, value = entry
+            if kind == _NEGATION:
+                negated_left = NEGATION_WINDOW
+                continue
+            if kind == _INTENSIFIER:
+                pending_boost *= value
+            else:
+                valence = value * pending_boost
+                pending_boost = 1.0
+                if negated_left:
+                    valence *= NEGATION_FACTOR
+                total += valence
+                if valence > 0:
+                    positive += 1
+                else:
+                    negative += 1
+            if negated_left:
+                negated_left -= 1
+
+        self.total, self.positive, self.negative = total, positive, negative
+        self.negated_left, self.pending_boost = negated_left, pending_boost
+
+    def summary(self) -> dict:
+        """The normalized compound score in (-1, 1) and the positive/negative token counts."""
+        total = self.total
+        compound = total / math.sqrt(total * total + NORMALIZATION_ALPHA) if total else 0.0
+        return {"compound": compound, "positive_tokens": self.positive, "negative_tokens": self.negative}
+
+
+def sentiment_compound(tokens: list) -> dict:
+    """
+    Scores a token list in one pass. Returns the normalized compound score in (-1, 1) and the
+    counts of positive and negative sentiment-bearing tokens.
+    """
+    accumulator = SentimentAccumulator()
+    accumulator.feed(tokens)
+    return accumulator.summary()
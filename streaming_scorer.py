@@ -0,0 +1,227 @@
+# streaming_scorer.py
+# Incremental scoring for live transcripts arriving in chunks (e.g. from a speech-to-text stream).
+# Each feed() costs O(chunk): running counts are updated from the new text plus a small
+# carry-over tail, instead of rescoring the whole growing transcript. snapshot() is O(1) in the
+# text received so far, except under an MTLD rubric: MTLD's backward pass cannot be updated
+# incrementally, so the session keeps every token and each snapshot costs O(words so far).
+
+import copy
+import string
+from itertools import chain
+from rubric_compiler import CompiledRubric, get_rubric
+from grammar_checker import get_grammar_checker, sentence_cut, MAX_SENTENCE_LENGTH, SENTENCE_BOUNDARY
+from sentiment_lexicon import SentimentAccumulator
+from vocabulary_metrics import MovingAverageTTR, MTLDPass, mtld_pass
+from scorer_logic import (
+    TOKEN_PATTERN, detect_salutation, detect_flow, estimate_duration, combine_results,
+    speech_rate_result, salutation_result, keyword_presence_result, flow_result,
+    vocabulary_richness_result, filler_word_rate_result, grammar_errors_result, sentiment_result
+)
+
+# Keyword matches longer than this many characters are not detected across chunk boundaries
+KEYWORD_WINDOW = 256
+# Trailing characters kept to check the closing phrase; covers the phrase plus trailing punctuation
+END_WINDOW = 256
+
+TOKEN_CHARS = frozenset(string.ascii_letters + string.digits)
+
+
+class IncrementalScorer:
+    """
+    Scores a transcript that grows chunk by chunk. `feed(chunk, elapsed_seconds)` updates running
+    token counts, the distinct-token set, sentiment, filler and keyword hits and grammar issues of
+    completed sentences; `snapshot()` returns the same structure as calculate_final_score for the
+    text received so far. Tokens, fillers and keywords that straddle chunk boundaries are handled
+    by carrying a short unsettled tail into the next feed. The salutation and the start marker of
+    Flow are frozen as soon as enough opening text has arrived to decide them.
+    The whole session is scored with one rubric: `rubric`, or the active one when it starts.
+    """
+
+    def __init__(self, rubric: CompiledRubric = None):
+        self.rubric = rubric = rubric or get_rubric()
+        self.elapsed_seconds = 0.0
+        self.chunks_fed = 0
+
+        # Tokens: counts over settled tokens; a token touching the end of the text stays pending
+        self.word_count = 0
+        self.distinct_tokens = set()
+        self.sentiment = SentimentAccumulator()
+        self._token_pending = ""
+
+        # Vocabulary (VOCABULARY_METRIC): MATTR's rolling window and MTLD's forward pass advance with
+        # each settled token. MTLD's backward pass starts from the end of the text, so it reruns over
+        # the kept tokens at each snapshot: memory and snapshot time grow linearly with the session
+        # (about 40 ms per 100k words). Snapshot sparingly on long MTLD sessions.
+        metric = rubric.vocabulary_metric
+        self._mattr = MovingAverageTTR(rubric.mattr_window) if metric == "mattr" else None
+        self._mtld_forward = MTLDPass(rubric.mtld_threshold) if metric == "mtld" else None
+        self._mtld_tokens = []
+
+        # Fillers: scanned up to a frontier far enough from the end that every match is decided
+        self._filler_matcher = rubric.filler_matcher
+        self._filler_counts, self._filler_next_allowed = self._filler_matcher.new_state()
+        self._filler_tail = ""
+        self._filler_scanned = 0 # Offset into _filler_tail of the first unscanned position
+
+        # Keywords: presence is monotonic, so found categories never need rechecking
+        self._keyword_engine = rubric.keyword_engine
+        self.found_keywords = set()
+        self._keyword_tail = ""
+
+        # Opening: decided once the stripped opening is longer than every start phrase
+        self._opening = ""
+        self._opening_length = max(len(phrase) for phrases in
+                                    [phrases for _, phrases in rubric.salutation_phrases] + [rubric.flow_start]
+                                    for phrase in phrases)
+        self.salutation = None
+        self.has_start = None
+        self._end_tail = ""
+
+        # Grammar: completed sentences are checked once; the open sentence is kept raw, and is cut
+        # like split_sentences cuts it once it passes MAX_SENTENCE_LENGTH, so it stays bounded
+        self._grammar_checker = get_grammar_checker(rubric.grammar_backend)
+        self.grammar_issues = []
+        self._open_sentence = ""
+
+    # --- Feeding ---
+
+    def feed(self, chunk: str, elapsed_seconds: float) -> None:
+        """Adds the next chunk of transcript; `elapsed_seconds` is the session time so far."""
+        self.elapsed_seconds = float(elapsed_seconds)
+        self.chunks_fed += 1
+        if not chunk:
+            return
+        lowered = chunk.lower()
+        self._feed_tokens(lowered)
+        self._feed_fillers(lowered)
+        self._feed_keywords(lowered)
+        self._feed_opening_and_end(lowered)
+        self._feed_grammar(chunk)
+
+    def _feed_tokens(self, lowered: str) -> None:
+        text = self._token_pending + lowered
+        cut = len(text)
+        while cut > 0 and text[cut - 1] in TOKEN_CHARS:
+            cut -= 1
+        tokens = TOKEN_PATTERN.findall(text, 0, cut)
+        self._token_pending = text[cut:]
+        self.word_count += len(tokens)
+        self.distinct_tokens.update(tokens)
+        self.sentiment.feed(tokens)
+        if self._mattr is not None:
+            self._mattr.feed(tokens)
+        elif self._mtld_forward is not None:
+            self._mtld_forward.feed(tokens)
+            self._mtld_tokens.extend(tokens)
+
+    def _feed_fillers(self, lowered: str) -> None:
+        tail = self._filler_tail + lowered
+        # A match starting before the frontier can be decided: it and the character after it have arrived
+        frontier = len(tail) - self._filler_matcher.longest - 1
+        if frontier > self._filler_scanned:
+            self._filler_matcher.scan(tail, self._filler_scanned, frontier,
+                                      self._filler_counts, self._filler_next_allowed)
+            self._filler_scanned = frontier
+        # Keep one character before the frontier so word boundaries there are still visible
+        trim = max(0, self._filler_scanned - 1)
+        if trim:
+            tail = tail[trim:]
+            self._filler_scanned -= trim
+            for filler in self._filler_next_allowed:
+                self._filler_next_allowed[filler] -= trim
+        self._filler_tail = tail
+
+    def _feed_keywords(self, lowered: str) -> None:
+        window = self._keyword_tail + lowered
+        for category, rule in zip(self._keyword_engine.categories, self._keyword_engine.rule_patterns):
+            if category not in self.found_keywords and rule.search(window):
+                self.found_keywords.add(category)
+        self._keyword_tail = window[-KEYWORD_WINDOW:]
+
+    def _feed_opening_and_end(self, lowered: str) -> None:
+        if self.salutation is None:
+            self._opening = (self._opening + lowered).lstrip()
+            if len(self._opening) > self._opening_length:
+                self.salutation = detect_salutation(self._opening, self.rubric)
+                self.has_start, _ = detect_flow(self._opening, self.rubric)
+                self._opening = ""
+        self._end_tail = (self._end_tail + lowered)[-END_WINDOW:]
+
+    def _feed_grammar(self, chunk: str) -> None:
+        text = self._open_sentence + chunk
+        # The open sentence holds no boundary, so only the chunk is scanned; the lookbehind still
+        # sees a terminal mark at the end of the open sentence
+        last_boundary = None
+        for last_boundary in SENTENCE_BOUNDARY.finditer(text, len(self._open_sentence)):
+            pass
+        if last_boundary is not None:
+            self.grammar_issues.extend(self._grammar_checker.check(text[:last_boundary.start()]))
+            text = text[last_boundary.end():]
+        # Without punctuation the sentence never closes; pieces split_sentences would cut off are final
+        text = text.lstrip()
+        while len(text.rstrip()) > MAX_SENTENCE_LENGTH:
+            cut = sentence_cut(text)
+            self.grammar_issues.extend(self._grammar_checker.check(text[:cut]))
+            text = text[cut:].lstrip()
+        self._open_sentence = text
+
+    # --- Snapshot ---
+
+    def snapshot(self) -> dict:
+        """Scores everything received so far, treating the current end of text as final."""
+        # Pending tokens are final at the end of the text
+        pending_tokens = TOKEN_PATTERN.findall(self._token_pending)
+        word_count = self.word_count + len(pending_tokens)
+        distinct_words = len(self.distinct_tokens) + len(set(pending_tokens) - self.distinct_tokens)
+        sentiment = copy.copy(self.sentiment)
+        sentiment.feed(pending_tokens)
+        measure = self._vocabulary_measure(pending_tokens, word_count)
+
+        counts = dict(self._filler_counts)
+        next_allowed = dict(self._filler_next_allowed)
+        self._filler_matcher.scan(self._filler_tail, self._filler_scanned, len(self._filler_tail) + 1,
+                                  counts, next_allowed)
+        found_fillers = self._filler_matcher.to_counter(counts)
+
+        if self.salutation is None:
+            opening = self._opening.strip()
+            salutation = detect_salutation(opening, self.rubric)
+            has_start, _ = detect_flow(opening, self.rubric)
+        else:
+            salutation, has_start = self.salutation, self.has_start
+        _, has_end = detect_flow(self._end_tail.strip(), self.rubric)
+
+        # The open sentence may still grow, so it is checked without filling the sentence cache
+        issues = self.grammar_issues + self._grammar_checker.check(self._open_sentence, remember=False)
+        found_keywords = [c for c in self._keyword_engine.categories if c in self.found_keywords]
+        rubric = self.rubric
+        actual_duration, is_estimated = estimate_duration(word_count, self.elapsed_seconds, rubric)
+
+        return combine_results([
+            speech_rate_result(word_count, actual_duration, is_estimated, rubric),
+            salutation_result(salutation, rubric),
+            keyword_presence_result(found_keywords, rubric=rubric),
+            flow_result(has_start, has_end, rubric),
+            vocabulary_richness_result(distinct_words, word_count, rubric, measure),
+            filler_word_rate_result(found_fillers, self._filler_matcher.total(found_fillers), word_count, rubric),
+            grammar_errors_result(issues, word_count, self._grammar_checker.backend.name, rubric),
+            sentiment_result(sentiment.summary(), rubric),
+        ], rubric=rubric).to_dict()
+
+    def _vocabulary_measure(self, pending_tokens: list, word_count: int):
+        """
+        MATTR or MTLD including the pending tokens; None when the rubric scores plain TTR.
+        MATTR costs O(window); MTLD reruns its backward pass over every token, O(word_count).
+        """
+        if self._mattr is not None:
+            running = copy.copy(self._mattr)
+            running.feed(pending_tokens)
+            return running.value()
+        if self._mtld_forward is None:
+            return None
+        if not word_count:
+            return 0.0
+        forward = copy.copy(self._mtld_forward)
+        forward.feed(pending_tokens)
+        backward = mtld_pass(chain(reversed(pending_tokens), reversed(self._mtld_tokens)), self.rubric.mtld_threshold)
+        return (forward.length() + backward) / 2
@@ -1,9 +1,135 @@
 # streamlit_app.py
 
 import streamlit as st
+import contextlib
+import csv
+import io
 import json
+import os
+import tempfile
+import time
+import weakref
+from collections import deque
 from rubric_config import SAMPLE_TRANSCRIPT, SAMPLE_DURATION_SECONDS
-from scorer_logic import calculate_final_score
+
+# Progressive rendering: redraw the progress bar and preview at most this often, showing only the
+# latest rows while a batch runs (the full table is read back from the summary file at the end)
+RENDER_INTERVAL_SECONDS = 0.5
+PREVIEW_ROWS = 200
+
+# --- Scoring Helpers ---
+# The scorer modules are imported on first use, so the page renders without waiting for them
+
+def rubric_fingerprint() -> str:
+    from rubric_compiler import get_rubric
+    return get_rubric().fingerprint
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def score_cached(transcript: str, duration: float, fingerprint: str) -> dict:
+    """
+    calculate_final_score, memoized across reruns by (transcript, duration). The rubric
+    fingerprint is part of the key, so a reloaded rubric never serves stale results.
+    """
+    from scorer_logic import calculate_final_score
+    return calculate_final_score(transcript, duration)
+
+def iter_upload(uploaded):
+    """Yields {id, transcript, duration} records from an uploaded CSV or JSONL file, decoding it line by line."""
+    from batch_scorer import read_records
+    uploaded.seek(0)
+    # utf-8-sig drops the byte order mark spreadsheet exports put before the CSV header
+    stream = io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline="")
+    try:
+        yield from read_records(stream, uploaded.name)
+    finally:
+        stream.detach() # leave the uploaded file open for the next pass
+
+def summary_row(result: dict) -> dict:
+    """One table row per result: id, overall score, one column per criterion and any error."""
+    row = {"id": result.get("id"), "overall_score": result.get("overall_score")}
+    for item in result.get("per_criterion_scores", ()):
+        row[item["criterion"]] = item["score"]
+    if "error" in result:
+        row["error"] = result["error"]
+    return row
+
+def remove_files(*paths):
+    for path in paths:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+class BatchFiles:
+    """
+    The temporary results (JSONL) and summary (CSV) files of one scored upload. They are deleted
+    by remove(), or when the object is garbage collected with its session, or at server exit.
+    """
+    __slots__ = ("results_path", "summary_path", "_finalizer", "__weakref__")
+
+    def __init__(self, results_path: str, summary_path: str):
+        self.results_path = results_path
+        self.summary_path = summary_path
+        self._finalizer = weakref.finalize(self, remove_files, results_path, summary_path)
+
+    def remove(self):
+        self._finalizer()
+
+def load_summary(path: str):
+    """Reads a batch summary CSV back for display; ids stay text."""
+    import pandas as pd # Installed with streamlit
+    return pd.read_csv(path, dtype={"id": str, "error": str})
+
+def upload_key(uploaded, fingerprint: str) -> tuple:
+    """
+    Identifies one upload scored under one rubric. Streamlit gives every uploaded file its own
+    file_id, so an edited file re-uploaded under the same name and size is still a new upload.
+    """
+    return uploaded.file_id, fingerprint
+
+def score_upload(uploaded, workers: int, key: tuple, progress_slot, table_slot) -> dict:
+    """
+    Scores every record of an upload on a pool of `workers` processes, updating the progress bar
+    and a preview of the latest rows as results arrive. Records are read from the upload lazily,
+    and full results and summary rows are written to temporary files; only counts and the
+    files are returned for session state.
+    """
+    from batch_scorer import score_batch
+    from scorer_logic import build_execution_plan
+    total = sum(1 for _ in iter_upload(uploaded))
+    columns = ["id", "overall_score", *(c.name for c in build_execution_plan()[0]), "error"]
+    progress = progress_slot.progress(0.0, text=f"Scoring {total} transcripts...")
+
+    preview = deque(maxlen=PREVIEW_ROWS)
+    scored = errors = 0
+    start = last_render = time.perf_counter()
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", prefix="scores_", delete=False, encoding="utf-8") as results_file, \
+         tempfile.NamedTemporaryFile("w", suffix=".csv", prefix="scores_", delete=False, encoding="utf-8", newline="") as summary_file:
+        # Owns the files from here on: if scoring fails they go with it
+        files = BatchFiles(results_file.name, summary_file.name)
+        summary = csv.DictWriter(summary_file, fieldnames=columns, extrasaction="ignore")
+        summary.writeheader()
+        # Unordered: rows appear as soon as any worker finishes a chunk; the table is sortable anyway
+        for result in score_batch(iter_upload(uploaded), workers=workers, ordered=False, use_cache=True):
+            results_file.write(json.dumps(result) + "\n")
+            row = summary_row(result)
+            summary.writerow(row)
+            preview.append(row)
+            scored += 1
+            errors += "error" in row
+            now = time.perf_counter()
+            if now - last_render >= RENDER_INTERVAL_SECONDS:
+                last_render = now
+                rate = scored / (now - start)
+                progress.progress(min(scored / max(total, 1), 1.0),
+                                  text=f"Scored {scored}/{total} transcripts ({rate:.1f}/s)")
+                table_slot.dataframe(list(preview), use_container_width=True)
+
+    return {
+        "upload": key,
+        "rows": scored,
+        "errors": errors,
+        "elapsed": time.perf_counter() - start,
+        "files": files,
+    }
 
 # --- UI Setup and Configuration ---
 
@@ -21,62 +147,70 @@ st.markdown("---")
 if 'transcript' not in st.session_state:
     st.session_state.transcript = ""
 if 'duration' not in st.session_state:
-    st.session_state.duration = 0.0 
-    
+    st.session_state.duration = 0.0
+
 # Instructions Sidebar
 with st.sidebar:
     st.header("Instructions")
-    st.info("1. Paste the full transcript text.\n2. **Duration is optional.** If left as 0, the Speech Rate will be ESTIMATED based on a standard WPM.\n3. Click 'Calculate Score'.")
-    
+    st.info("1. Paste the full transcript text.\n2. **Duration is optional.** If left as 0, the Speech Rate will be ESTIMATED based on a standard WPM.\n3. Click 'Calculate Score'.\n\nTo score many transcripts at once, upload a CSV or JSONL file in the **Batch Upload** tab.")
+
     # Optional button to load the sample data, for immediate testing
     if st.button("Load Sample Data (for testing)"):
         st.session_state.transcript = SAMPLE_TRANSCRIPT
         st.session_state.duration = float(SAMPLE_DURATION_SECONDS)
         st.rerun() # Force a rerun to populate the input fields
 
+single_tab, batch_tab = st.tabs(["Single Transcript", "Batch Upload"])
+
 # --- Input Section ---
-col1, col2 = st.columns([3, 1])
-
-with col1:
-    # Text area for the main input transcript
-    transcript = st.text_area(
-        "1. Paste Transcript Text Here:",
-        key="transcript_input",
-        value=st.session_state.transcript,
-        height=300,
-        placeholder="e.g., Hello everyone, my name is Alex..."
-    )
+with single_tab:
+    col1, col2 = st.columns([3, 1])
 
-with col2:
-    # Number input for duration, allowing 0 for estimation fallback
-    duration = st.number_input(
-        "2. Audio Duration (Seconds, Optional - Enter 0 for Estimation):",
-        key="duration_input",
-        value=float(st.session_state.duration),
-        min_value=0.0, 
-        step=1.0
-    )
+    with col1:
+        # Text area for the main input transcript
+        transcript = st.text_area(
+            "1. Paste Transcript Text Here:",
+            key="transcript_input",
+            value=st.session_state.transcript,
+            height=300,
+            placeholder="e.g., Hello everyone, my name is Alex..."
+        )
 
-# Button to trigger the scoring logic
-score_button = st.button("3. Calculate Score", type="primary")
+    with col2:
+        # Number input for duration, allowing 0 for estimation fallback
+        duration = st.number_input(
+            "2. Audio Duration (Seconds, Optional - Enter 0 for Estimation):",
+            key="duration_input",
+            value=float(st.session_state.duration),
+            min_value=0.0,
+            step=1.0
+        )
 
-st.markdown("---")
+    # Button to trigger the scoring logic
+    score_button = st.button("3. Calculate Score", type="primary")
 
-# --- Output Section (Triggered by Button Click) ---
+    st.markdown("---")
 
-if score_button:
-    
-    # Input validation: only need to check for transcript text
-    if not transcript:
-        st.error("🚨 **Error:** Please enter a transcript before calculating the score.")
-    else:
-        # 1. Run the scoring logic
+# --- Output Section (Triggered by Button Click, kept across reruns) ---
+
+with single_tab:
+    if score_button:
+        # Input validation: only need to check for transcript text
+        if not transcript:
+            st.error("🚨 **Error:** Please enter a transcript before calculating the score.")
+            st.session_state.pop("scored_input", None)
+        else:
+            st.session_state.scored_input = (transcript, float(duration))
+
+    if "scored_input" in st.session_state:
+        # 1. Run the scoring logic; reruns (and repeated clicks) are served from the cache
         with st.spinner('Analyzing transcript and calculating scores...'):
-            results = calculate_final_score(transcript, float(duration))
+            results = score_cached(*st.session_state.scored_input, rubric_fingerprint())
 
         overall_score = results["overall_score"]
         max_score = results["max_overall_score"]
         per_criterion_scores = results["per_criterion_scores"]
+        percent = overall_score / max_score * 100 if max_score else 0.0
 
         # 2. Display Overall Score
         st.header("Results Overview")
@@ -84,35 +218,75 @@ if score_button:
 
         with score_col:
             st.metric(
-                label="Overall Communication Score", 
+                label="Overall Communication Score",
                 value=f"{overall_score}/{max_score}",
-                delta=f"Achieved {overall_score}% of the total weight"
+                delta=f"Achieved {percent:.0f}% of the total weight"
             )
-            st.warning("⚠️ **NOTE:** 'Grammar Errors' and 'Sentiment/Positivity' are scored using placeholders. For real scores, external NLP libraries are required.")
 
         with feedback_col:
             st.subheader("General Feedback")
-            if overall_score >= 80:
+            if percent >= 80:
                 st.success("Excellent submission! The structure and content are well-covered, with only minor areas for improvement.")
-            elif overall_score >= 60:
+            elif percent >= 60:
                 st.info("Good effort. Focus on improving specific areas like flow and vocabulary richness.")
             else:
                 st.error("The submission requires substantial improvement. Review the detailed feedback below to target key missing components.")
 
         st.markdown("---")
-        
+
         # 3. Display Detailed Breakdown
         st.header("Detailed Criterion Breakdown")
-        
+
         for item in per_criterion_scores:
             criterion = item["criterion"]
             score = item["score"]
             max_c_score = item["max_score"]
             feedback = item["feedback"]
-            
+
             # Use an expander to keep the UI clean
             with st.expander(f"**{criterion}** - Score: {score}/{max_c_score}", expanded=False):
                 st.markdown(f"**Feedback:** {feedback}")
                 st.code(json.dumps(item["details"], indent=4), language="json")
-                if "NOTE" in item:
-                     st.caption(f"**Note:** {item['NOTE']}")
\ No newline at end of file
+
+# --- Batch Upload Section ---
+
+with batch_tab:
+    st.markdown("Upload a CSV with `id`, `transcript` and `duration` columns, or a JSONL file with one `{\"id\", \"transcript\", \"duration\"}` record per line.")
+    uploaded = st.file_uploader("Transcripts File", type=["csv", "jsonl"], key="batch_upload")
+    workers = st.number_input(
+        "Worker Processes",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=min(4, os.cpu_count() or 1),
+        step=1
+    )
+    batch_button = st.button("Score File", type="primary", disabled=uploaded is None)
+
+    progress_slot = st.empty()
+    table_slot = st.empty()
+
+    if batch_button:
+        key = upload_key(uploaded, rubric_fingerprint())
+        previous = st.session_state.get("batch")
+        # The same upload under the same rubric keeps its results
+        if previous is None or previous["upload"] != key:
+            if previous is not None:
+                previous["files"].remove()
+                del st.session_state["batch"]
+            st.session_state.batch = score_upload(uploaded, int(workers), key, progress_slot, table_slot)
+
+    batch = st.session_state.get("batch")
+    # Shown only for the upload and rubric they were scored from, by the same key as above
+    if batch is not None and uploaded is not None and batch["upload"] == upload_key(uploaded, rubric_fingerprint()):
+        files = batch["files"]
+        progress_slot.success(f"Scored {batch['rows']} transcripts in {batch['elapsed']:.1f}s.")
+        if batch["errors"]:
+            st.warning(f"{batch['errors']} records could not be scored; see the `error` column.")
+        # Click a column header to sort
+        table_slot.dataframe(load_summary(files.summary_path), use_container_width=True)
+
+        download_col1, download_col2 = st.columns(2)
+        with download_col1, open(files.summary_path, "rb") as summary_file:
+            st.download_button("Download Summary (CSV)", data=summary_file, file_name="scores_summary.csv", mime="text/csv")
+        with download_col2, open(files.results_path, "rb") as results_file:
+            st.download_button("Download Full Results (JSONL)", data=results_file, file_name="scores.jsonl", mime="application/json")
\ No newline at end of file
@@ -0,0 +1,30 @@
+# conftest.py
+# Shared fixtures for the focused tests. The modules live at the repository root, so it is put on
+# sys.path ahead of anything else that could shadow them.
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import rubric_compiler
+
+
+@pytest.fixture
+def reset_rubric(monkeypatch):
+    """Checks the rubric file on every call during the test, and restores rubric_config afterwards."""
+    monkeypatch.setattr(rubric_compiler, "RELOAD_CHECK_SECONDS", 0.0)
+    monkeypatch.delenv(rubric_compiler.RUBRIC_FILE_ENV, raising=False)
+    yield
+    rubric_compiler.set_rubric_file(None)
+
+
+@pytest.fixture
+def sample_records():
+    """A small generated corpus spanning short, long, filler-heavy and unpunctuated transcripts."""
+    from regression_suite import generate_corpus
+    return generate_corpus(24, seed=11)
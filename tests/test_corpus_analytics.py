@@ -0,0 +1,93 @@
+# test_corpus_analytics.py
+# QuantileSketch (DDSketch) accuracy and merge equivalence, and merged corpus aggregates.
+
+import json
+import random
+
+import pytest
+
+from corpus_analytics import CorpusAggregate, QuantileSketch, aggregate_jsonl, aggregate_lines
+
+
+def sketch_of(values, **options) -> QuantileSketch:
+    sketch = QuantileSketch(**options)
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+def exact_quantile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+def mixed_values(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [rng.choice((0.0, -rng.lognormvariate(0, 2), rng.lognormvariate(1, 1.5), rng.uniform(0, 300)))
+            for _ in range(count)]
+
+def assert_same_summary(actual, expected) -> None:
+    # Means are sums divided by counts, and partial sums round differently in their last digit
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            assert_same_summary(actual[key], expected[key])
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, abs=1e-3)
+    else:
+        assert actual == expected
+
+def state(sketch: QuantileSketch) -> tuple:
+    return (sketch.positive, sketch.negative, sketch.zero_count, sketch.count,
+            sketch.minimum, sketch.maximum, round(sketch.total, 6))
+
+
+# --- QuantileSketch ---
+
+def test_quantiles_are_within_relative_accuracy():
+    values = mixed_values(5000, seed=1)
+    sketch = sketch_of(values, relative_accuracy=0.01)
+    for q in (0.0, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 1.0):
+        exact = exact_quantile(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01, abs=1e-9), q
+
+@pytest.mark.parametrize("parts", [2, 3, 7])
+def test_merged_sketches_equal_one_sketch(parts):
+    values = mixed_values(3000, seed=parts)
+    whole = sketch_of(values)
+    merged = QuantileSketch()
+    for start in range(parts):
+        merged.merge(sketch_of(values[start::parts]))
+    assert state(merged) == state(whole)
+    assert merged.summary() == whole.summary()
+
+def test_merging_an_empty_sketch_changes_nothing():
+    sketch = sketch_of([1.0, 2.0, 3.0])
+    before = state(sketch)
+    sketch.merge(QuantileSketch())
+    assert state(sketch) == before
+    assert QuantileSketch().summary() == {"count": 0}
+
+def test_collapsed_sketch_keeps_the_upper_quantiles():
+    values = [1.001 ** exponent for exponent in range(20_000)]
+    sketch = sketch_of(values, max_buckets=64)
+    assert len(sketch.positive) <= 64
+    assert sketch.quantile(0.99) == pytest.approx(exact_quantile(values, 0.99), rel=0.01)
+
+def test_sketches_with_different_accuracy_do_not_merge():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+# --- Corpus aggregates ---
+
+def test_chunked_aggregates_match_one_pass(sample_records):
+    from batch_scorer import score_batch
+    results = list(score_batch(sample_records))
+    whole = CorpusAggregate().update(results)
+    lines = [json.dumps(result) + "\n" for result in results] + ["\n"]
+    merged = CorpusAggregate()
+    for start in range(0, len(lines), 5):
+        for partial in aggregate_lines(lines[start:start + 5]):
+            merged.merge(partial)
+    assert_same_summary(merged.summary(), whole.summary())
+    assert_same_summary(aggregate_jsonl(iter(lines), chunk_size=7).summary(), whole.summary())
+    assert aggregate_jsonl(iter(lines + ["not json\n"])).summary()["errors"] == 1
@@ -0,0 +1,121 @@
+# test_corpus_reader.py
+# Saved offset indexes: reuse, staleness after the corpus changes, and rebuilding damaged files.
+
+import json
+import os
+import pickle
+
+import pytest
+
+import corpus_reader
+from corpus_reader import INDEX_SUFFIX, CorpusReader, write_length_prefixed
+
+RECORDS = [
+    {"id": "call-1", "transcript": "Hello, my name is Asha.", "duration": 12.5},
+    {"id": 2, "transcript": "I am studying in class 8.", "duration": 9.0},
+    {"id": "call-é", "transcript": "Thank you for listening.", "duration": 4.0},
+]
+
+
+def write_jsonl(path, records: list, extra_lines: tuple = ()) -> str:
+    with open(path, "w", encoding="utf-8") as sink:
+        for record in records:
+            sink.write(json.dumps(record) + "\n")
+        for line in extra_lines:
+            sink.write(line + "\n")
+    return str(path)
+
+def read_all(path: str) -> tuple:
+    with CorpusReader(path) as corpus:
+        return list(corpus.ids), list(corpus)
+
+@pytest.fixture
+def no_rebuild(monkeypatch):
+    """Fails the test if an index is built instead of loaded."""
+    def refuse(_):
+        raise AssertionError("index was rebuilt")
+    monkeypatch.setattr(corpus_reader, "_index_jsonl", refuse)
+    monkeypatch.setattr(corpus_reader, "_index_length_prefixed", refuse)
+
+
+# --- Index reuse ---
+
+@pytest.mark.parametrize("kind", ["jsonl", "length_prefixed"])
+def test_saved_index_is_reused(tmp_path, request, kind):
+    path = str(tmp_path / "corpus")
+    if kind == "jsonl":
+        write_jsonl(path, RECORDS)
+    else:
+        write_length_prefixed(RECORDS, path)
+    built = read_all(path)
+    assert os.path.exists(path + INDEX_SUFFIX)
+
+    request.getfixturevalue("no_rebuild")
+    assert read_all(path) == built
+    with CorpusReader(path) as corpus:
+        assert corpus.get("call-é")["transcript"] == "Thank you for listening."
+        assert corpus.get(2)["duration"] == 9.0
+        with pytest.raises(KeyError):
+            corpus.get("missing")
+        # Pickled readers reopen the mapping and its index
+        assert list(pickle.loads(pickle.dumps(corpus))) == built[1]
+
+def test_jsonl_ids_fall_back_like_read_jsonl(tmp_path):
+    path = write_jsonl(tmp_path / "corpus.jsonl", [{"transcript": "No id."}], ["", "not json"])
+    assert read_all(path)[0] == [None, "line:3"]
+    assert read_all(path)[0] == [None, "line:3"]
+
+def test_empty_corpus(tmp_path):
+    path = write_jsonl(tmp_path / "empty.jsonl", [])
+    assert read_all(path) == ([], [])
+    assert read_all(path) == ([], [])
+
+
+# --- Staleness ---
+
+def test_appending_records_rebuilds_the_index(tmp_path):
+    path = write_jsonl(tmp_path / "corpus.jsonl", RECORDS[:2])
+    read_all(path)
+    write_jsonl(path, RECORDS)
+    ids, records = read_all(path)
+    assert ids == ["call-1", 2, "call-é"]
+    assert records == RECORDS
+
+def test_same_size_rewrite_rebuilds_the_index(tmp_path):
+    path = write_jsonl(tmp_path / "corpus.jsonl", [{"id": "aaaa", "transcript": "One."}])
+    read_all(path)
+    stat = os.stat(path)
+    write_jsonl(path, [{"id": "bbbb", "transcript": "Two."}])
+    assert os.path.getsize(path) == stat.st_size
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert read_all(path)[0] == ["bbbb"]
+
+@pytest.mark.parametrize("damage", [b"", b"{}", b"TRIDX"])
+def test_damaged_or_old_index_is_rebuilt(tmp_path, damage):
+    path = write_jsonl(tmp_path / "corpus.jsonl", RECORDS)
+    expected = read_all(path)
+    with open(path + INDEX_SUFFIX, "wb") as sink:
+        sink.write(damage)
+    assert read_all(path) == expected
+
+def test_truncated_index_is_rebuilt(tmp_path):
+    path = write_jsonl(tmp_path / "corpus.jsonl", RECORDS)
+    expected = read_all(path)
+    with open(path + INDEX_SUFFIX, "r+b") as index:
+        index.truncate(os.path.getsize(path + INDEX_SUFFIX) - 3)
+    assert read_all(path) == expected
+
+
+# --- Length-prefixed format ---
+
+def test_overlong_id_is_a_value_error(tmp_path):
+    with pytest.raises(ValueError, match="id is 70000 bytes"):
+        write_length_prefixed([{"id": "x" * 70_000, "transcript": "Hi."}], str(tmp_path / "corpus.bin"))
+
+def test_truncated_length_prefixed_corpus(tmp_path):
+    path = str(tmp_path / "corpus.bin")
+    write_length_prefixed(RECORDS, path)
+    with open(path, "r+b") as corpus:
+        corpus.truncate(os.path.getsize(path) - 5)
+    with pytest.raises(ValueError, match="Truncated record"):
+        CorpusReader(path, save_index=False)
@@ -0,0 +1,92 @@
+# test_result_cache.py
+# TTL expiry and LRU eviction in both tiers of result_cache.ResultCache.
+
+import pytest
+
+import result_cache
+from result_cache import ResultCache, cache_key
+
+
+class FakeClock:
+    """Stands in for the time module: both clocks advance only when told to."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(result_cache, "time", fake)
+    return fake
+
+def disk_keys(cache: ResultCache) -> set:
+    return {key for (key,) in cache._connection().execute("SELECT key FROM results")}
+
+
+# --- In-process tier ---
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResultCache(ttl_seconds=10.0)
+    cache.put("a", {"overall_score": 1})
+    clock.now += 10.0
+    assert cache.get("a") == {"overall_score": 1}
+    clock.now += 0.5
+    assert cache.get("a") is None
+    assert cache.stats["expirations"] == 1
+    assert cache.counters()["size"] == 0
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResultCache(max_entries=2)
+    cache.put("a", {"overall_score": 1})
+    cache.put("b", {"overall_score": 2})
+    cache.get("a")
+    cache.put("c", {"overall_score": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats["evictions"] == 1
+
+def test_keys_separate_duration_and_rubric():
+    key = cache_key("Hello.", 30.0, "rubric-a")
+    assert key == cache_key("Hello.", 30, "rubric-a")
+    assert key != cache_key("Hello.", 31.0, "rubric-a")
+    assert key != cache_key("Hello.", 30.0, "rubric-b")
+    assert key != cache_key("hello.", 30.0, "rubric-a")
+
+
+# --- SQLite tier ---
+
+def test_disk_tier_serves_other_instances(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    ResultCache(sqlite_path=path).put("a", {"overall_score": 1})
+    other = ResultCache(sqlite_path=path)
+    assert other.get("a") == {"overall_score": 1}
+    assert other.stats["disk_hits"] == 1
+
+def test_disk_tier_drops_expired_rows_on_open(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    writer = ResultCache(ttl_seconds=10.0, sqlite_path=path)
+    writer.put("old", {"overall_score": 1})
+    clock.now += 8.0
+    writer.put("new", {"overall_score": 2})
+    clock.now += 5.0
+    reader = ResultCache(ttl_seconds=10.0, sqlite_path=path)
+    assert disk_keys(reader) == {"new"}
+    assert reader.get("old") is None
+
+def test_disk_tier_is_capped_at_max_entries(tmp_path, clock):
+    cache = ResultCache(max_entries=3, sqlite_path=str(tmp_path / "cache.db"))
+    for index in range(6):
+        clock.now += 1.0
+        cache.put(f"k{index}", {"overall_score": index})
+    # Pruning runs at most once per interval while writing
+    assert len(disk_keys(cache)) == 6
+    clock.now += result_cache.PRUNE_INTERVAL_SECONDS
+    cache.put("k6", {"overall_score": 6})
+    assert disk_keys(cache) == {"k4", "k5", "k6"}
@@ -0,0 +1,82 @@
+# test_rubric.py
+# Rubric validation, rubric files and reloading a watched rubric file after a failed edit.
+
+import json
+import os
+
+import pytest
+
+import rubric_compiler
+from rubric_compiler import RubricError, compile_rubric, get_rubric, rubric_reload_error, set_rubric_file
+
+
+def write_rubric(path, settings: dict) -> str:
+    # Bumps the mtime as well, so an edit within the filesystem's timestamp resolution is still seen
+    previous = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+    with open(path, "w", encoding="utf-8") as sink:
+        json.dump(settings, sink)
+    os.utime(path, ns=(previous + 10**9, previous + 10**9))
+    return str(path)
+
+
+# --- Validation ---
+
+def test_every_problem_is_reported():
+    with pytest.raises(RubricError) as raised:
+        compile_rubric({"TOTAL_WEIGHT": "lots", "NOT_A_SETTING": 1, "GRAMMAR_SCORE_FORMULA": "0"})
+    problems = "\n".join(raised.value.problems)
+    assert "TOTAL_WEIGHT" in problems
+    assert "NOT_A_SETTING: unknown setting" in problems
+    assert "GRAMMAR_SCORE_FORMULA: formulas can only be changed in rubric_config.py" in problems
+
+def test_weights_must_cover_criteria_and_sum_to_total():
+    weights = dict(compile_rubric().weights)
+    weights["Flow"] = -weights["Flow"]
+    del weights["Salutation Level"]
+    with pytest.raises(RubricError) as raised:
+        compile_rubric({"WEIGHTS": weights})
+    problems = "\n".join(raised.value.problems)
+    assert "negative weight" in problems
+    assert "missing weight for 'Salutation Level'" in problems
+    assert "not TOTAL_WEIGHT" in problems
+
+def test_overrides_change_the_fingerprint():
+    default = compile_rubric()
+    changed = compile_rubric({"STANDARD_SPEAKING_RATE_WPM": 150})
+    assert changed.fingerprint != default.fingerprint
+    assert compile_rubric().fingerprint == default.fingerprint
+
+def test_unreadable_rubric_file(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text("{not json", encoding="utf-8")
+    with pytest.raises(RubricError, match="cannot read rubric file"):
+        rubric_compiler.compile_rubric_file(str(path))
+
+
+# --- Reloading ---
+
+def test_invalid_file_keeps_the_active_rubric(tmp_path, reset_rubric):
+    good = write_rubric(tmp_path / "good.json", {"STANDARD_SPEAKING_RATE_WPM": 150})
+    active = set_rubric_file(good)
+    bad = write_rubric(tmp_path / "bad.json", {"TOTAL_WEIGHT": -1})
+    with pytest.raises(RubricError):
+        set_rubric_file(bad)
+    assert get_rubric().fingerprint == active.fingerprint
+    assert os.environ[rubric_compiler.RUBRIC_FILE_ENV] == good
+
+    # The good file is still the watched one
+    write_rubric(good, {"STANDARD_SPEAKING_RATE_WPM": 130})
+    assert get_rubric().fingerprint == compile_rubric({"STANDARD_SPEAKING_RATE_WPM": 130}).fingerprint
+
+def test_failed_edit_is_reported_until_fixed(tmp_path, reset_rubric):
+    path = tmp_path / "rubric.json"
+    active = set_rubric_file(write_rubric(path, {"STANDARD_SPEAKING_RATE_WPM": 150}))
+
+    write_rubric(path, {"WEIGHTS": "none"})
+    with pytest.warns(RuntimeWarning, match="Keeping the previous rubric"):
+        assert get_rubric().fingerprint == active.fingerprint
+    assert isinstance(rubric_reload_error(), RubricError)
+
+    write_rubric(path, {"STANDARD_SPEAKING_RATE_WPM": 120})
+    assert get_rubric().fingerprint == compile_rubric({"STANDARD_SPEAKING_RATE_WPM": 120}).fingerprint
+    assert rubric_reload_error() is None
@@ -0,0 +1,107 @@
+# test_scoring_service.py
+# Backpressure (503), timeouts (504) and input validation (400) in scoring_service.ScoringService.
+# Jobs run on a thread pool here, so no worker processes are started.
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scoring_service import HTTPError, ScoringService
+
+
+@pytest.fixture
+def make_service():
+    pools = []
+
+    def make(**options) -> ScoringService:
+        service = ScoringService(workers=2, **options)
+        service.pool = ThreadPoolExecutor(max_workers=2)
+        pools.append(service.pool)
+        return service
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+async def settle(service: ScoringService) -> None:
+    # Slots are released from the pool thread via call_soon_threadsafe
+    for _ in range(100):
+        if service.in_flight == 0:
+            return
+        await asyncio.sleep(0.01)
+
+
+# --- Backpressure ---
+
+def test_rejects_with_503_when_at_capacity(make_service):
+    service = make_service(max_in_flight=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(service.run_job(lambda _: release.wait(5) and "done", None))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPError) as raised:
+            await service.run_job(lambda payload: payload, None)
+        assert raised.value.status == 503
+        release.set()
+        assert await first == "done"
+        await settle(service)
+        assert service.in_flight == 0
+
+    run(scenario())
+
+def test_times_out_with_504_and_holds_the_slot_until_the_job_ends(make_service):
+    service = make_service(max_in_flight=1, request_timeout=0.05)
+
+    async def scenario():
+        with pytest.raises(HTTPError) as raised:
+            await service.run_job(lambda _: time.sleep(0.3), None)
+        assert raised.value.status == 504
+        # The worker is still busy, so the slot is still taken
+        assert service.in_flight == 1
+        await asyncio.sleep(0.4)
+        await settle(service)
+        assert service.in_flight == 0
+
+    run(scenario())
+
+
+# --- Validation ---
+
+@pytest.mark.parametrize("body", [
+    b"{not json",
+    b"[1, 2]",
+    b'{"duration": 30}',
+    b'{"transcript": 7, "duration": 30}',
+    b'{"transcript": "Hello.", "duration": "soon"}',
+    b'{"transcript": "Hello.", "duration": NaN}',
+    b'{"transcript": "Hello.", "duration": Infinity}',
+])
+def test_bad_score_requests_get_400(make_service, body):
+    service = make_service()
+    with pytest.raises(HTTPError) as raised:
+        run(service.route("POST", "/score", body))
+    assert raised.value.status == 400
+
+def test_batch_reports_bad_records_individually(make_service):
+    service = make_service()
+    body = b'{"records": [{"id": 1, "transcript": "Hello there.", "duration": 5}, {"id": 2, "transcript": "Hi.", "duration": NaN}]}'
+    results = run(service.route("POST", "/score/batch", body))["results"]
+    assert "overall_score" in results[0]
+    assert results[1] == {"id": 2, "error": "Invalid record: 'duration' must be a finite number"}
+    with pytest.raises(HTTPError) as raised:
+        run(service.route("POST", "/score/batch", b'{"records": {}}'))
+    assert raised.value.status == 400
+
+def test_unknown_paths_and_methods(make_service):
+    service = make_service()
+    for method, path, status in (("POST", "/nowhere", 404), ("GET", "/score", 405), ("POST", "/health", 405)):
+        with pytest.raises(HTTPError) as raised:
+            run(service.route(method, path, b""))
+        assert raised.value.status == status
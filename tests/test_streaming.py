@@ -0,0 +1,72 @@
+# test_streaming.py
+# IncrementalScorer must match calculate_final_score however the transcript is chunked.
+
+import random
+
+import pytest
+
+import grammar_checker
+import streaming_scorer
+from scorer_logic import calculate_final_score
+from streaming_scorer import IncrementalScorer
+
+TRICKY_TRANSCRIPT = (
+    "Hello everyone, myself Asha. Um I am studying in class 8 at St. Mary's school! You know, "
+    "my family has 4 people and i is the youngest... I like playing a apple game, uh, basically "
+    "it was a honest mistake?! Thank you for listening."
+)
+
+
+def streamed(text: str, duration: float, sizes, snapshot_every: int = 0) -> dict:
+    """Feeds `text` in chunks of the given sizes (cycled), taking a snapshot every few chunks."""
+    scorer = IncrementalScorer()
+    position, fed = 0, 0
+    while position < len(text):
+        size = sizes[fed % len(sizes)]
+        scorer.feed(text[position:position + size], duration)
+        position += size
+        fed += 1
+        if snapshot_every and fed % snapshot_every == 0:
+            scorer.snapshot()
+    return scorer.snapshot()
+
+def boundary_chunks(text: str) -> list:
+    """Chunk sizes that cut right before and after every space and punctuation mark."""
+    cuts = [index for index, char in enumerate(text) if not char.isalnum()]
+    cuts = sorted({cut for index in cuts for cut in (index, index + 1) if 0 < cut < len(text)})
+    return [end - start for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+@pytest.mark.parametrize("sizes", [[1], [2], [3, 1], [7], [1, 13, 2, 40]])
+def test_fixed_chunkings_match_batch(sizes):
+    expected = calculate_final_score(TRICKY_TRANSCRIPT, 40.0)
+    assert streamed(TRICKY_TRANSCRIPT, 40.0, sizes) == expected
+    assert streamed(TRICKY_TRANSCRIPT, 40.0, sizes, snapshot_every=3) == expected
+
+def test_chunks_cut_at_every_boundary_match_batch():
+    expected = calculate_final_score(TRICKY_TRANSCRIPT, 0.0)
+    assert streamed(TRICKY_TRANSCRIPT, 0.0, boundary_chunks(TRICKY_TRANSCRIPT), snapshot_every=1) == expected
+
+def test_random_chunkings_of_a_corpus_match_batch(sample_records):
+    rng = random.Random(5)
+    for record in sample_records:
+        expected = calculate_final_score(record["transcript"], record["duration"])
+        sizes = [rng.choice((1, 2, 3, 5, 8, 21, 89, 400)) for _ in range(16)]
+        assert streamed(record["transcript"], record["duration"], sizes, snapshot_every=7) == expected, record["id"]
+
+def test_unpunctuated_text_is_cut_like_batch(monkeypatch):
+    # A small limit makes the long-sentence cut happen many times within a short transcript
+    monkeypatch.setattr(grammar_checker, "MAX_SENTENCE_LENGTH", 40)
+    monkeypatch.setattr(streaming_scorer, "MAX_SENTENCE_LENGTH", 40)
+    rng = random.Random(9)
+    words = ["i", "is", "a", "apple", "um", "you", "know", "supercalifragilisticexpialidocious", "they", "was"]
+    text = " ".join(rng.choice(words) for _ in range(150)) + " and " + "x" * 95 + " done"
+    expected = calculate_final_score(text, 60.0)
+    for sizes in ([1], [4, 9], [41], [100, 3]):
+        assert streamed(text, 60.0, sizes, snapshot_every=2) == expected, sizes
+
+def test_empty_and_whitespace_feeds():
+    scorer = IncrementalScorer()
+    scorer.feed("", 10.0)
+    scorer.feed("   ", 10.0)
+    assert scorer.snapshot() == calculate_final_score("   ", 10.0)
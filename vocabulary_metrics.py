@@ -0,0 +1,130 @@
+# vocabulary_metrics.py
+# Length-robust vocabulary diversity measures over a token stream. Raw TTR falls as a transcript
+# grows, because common words keep repeating, so long talks drift into the lowest TTR_RUBRIC band.
+# Both measures here are computed in O(n) from running type counts and can be fed incrementally:
+#   MATTR - moving-average TTR: the mean TTR of every `window`-token window (Covington & McFall, 2010)
+#   MTLD  - measure of textual lexical diversity: the mean length of token runs whose TTR stays
+#           above `threshold`, averaged over a forward and a backward pass (McCarthy & Jarvis, 2010)
+
+from collections import deque
+
+VOCABULARY_METRICS = ("ttr", "mattr", "mtld")
+DEFAULT_MATTR_WINDOW = 50
+DEFAULT_MTLD_THRESHOLD = 0.72
+
+# --- MATTR ---
+
+class MovingAverageTTR:
+    """
+    Running MATTR. A rolling count of each token over the last `window` tokens tracks the window's type count,
+    so each token costs O(1) instead of rebuilding a set per window. Texts shorter than the window
+    have a single, partial window: their MATTR is their TTR.
+    """
+    __slots__ = ("window", "token_count", "_recent", "_counts", "_distinct", "_distinct_sum", "_windows")
+
+    def __init__(self, window: int = DEFAULT_MATTR_WINDOW):
+        self.window = window
+        self.token_count = 0
+        self._recent = deque()
+        self._counts = {} # token -> occurrences in the window
+        self._distinct = 0 # Types in the current window
+        self._distinct_sum = 0 # Sum of the type counts of all full windows
+        self._windows = 0
+
+    def feed(self, tokens) -> None:
+        # Locals and a plain dict keep the per-token cost low on long transcripts
+        recent, counts, window = self._recent, self._counts, self.window
+        distinct, distinct_sum, windows = self._distinct, self._distinct_sum, self._windows
+        fed = 0
+        for token in tokens:
+            fed += 1
+            count = counts.get(token, 0)
+            counts[token] = count + 1
+            if not count:
+                distinct += 1
+            recent.append(token)
+            if len(recent) > window:
+                old = recent.popleft()
+                count = counts[old] - 1
+                if count:
+                    counts[old] = count
+                else:
+                    del counts[old]
+                    distinct -= 1
+            if len(recent) == window:
+                distinct_sum += distinct
+                windows += 1
+        self.token_count += fed
+        self._distinct, self._distinct_sum, self._windows = distinct, distinct_sum, windows
+
+    def value(self) -> float:
+        if self._windows:
+            return self._distinct_sum / (self._windows * self.window)
+        return self._distinct / self.token_count if self.token_count else 0.0
+
+    def __copy__(self) -> "MovingAverageTTR":
+        clone = MovingAverageTTR(self.window)
+        clone.token_count = self.token_count
+        clone._recent = deque(self._recent)
+        clone._counts = dict(self._counts)
+        clone._distinct, clone._distinct_sum, clone._windows = self._distinct, self._distinct_sum, self._windows
+        return clone
+
+
+def mattr(tokens: list, window: int = DEFAULT_MATTR_WINDOW) -> float:
+    """Moving-average type-token ratio of `tokens` over `window`-token windows."""
+    running = MovingAverageTTR(window)
+    running.feed(tokens)
+    return running.value()
+
+# --- MTLD ---
+
+class MTLDPass:
+    """
+    One MTLD pass. Tokens extend the current run until its TTR drops to `threshold`, which
+    completes a factor and starts a new run; the unfinished run counts as a partial factor.
+    """
+    __slots__ = ("threshold", "token_count", "factors", "_types", "_run_length")
+
+    def __init__(self, threshold: float = DEFAULT_MTLD_THRESHOLD):
+        self.threshold = threshold
+        self.token_count = 0
+        self.factors = 0
+        self._types = set()
+        self._run_length = 0
+
+    def feed(self, tokens) -> None:
+        types, threshold = self._types, self.threshold
+        for token in tokens:
+            self.token_count += 1
+            self._run_length += 1
+            types.add(token)
+            if len(types) / self._run_length <= threshold:
+                self.factors += 1
+                types.clear()
+                self._run_length = 0
+
+    def length(self) -> float:
+        """Tokens per factor. A pass that never completes a factor and has no repeated token returns its length."""
+        factors = float(self.factors)
+        if self._run_length:
+            factors += (1.0 - len(self._types) / self._run_length) / (1.0 - self.threshold)
+        return self.token_count / factors if factors else float(self.token_count)
+
+    def __copy__(self) -> "MTLDPass":
+        clone = MTLDPass(self.threshold)
+        clone.token_count, clone.factors, clone._run_length = self.token_count, self.factors, self._run_length
+        clone._types = set(self._types)
+        return clone
+
+
+def mtld_pass(tokens, threshold: float = DEFAULT_MTLD_THRESHOLD) -> float:
+    running = MTLDPass(threshold)
+    running.feed(tokens)
+    return running.length()
+
+def mtld(tokens: list, threshold: float = DEFAULT_MTLD_THRESHOLD) -> float:
+    """Bidirectional MTLD of `tokens`: the mean of a forward and a backward pass (0.0 for no tokens)."""
+    if not tokens:
+        return 0.0
+    return (mtld_pass(tokens, threshold) + mtld_pass(reversed(tokens), threshold)) / 2